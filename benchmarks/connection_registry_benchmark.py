@@ -0,0 +1,66 @@
+"""
+Benchmark of a login storm against the connection registry, compared with
+the previous approach of scanning a list of every client on each login.
+
+Run from the repository root: python -m benchmarks.connection_registry_benchmark
+"""
+
+import time
+
+from common.model import Character, Player
+from server.protocol.connection_registry import ConnectionRegistry
+from server.protocol.connection_states import ConnectionState
+
+CONNECTIONS = 10_000
+
+
+class SimulatedConnection:
+    def __init__(self, player_id: str) -> None:
+        self.state = ConnectionState.DISCONNECTED
+        self.player = Player(player_id, Character(1, 1), 0, 0)
+
+
+def list_storm(connections: list[SimulatedConnection]) -> None:
+    clients: list[SimulatedConnection] = []
+    for connection in connections:
+        clients.append(connection)
+    for connection in connections:
+        connected_players = [
+            client.player.id
+            for client in clients
+            if client.state == ConnectionState.CONNECTED and client.player
+        ]
+        if connection.player.id not in connected_players:
+            connection.state = ConnectionState.CONNECTED
+    for connection in connections:
+        clients.remove(connection)
+
+
+def registry_storm(connections: list[SimulatedConnection]) -> None:
+    registry = ConnectionRegistry()
+    for connection in connections:
+        registry.add(connection)  # type: ignore
+    for connection in connections:
+        if not registry.is_player_connected(connection.player.id):
+            registry.set_state(connection, ConnectionState.CONNECTED)  # type: ignore
+    for connection in connections:
+        registry.remove(connection)  # type: ignore
+
+
+def measure(storm, count: int) -> float:
+    connections = [SimulatedConnection(str(i)) for i in range(count)]
+    started = time.perf_counter()
+    storm(connections)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    print(f"{'connections':<14}{'list s':>10}{'registry s':>12}")
+    for count in (1_000, CONNECTIONS):
+        listed = measure(list_storm, count)
+        registered = measure(registry_storm, count)
+        print(f"{count:<14}{listed:>10.3f}{registered:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark of player displays under join/leave churn: 3000 random joins and
+leaves with chat messages, counting how many displays the pool had to create
+and how long a join and leave take.
+
+Needs OpenGL, runs headless. Run from the repository root:
+python -m benchmarks.player_display_benchmark
+"""
+
+import random
+import time
+
+import pyglet
+
+pyglet.options["headless"] = True
+
+from pyglet.graphics import Batch, Group  # noqa: E402
+from pyglet.image import SolidColorImagePattern  # noqa: E402
+
+from client.frontend.player_display_pool import PlayerDisplayPool  # noqa: E402
+
+EVENTS = 3_000
+
+
+def main() -> None:
+    window = pyglet.window.Window(600, 900, visible=False)
+    textures = [
+        SolidColorImagePattern((shade, 0, 0, 255)).create_image(8, 8).get_texture()
+        for shade in (0, 80, 160, 240)
+    ]
+    batch = Batch()
+    pool = PlayerDisplayPool(batch, Group(1))
+    rng = random.Random(0)
+    online = {}
+
+    started = time.perf_counter()
+    for i in range(EVENTS):
+        if online and rng.random() < 0.5:
+            pool.release(online.pop(rng.choice(list(online))))
+            continue
+        display = pool.acquire(i % 600, i % 900, textures[i % 4], textures[i % 3])
+        if i % 3 == 0:
+            display.create_chat_bubble("hello")
+        online[i] = display
+    elapsed = time.perf_counter() - started
+    batch.draw()
+
+    print(f"{EVENTS} joins and leaves, {len(online)} players still online")
+    print(f"displays created {pool.created}, reused {pool.reused}")
+    print(f"{elapsed / EVENTS * 1_000_000:.1f} us per join or leave")
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
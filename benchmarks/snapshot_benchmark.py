@@ -0,0 +1,39 @@
+"""
+Benchmark of encoding the PlayerSnapshot sent on login with 5k online
+players, encoding every player against joining cached fragments after
+a few percent of the players moved.
+
+Run from the repository root: python -m benchmarks.snapshot_benchmark
+"""
+
+import timeit
+
+from common.model import Character, Player, PlayerSnapshot
+from common.translator import MessageTranslator
+from server.world.snapshot_cache import SnapshotCache
+
+PLAYERS = 5_000
+MOVED_PER_LOGIN = 100
+
+
+def main() -> None:
+    players = [Player(str(i), Character(1, 2), i, i) for i in range(PLAYERS)]
+    cache = SnapshotCache()
+    cache.encode("0", players)
+
+    def encode_all() -> bytes:
+        return MessageTranslator.encode(PlayerSnapshot("0", players))
+
+    def encode_cached() -> bytes:
+        for player in players[:MOVED_PER_LOGIN]:
+            player.x += 1
+            cache.invalidate(player.id)
+        return cache.encode("0", players)
+
+    for name, encode in (("encode all", encode_all), ("cached", encode_cached)):
+        best = min(timeit.repeat(encode, number=10, repeat=10)) / 10
+        print(f"{name:<12}{best * 1000:>8.2f} ms per snapshot of {PLAYERS} players")
+
+
+if __name__ == "__main__":
+    main()
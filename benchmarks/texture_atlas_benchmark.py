@@ -0,0 +1,54 @@
+"""
+Check of the texture atlas built by AssetManager: 200 player displays with
+mixed heads and bodies, counting the textures and sprite groups they draw
+with and reading back the magnification filter of the atlas.
+
+Needs OpenGL, runs headless. Run from the repository root:
+python -m benchmarks.texture_atlas_benchmark
+"""
+
+from pathlib import Path
+
+import pyglet
+
+pyglet.options["headless"] = True
+
+from pyglet import gl  # noqa: E402
+from pyglet.graphics import Batch, Group  # noqa: E402
+
+from client.frontend.asset_manager import AssetManager  # noqa: E402
+from client.frontend.player_display_pool import PlayerDisplayPool  # noqa: E402
+
+PLAYERS = 200
+
+
+def main() -> None:
+    window = pyglet.window.Window(600, 900, visible=False)
+    # Asset paths are relative to the entry script, which is in benchmarks/
+    pyglet.resource._default_loader._script_home = str(Path(__file__).parent.parent)
+    assets = AssetManager()
+    heads, bodies = assets.get_heads(), assets.get_bodies()
+    pool = PlayerDisplayPool(Batch(), Group(1))
+    displays = [
+        pool.acquire(i, i, heads[i % len(heads) + 1], bodies[i % len(bodies) + 1])
+        for i in range(PLAYERS)
+    ]
+    pool.batch.draw()
+
+    sprites = [sprite for d in displays for sprite in (d.head, d.body)]
+    textures = {sprite._texture.id for sprite in sprites}
+    groups = {sprite._group for sprite in sprites}
+    texture = sprites[0]._texture
+    mag_filter = gl.GLint()
+    gl.glBindTexture(texture.target, texture.id)
+    gl.glGetTexParameteriv(texture.target, gl.GL_TEXTURE_MAG_FILTER, mag_filter)
+    gl.glBindTexture(texture.target, 0)
+
+    print(f"{PLAYERS} players")
+    print(f"textures in use: {len(textures)}, sprite groups: {len(groups)}")
+    print(f"nearest filter: {mag_filter.value == gl.GL_NEAREST}")
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Micro-benchmark of MessageTranslator encode/decode cost per message.
+
+Run from the repository root: python -m benchmarks.translator_benchmark
+"""
+
+import timeit
+from functools import partial
+
+from common.model import (
+    Character,
+    ChatMessage,
+    Credentials,
+    NewAccount,
+    Player,
+    PlayerSnapshot,
+    PlayerUpdate,
+)
+from common.translator import Codec, MessageTranslator
+
+MESSAGES = {
+    "PlayerUpdate": PlayerUpdate("1234", 400, 400),
+    "ChatMessage": ChatMessage("1234", "hello there"),
+    "Credentials": Credentials("name", "password"),
+    "NewAccount": NewAccount("name", "password", Character(1, 2)),
+    "Player": Player("1234", Character(1, 2), 400, 400),
+    "PlayerSnapshot(100)": PlayerSnapshot(
+        "1", [Player(str(i), Character(1, 2), i, i) for i in range(100)]
+    ),
+}
+
+
+def measure(statement, number: int) -> float:
+    best = min(timeit.repeat(statement, number=number, repeat=25))
+    return best / number * 1_000_000
+
+
+def main() -> None:
+    print(f"{'message':<22}{'codec':<8}{'encode us':>12}{'decode us':>12}")
+    for name, message in MESSAGES.items():
+        for codec in Codec:
+            encoded = MessageTranslator.encode(message, codec)
+            number = 50 if "Snapshot" in name else 5_000
+            encode = measure(partial(MessageTranslator.encode, message, codec), number)
+            decode = measure(partial(MessageTranslator.decode, encoded), number)
+            print(f"{name:<22}{codec.value:<8}{encode:>12.2f}{decode:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
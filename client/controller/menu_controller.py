@@ -11,6 +11,7 @@ from common.model import (
     Credentials,
     NewAccount,
     PlayerSnapshot,
+    PlayerSnapshotPage,
 )
 
 
@@ -120,6 +121,7 @@ class MenuController(BaseController):
         and updating the game world state.
 
         When the handshake is successful, the screen is switched to the world screen.
+        Snapshot pages arriving before the switch are applied to the world state.
 
         Args:
             data (Any): The received data.
@@ -133,5 +135,10 @@ class MenuController(BaseController):
             else:
                 print(f"Received connection failure but no callback: {data.message}")
         elif isinstance(data, PlayerSnapshot):
+            client = self._factory.client
+            if client is not None and client.welcome is not None:
+                self._world_state.set_tick_rate(client.welcome.tick_rate)
             self._world_state.initialize_world(data)
             self.switch_screen("world")
+        elif isinstance(data, PlayerSnapshotPage):
+            self._world_state.apply_snapshot_page(data)
@@ -4,13 +4,23 @@ from typing import TYPE_CHECKING, Any, Callable
 
 from client.controller.base_controller import BaseController
 from client.frontend.scene_manager import SceneManager
+from client.game.move_predictor import MovePredictor
+from client.game.send_scheduler import MoveSendScheduler
 from client.game.world_state import WorldState
 
 if TYPE_CHECKING:
     from client.game.client_factory import PudinkClientFactory
 
 from client.game.client import ClientCallback
-from common.model import ChatMessage, Player, PlayerDisconnect, PlayerUpdate
+from common.model import (
+    ChatMessage,
+    MoveAck,
+    Player,
+    PlayerDisconnect,
+    PlayerSnapshotPage,
+    PlayerUpdate,
+    WorldDelta,
+)
 
 
 class WorldController(BaseController):
@@ -24,18 +34,26 @@ class WorldController(BaseController):
         on_player_leave_callback (Optional[Callable[[PlayerDisconnect], None]]): Callback function called when a player leaves.
         on_player_update_callback (Optional[Callable[[PlayerUpdate], None]]): Callback function called when a player updates.
         on_chat_message_callback (Optional[Callable[[ChatMessage], None]]): Callback function called when a chat message is received.
+        send_scheduler (MoveSendScheduler): Limits how often the current
+            player's position is sent.
+        predictor (MovePredictor): Turns sent positions into move commands and
+            reconciles them with the server.
     """
 
     on_player_join_callback: Callable[[Player], None] | None = None
     on_player_leave_callback: Callable[[PlayerDisconnect], None] | None = None
     on_player_update_callback: Callable[[PlayerUpdate], None] | None = None
     on_chat_message_callback: Callable[[ChatMessage], None] | None = None
+    send_scheduler: MoveSendScheduler
+    predictor: MovePredictor
 
     def __init__(
         self,
         factory: PudinkClientFactory,
         scene_manager: SceneManager,
         world_state: WorldState,
+        send_rate_hz: float = 20.0,
+        min_send_distance: float = 2.0,
     ) -> None:
         """
         Initialize the WorldController.
@@ -44,9 +62,17 @@ class WorldController(BaseController):
             factory (PudinkClientFactory): The client factory.
             scene_manager (SceneManager): The scene manager.
             world_state (WorldState): The world state.
+            send_rate_hz (float): The maximum number of positions sent to the
+                server per second.
+            min_send_distance (float): The distance the player moves before a
+                new position is sent.
         """
         super().__init__(factory, scene_manager, "world")
         self.world_state = world_state
+        self.predictor = MovePredictor()
+        self.send_scheduler = MoveSendScheduler(
+            self._send_move, send_rate_hz, min_send_distance
+        )
         self.register_callback(
             ClientCallback.DATA_RECEIVED, self._on_update, self.scene
         )
@@ -62,6 +88,8 @@ class WorldController(BaseController):
     def move_player(self, new_x: int, new_y: int) -> None:
         """
         Move the current player to the specified coordinates.
+        The local position changes at once, the server receives it at the
+        rate allowed by the send scheduler and corrects it if needed.
 
         Args:
             new_x (int): The new x-coordinate.
@@ -71,9 +99,38 @@ class WorldController(BaseController):
         if player is None:
             print("No player found when trying to move")
             return
+        self.predictor.start(player.x, player.y)
         update = PlayerUpdate(player.id, new_x, new_y)
         self._on_player_update(update)
-        self.send_message(update)
+        self.send_scheduler.submit(update)
+
+    def _send_move(self, update: PlayerUpdate) -> None:
+        """
+        Send the movement to the position picked by the send scheduler as a
+        numbered command.
+
+        Args:
+            update (PlayerUpdate): The current player's predicted position.
+        """
+        self.send_message(self.predictor.command(update.x, update.y))
+
+    def _on_move_ack(self, ack: MoveAck) -> None:
+        """
+        Handle the server's position of the current player. When it differs from the
+        prediction, the player is moved by the difference, keeping the movement the
+        server has not processed yet.
+
+        Args:
+            ack (MoveAck): The acknowledged command and resulting position.
+        """
+        player = self.get_current_player()
+        offset_x, offset_y = self.predictor.acknowledge(ack)
+        if player is None or (offset_x, offset_y) == (0, 0):
+            return
+        corrected = PlayerUpdate(player.id, player.x + offset_x, player.y + offset_y)
+        self._on_player_update(corrected)
+        # The position waiting to be sent was predicted before the correction
+        self.send_scheduler.shift(offset_x, offset_y)
 
     def send_chat_message(self, message: str) -> None:
         """
@@ -102,8 +159,14 @@ class WorldController(BaseController):
             self._on_player_join(message)
         elif isinstance(message, PlayerUpdate):
             self._on_player_update(message)
+        elif isinstance(message, WorldDelta):
+            self._on_world_delta(message)
+        elif isinstance(message, MoveAck):
+            self._on_move_ack(message)
         elif isinstance(message, ChatMessage):
             self._on_chat_message(message)
+        elif isinstance(message, PlayerSnapshotPage):
+            self._on_snapshot_page(message)
         else:
             print(f"Received unexpected message: {message}")
 
@@ -137,6 +200,19 @@ class WorldController(BaseController):
         """
         return self.world_state.get_players()
 
+    def get_render_position(self, player_id: str) -> tuple[int, int] | None:
+        """
+        Get where a remote player should be drawn this frame.
+
+        Args:
+            player_id (str): The ID of the player.
+
+        Returns:
+            Optional[tuple[int, int]]: The interpolated position, or None for
+                the current player and unknown players.
+        """
+        return self.world_state.get_render_position(player_id)
+
     def _on_player_join(self, new_player: Player) -> None:
         """
         Handle a player joining the world. Update the world state and call the player join callback.
@@ -152,9 +228,13 @@ class WorldController(BaseController):
         """
         Handle a player leaving the world. Update the world state and call the player leave callback.
 
+        Players the client does not know about are ignored.
+
         Args:
             disconnected_player (PlayerDisconnect): The disconnected player.
         """
+        if disconnected_player.id not in self.world_state.get_players():
+            return
         self.world_state.remove_player(disconnected_player)
         if self.on_player_leave_callback:
             self.on_player_leave_callback(disconnected_player)
@@ -171,6 +251,32 @@ class WorldController(BaseController):
         if self.on_player_update_callback:
             self.on_player_update_callback(update)
 
+    def _on_world_delta(self, delta: WorldDelta) -> None:
+        """
+        Handle a batch of player updates sent by the server once per tick.
+        The current player's own position and unknown players are skipped.
+
+        Args:
+            delta (WorldDelta): The batched player updates.
+        """
+        players = self.world_state.get_players()
+        current_player_id = self.world_state.current_player_id
+        for update in delta.updates:
+            if update.id != current_player_id and update.id in players:
+                self._on_player_update(update)
+
+    def _on_snapshot_page(self, page: PlayerSnapshotPage) -> None:
+        """
+        Handle a page of the login snapshot by adding its players to the world
+        and calling the player join callback for each of them.
+
+        Args:
+            page (PlayerSnapshotPage): The snapshot page.
+        """
+        for player in self.world_state.apply_snapshot_page(page):
+            if self.on_player_join_callback:
+                self.on_player_join_callback(player)
+
     def _on_chat_message(self, message: ChatMessage) -> None:
         """
         Handle a chat message by calling the chat message callback.
@@ -190,4 +296,6 @@ class WorldController(BaseController):
             data: The disconnection data.
         """
         print(f"Disconnected from server with message: {data}")
+        self.send_scheduler.reset()
+        self.predictor.reset()
         self.switch_screen("menu")
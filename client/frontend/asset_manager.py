@@ -1,14 +1,22 @@
 import pyglet
 from pyglet.gl import GL_NEAREST, GL_TEXTURE_MAG_FILTER, glBindTexture, glTexParameteri
 from pyglet.image import Texture
+from pyglet.image.atlas import TextureBin
 from pyglet.resource import image
 
 
 class AssetManager:
     """
     The AssetManager class manages the assets used in the application, such as textures for heads, bodies, buttons, and backgrounds.
+
+    Heads, bodies and UI images, the title included, are packed into a shared
+    texture atlas, so sprites using them share one texture and one sprite group
+    and are drawn together. Only the full-screen background keeps its own
+    texture.
     """
 
+    _atlas: TextureBin
+
     _head_mapping: dict[int, Texture]
     _body_mapping: dict[int, Texture]
     _background: Texture
@@ -27,6 +35,7 @@ class AssetManager:
             "assets/body",
         ]
         pyglet.resource.reindex()
+        self._atlas = TextureBin(1024, 1024)
 
         self._head_mapping = {
             1: self._init_image("simple_head.png"),
@@ -42,7 +51,7 @@ class AssetManager:
             4: self._init_image("long_body.png"),
             5: self._init_image("minecraft_body.png"),
         }
-        self._background = self._init_image("background.png")
+        self._background = self._init_image("background.png", atlas=False)
         self._button_pressed = self._init_image("button_pressed.png")
         self._button_depressed = self._init_image("button_depressed.png")
         self._button_hover = self._init_image("button_hover.png")
@@ -50,6 +59,9 @@ class AssetManager:
         self._left = self._init_image("left.png")
         self._right = self._init_image("right.png")
 
+        for texture_atlas in self._atlas.atlases:
+            self._texture_set_mag_filter_nearest(texture_atlas.texture)
+
     def get_head(self, head_id: int) -> Texture:
         if head_id not in self._head_mapping:
             raise ValueError(f"Head id {head_id} not found")
@@ -60,8 +72,13 @@ class AssetManager:
             raise ValueError(f"Body id {body_id} not found")
         return self._body_mapping[body_id]
 
-    def _init_image(self, path: str) -> Texture:
-        img = image(path)
+    # Atlas images get the nearest filter once the atlas is complete
+    def _init_image(self, path: str, atlas: bool = True) -> Texture:
+        if atlas:
+            with pyglet.resource.file(path) as file:
+                data = pyglet.image.load(path, file=file)
+            return self._atlas.add(data, border=1)
+        img = image(path, atlas=False)
         self._texture_set_mag_filter_nearest(img.get_texture())
         return img
 
@@ -1,3 +1,5 @@
+from collections import deque
+
 from pyglet.graphics import Batch, Group
 from pyglet.image import Texture
 from pyglet.shapes import Circle
@@ -11,8 +13,14 @@ class PlayerDisplay:
     """
     Represents a player display in the game. Display consists of multiple sprites that are grouped together.
 
+    Chat bubbles form a bounded ring: the display owns at most max_chat_bubbles
+    labels, and a new message beyond that replaces the oldest bubble. Labels of
+    removed bubbles are hidden and reused.
+
     Attributes:
-        chat_bubbles (list[Label]): A list of chat bubble labels associated with the player display.
+        chat_bubbles (deque[tuple[int, Label]]): The shown chat bubbles with
+            their ids, oldest first.
+        max_chat_bubbles (int): The most chat bubbles shown at once.
         x (int): The x-coordinate of the player display.
         y (int): The y-coordinate of the player display.
         head (Texture): The texture for the player's head.
@@ -20,9 +28,15 @@ class PlayerDisplay:
         batch (Batch): The batch to which the player display belongs.
         group (Group): The group to which the player display belongs.
         shadow (Circle): The shadow circle for the player display.
+        _spare_bubbles (list[Label]): Hidden chat bubble labels kept for reuse.
+        _next_bubble_id (int): The id of the next chat bubble, never reused
+            even after the display is recycled.
     """
 
-    chat_bubbles: list[Label]
+    chat_bubbles: deque[tuple[int, Label]]
+    max_chat_bubbles: int
+    _spare_bubbles: list[Label]
+    _next_bubble_id: int
 
     def __init__(
         self,
@@ -32,6 +46,7 @@ class PlayerDisplay:
         body: Texture,
         batch: Batch,
         group: Group,
+        max_chat_bubbles: int = 3,
     ) -> None:
         self.x = x
         self.y = y
@@ -47,30 +62,114 @@ class PlayerDisplay:
         )
         self.body = Sprite(body, x=x, y=y - 32, batch=batch, group=group)
         self.head = Sprite(head, x=x, y=y + 63, batch=batch, group=group)
-        self.chat_bubbles = []
+        self.chat_bubbles = deque()
+        self.max_chat_bubbles = max_chat_bubbles
+        self._spare_bubbles = []
+        self._next_bubble_id = 0
 
-    def create_chat_bubble(self, message: str) -> None:
+    def show(self, x: int, y: int, head: Texture, body: Texture) -> None:
         """
-        Creates a chat bubble with the given message and adds it to the player display.
+        Shows a hidden display again for another player.
 
         Args:
-            message (str): The message to be displayed in the chat bubble.
+            x (int): The x-coordinate of the player.
+            y (int): The y-coordinate of the player.
+            head (Texture): The texture for the player's head.
+            body (Texture): The texture for the player's body.
+
+        Returns:
+            None
+        """
+        self.head.image = head
+        self.body.image = body
+        self.move(x, y)
+        self.head.visible = True
+        self.body.visible = True
+        self.shadow.visible = True
+
+    def hide(self) -> None:
+        """
+        Hides the display and its chat bubbles, keeping them for reuse.
 
         Returns:
             None
         """
-        self.chat_bubbles.append(
-            Label(
+        self.head.visible = False
+        self.body.visible = False
+        self.shadow.visible = False
+        for _, bubble in self.chat_bubbles:
+            bubble.visible = False
+            self._spare_bubbles.append(bubble)
+        self.chat_bubbles.clear()
+
+    def delete(self) -> None:
+        """
+        Removes the display and its chat bubbles from the batch for good.
+
+        Returns:
+            None
+        """
+        self.head.delete()
+        self.body.delete()
+        self.shadow.delete()
+        for _, bubble in self.chat_bubbles:
+            bubble.delete()
+        for bubble in self._spare_bubbles:
+            bubble.delete()
+        self.chat_bubbles.clear()
+        self._spare_bubbles = []
+
+    def create_chat_bubble(self, message: str) -> int:
+        """
+        Shows a chat bubble with the given message above the others, replacing
+        the oldest bubble when the ring is full.
+
+        Args:
+            message (str): The message to be displayed in the chat bubble.
+
+        Returns:
+            int: The id of the bubble, used to remove it once it expires.
+        """
+        if len(self.chat_bubbles) >= self.max_chat_bubbles:
+            _, bubble = self.chat_bubbles.popleft()
+            bubble.text = message
+        elif self._spare_bubbles:
+            bubble = self._spare_bubbles.pop()
+            bubble.text = message
+            bubble.visible = True
+        else:
+            bubble = Label(
                 message,
-                x=self.x + 48,
-                y=self.y + 160 + 32 * len(self.chat_bubbles),
                 batch=self.batch,
                 anchor_x="center",
                 anchor_y="center",
                 color=ColorPalette.LIGHT.value,
                 group=self.group,
             )
-        )
+        bubble_id = self._next_bubble_id
+        self._next_bubble_id += 1
+        self.chat_bubbles.append((bubble_id, bubble))
+        self._move_chat_bubbles(self.x, self.y)
+        return bubble_id
+
+    def remove_chat_bubble(self, bubble_id: int) -> bool:
+        """
+        Removes a chat bubble, keeping its label for reuse.
+
+        Args:
+            bubble_id (int): The id returned when the bubble was created.
+
+        Returns:
+            bool: False if the bubble was already replaced or the display was recycled.
+        """
+        for index, (shown_id, bubble) in enumerate(self.chat_bubbles):
+            if shown_id == bubble_id:
+                del self.chat_bubbles[index]
+                bubble.visible = False
+                self._spare_bubbles.append(bubble)
+                self._move_chat_bubbles(self.x, self.y)
+                return True
+        return False
 
     def move(self, x: int, y: int) -> None:
         """
@@ -93,22 +192,9 @@ class PlayerDisplay:
         self.shadow.y = y - 32
         self._move_chat_bubbles(x, y)
 
-    def pop_chat_bubble(self, _) -> None:
-        """
-        Removes the oldest chat bubble from the player display.
-
-        Args:
-            _ (Any): Placeholder argument (not used).
-
-        Returns:
-            None
-        """
-        self.chat_bubbles.pop(0).delete()
-        self._move_chat_bubbles(self.x, self.y)
-
     def _move_chat_bubbles(self, x: int, y: int) -> None:
         """
-        Moves the chat bubbles to the specified coordinates.
+        Moves the chat bubbles to the specified coordinates, the oldest at the bottom.
 
         Args:
             x (int): The x-coordinate of the player display.
@@ -117,6 +203,5 @@ class PlayerDisplay:
         Returns:
             None
         """
-        for index, bubble in enumerate(self.chat_bubbles):
-            bubble.x = x + 48
-            bubble.y = y + 160 + 32 * index
+        for index, (_, bubble) in enumerate(self.chat_bubbles):
+            bubble.position = (x + 48, y + 160 + 32 * index, bubble.z)
@@ -0,0 +1,82 @@
+from pyglet.graphics import Batch, Group
+from pyglet.image import Texture
+
+from client.frontend.player_display import PlayerDisplay
+
+
+class PlayerDisplayPool:
+    """
+    Recycles player displays, so players joining and leaving do not keep
+    adding vertex lists to the batch.
+
+    A released display is hidden and handed out again to the next player that
+    joins. Displays released while the pool is full are deleted from the batch.
+
+    Attributes:
+        batch (Batch): The batch the displays are drawn in.
+        group (Group): The group the displays are drawn in.
+        max_size (int): The most hidden displays kept for reuse.
+        created (int): Number of displays created.
+        reused (int): Number of displays handed out again.
+        _free (list[PlayerDisplay]): Hidden displays ready for reuse.
+    """
+
+    batch: Batch
+    group: Group
+    max_size: int
+    created: int
+    reused: int
+    _free: list[PlayerDisplay]
+
+    def __init__(self, batch: Batch, group: Group, max_size: int = 256) -> None:
+        """
+        Initializes the pool.
+
+        Args:
+            batch (Batch): The batch the displays are drawn in.
+            group (Group): The group the displays are drawn in.
+            max_size (int): The most hidden displays kept for reuse.
+        """
+        self.batch = batch
+        self.group = group
+        self.max_size = max_size
+        self.created = 0
+        self.reused = 0
+        self._free = []
+
+    def acquire(self, x: int, y: int, head: Texture, body: Texture) -> PlayerDisplay:
+        """
+        Returns a visible display for a player, reusing a released one if possible.
+
+        Args:
+            x (int): The x-coordinate of the player.
+            y (int): The y-coordinate of the player.
+            head (Texture): The texture for the player's head.
+            body (Texture): The texture for the player's body.
+
+        Returns:
+            PlayerDisplay: The display of the player.
+        """
+        if self._free:
+            display = self._free.pop()
+            display.show(x, y, head, body)
+            self.reused += 1
+            return display
+        self.created += 1
+        return PlayerDisplay(x, y, head, body, self.batch, self.group)
+
+    def release(self, display: PlayerDisplay) -> None:
+        """
+        Hides the display of a player that left and keeps it for reuse.
+
+        Args:
+            display (PlayerDisplay): The display to release.
+        """
+        if len(self._free) >= self.max_size:
+            display.delete()
+            return
+        display.hide()
+        self._free.append(display)
+
+    def __len__(self) -> int:
+        return len(self._free)
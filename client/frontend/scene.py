@@ -2,6 +2,10 @@ from typing import Protocol
 
 
 class Scene(Protocol):
+    def update(self, dt): ...
+
+    def needs_redraw(self) -> bool: ...
+
     def on_draw(self): ...
 
     def on_key_press(self, symbol, modifiers): ...
@@ -13,11 +13,16 @@ class SceneManager:
         window (Window): The main window of the application.
         scenes (Dict[str, BaseRenderer]): A dictionary that maps scene names to scene renderers.
         current_scene (Optional[BaseRenderer]): The currently active scene.
+        dirty (bool): Whether the window has to be redrawn regardless of the
+            scene, e.g. after input.
 
     Methods:
         __init__(self, window): Initializes the SceneManager with the main window.
         register_scene(self, name, scene): Registers a scene with the given name and scene renderer.
         switch_to_scene(self, name): Switches to the scene with the given name.
+        update(self, dt): Advances the current scene by one simulation step.
+        mark_dirty(self, *args): Requests a redraw, usable as a window event handler.
+        needs_redraw(self): Whether the next frame has to be drawn.
         on_draw(self): Renders the current scene.
         on_key_press(self, symbol, modifiers): Handles key press events for the current scene.
     """
@@ -25,11 +30,13 @@ class SceneManager:
     window: Window
     scenes: Dict[str, BaseRenderer]
     current_scene: Optional[BaseRenderer]
+    dirty: bool
 
     def __init__(self, window) -> None:
         self.window = window
         self.scenes = {}
         self.current_scene = None
+        self.dirty = True
 
     def register_scene(self, name: str, scene: BaseRenderer) -> None:
         """
@@ -54,12 +61,42 @@ class SceneManager:
                 old_scene.before_scene_switch()
             self.current_scene = self.scenes[name]
             self.current_scene.after_scene_switch()
+            self.dirty = True
             print(f"Switched to screen '{name}'")
 
+    def update(self, dt: float) -> None:
+        """
+        Advances the current scene by one simulation step.
+
+        Args:
+            dt (float): The duration of the step in seconds.
+        """
+        if self.current_scene:
+            self.current_scene.update(dt)
+
+    def mark_dirty(self, *args) -> None:
+        """
+        Requests a redraw. Accepts and ignores any arguments, so it can handle
+        input events that may change what widgets look like.
+        """
+        self.dirty = True
+
+    def needs_redraw(self) -> bool:
+        """
+        Checks whether anything changed since the last drawn frame.
+
+        Returns:
+            bool: True if the next frame has to be drawn.
+        """
+        if self.dirty:
+            return True
+        return self.current_scene is not None and self.current_scene.needs_redraw()
+
     def on_draw(self) -> None:
         """
         Renders the current scene.
         """
+        self.dirty = False
         if self.current_scene:
             self.current_scene.on_draw()
 
@@ -71,5 +108,6 @@ class SceneManager:
             symbol: The key symbol of the pressed key.
             modifiers: The modifiers (e.g., shift, alt) pressed along with the key.
         """
+        self.dirty = True
         if self.current_scene:
             self.current_scene.on_key_press(symbol, modifiers)
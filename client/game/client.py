@@ -4,13 +4,25 @@ import typing
 from enum import Enum
 from typing import Any
 
-from twisted.internet import protocol
+from twisted.internet import protocol, reactor
+from twisted.internet.interfaces import IListeningPort
 
 if typing.TYPE_CHECKING:
     from client.game.client_factory import PudinkClientFactory
 
-from common.model import ConnectionFailure, PlayerUpdate
-from common.translator import MessageTranslator
+from client.game.movement_channel import ClientMovementChannel
+from common.framing import FrameDecoder, encode_frame
+from common.model import (
+    ConnectionFailure,
+    Hello,
+    MoveAck,
+    MoveCommand,
+    PlayerDisconnect,
+    PlayerUpdate,
+    UdpSession,
+    Welcome,
+)
+from common.translator import PROTOCOL_VERSIONS, Codec, MessageTranslator
 
 
 class ClientCallback(Enum):
@@ -28,27 +40,102 @@ class PudinkClient(protocol.Protocol):
     Represents a client for the Pudink protocol.
 
     This class handles the communication between the client and the server.
+    On connect it offers the server its protocol versions, codecs and features;
+    messages are encoded with the codec the server picks once it replies.
+    After login, movement moves to a UDP channel if the server offers one.
     """
 
     factory: PudinkClientFactory
+    decoder: FrameDecoder
+    codec: Codec
+    welcome: Welcome | None
+    movement_channel: ClientMovementChannel | None
+    _udp_port: IListeningPort | None
 
-    def __init__(self, registeredCallbacks) -> None:
+    def __init__(self, registeredCallbacks, codec: Codec = Codec.JSON) -> None:
         super().__init__()
         self.registered_callbacks = registeredCallbacks
+        self.decoder = FrameDecoder()
+        self.codec = codec
+        self.welcome = None
+        self.movement_channel = None
+        self._udp_port = None
 
     def connectionMade(self):
+        hello = Hello(PROTOCOL_VERSIONS, [codec.value for codec in Codec], True, True)
+        self.send_message(hello)
         self.factory.process_callback(ClientCallback.CONNECTION_SUCCESS, "Connected!")
 
     def dataReceived(self, data):
-        message = MessageTranslator.decode(data)
+        for frame in self.decoder.feed(data):
+            message = MessageTranslator.decode(frame)
+            if isinstance(message, Welcome):
+                self._on_welcome(message)
+            elif isinstance(message, UdpSession):
+                self._on_udp_session(message)
+            else:
+                if isinstance(message, MoveAck) and self.movement_channel:
+                    self.movement_channel.acknowledge(message.sequence)
+                elif isinstance(message, PlayerDisconnect) and self.movement_channel:
+                    self.movement_channel.forget(message.id)
+                self.receive_message(message)
+
+    def receive_message(self, message: Any) -> None:
+        """
+        Passes a message received over TCP or UDP to the registered callbacks.
+
+        Args:
+            message (Any): The received message.
+        """
         self.factory.process_callback(ClientCallback.DATA_RECEIVED, message)
 
+    def _on_welcome(self, welcome: Welcome) -> None:
+        """
+        Applies the options the server picked during the handshake.
+
+        Args:
+            welcome (Welcome): The server's reply to the client's Hello.
+        """
+        print(f"Handshake complete: {welcome}")
+        self.welcome = welcome
+        self.codec = Codec(welcome.codec)
+
+    def _on_udp_session(self, session: UdpSession) -> None:
+        """
+        Opens the UDP movement channel the server offered after login.
+
+        Args:
+            session (UdpSession): The session token and the server's UDP port.
+        """
+        self._close_movement_channel()
+        server = (self.transport.getPeer().host, session.port)  # type: ignore
+        self.movement_channel = ClientMovementChannel(
+            self, bytes.fromhex(session.token), server
+        )
+        self._udp_port = reactor.listenUDP(0, self.movement_channel)  # type: ignore
+
+    def _close_movement_channel(self) -> None:
+        """
+        Stops listening for movement datagrams, movement falls back to TCP.
+        """
+        if self._udp_port is not None:
+            self._udp_port.stopListening()
+        self._udp_port = None
+        self.movement_channel = None
+
     def connectionLost(self, reason):
+        self._close_movement_channel()
         error = ConnectionFailure(reason.getErrorMessage())
         self.factory.process_callback(ClientCallback.CONNECTION_FAILED, error)
 
     def send_message(self, message: Any) -> None:
-        if not isinstance(message, PlayerUpdate):
+        if not isinstance(message, (PlayerUpdate, MoveCommand)):
             print(f"Sending message: {message}")
-        data = MessageTranslator.encode(message)
+        elif self.movement_channel is not None and self.movement_channel.ready:
+            if isinstance(message, MoveCommand):
+                self.movement_channel.send_command(message)
+            else:
+                self.movement_channel.send_move(message)
+            return
+        data = encode_frame(MessageTranslator.encode(message, self.codec))
         self.transport.write(data)  # type: ignore
@@ -5,6 +5,7 @@ from twisted.internet.interfaces import IAddress
 
 from client.game.client import ClientCallback, PudinkClient
 from common.model import ConnectionFailure
+from common.translator import Codec
 
 
 class PudinkClientFactory(protocol.ClientFactory):
@@ -20,6 +21,8 @@ class PudinkClientFactory(protocol.ClientFactory):
         registeredCallbacks: A dictionary of registered callbacks for different events.
         connecting: A boolean indicating if the client is currently connecting.
         connected: A boolean indicating if the client is currently connected.
+        codec: The codec used to encode messages sent to the server
+            until the handshake picks one.
 
     Methods:
         __init__: Initializes the PudinkClientFactory instance.
@@ -41,14 +44,19 @@ class PudinkClientFactory(protocol.ClientFactory):
     registeredCallbacks: dict[ClientCallback, dict[str, Callable[[Any], None]]]
     connecting: bool
     connected: bool
+    codec: Codec
 
-    def __init__(self, host: str = "localhost", port: int = 8000):
+    def __init__(
+        self, host: str = "localhost", port: int = 8000, codec: Codec = Codec.JSON
+    ):
         """
         Initializes the PudinkClientFactory instance.
 
         Args:
             host: The host address to connect to. Defaults to "localhost".
             port: The port number to connect to. Defaults to 8000.
+            codec: The codec used to encode messages until the handshake
+                picks one. Defaults to Codec.JSON.
         """
         self.client = None
         self.host = host
@@ -62,6 +70,7 @@ class PudinkClientFactory(protocol.ClientFactory):
         }
         self.connecting = False
         self.connected = False
+        self.codec = codec
 
     def clientConnectionFailed(self, connector, reason):
         """
@@ -143,7 +152,7 @@ class PudinkClientFactory(protocol.ClientFactory):
             The built PudinkClient protocol instance.
         """
         print(f"Building protocol for {addr}")
-        client = PudinkClient(self.registeredCallbacks)
+        client = PudinkClient(self.registeredCallbacks, self.codec)
         client.factory = self
         if self.client is not None:
             raise ConnectionFailure("Client already built")
@@ -0,0 +1,70 @@
+import time
+from typing import Callable
+
+
+class FixedTimestep:
+    """
+    Turns real elapsed time into a whole number of fixed simulation steps.
+
+    Time left over from one frame carries over to the next, so the simulation
+    advances at the same rate however fast frames are drawn. After a long
+    frame at most max_steps are run and the rest of the time is dropped,
+    so a slow machine falls behind instead of spending every frame catching up.
+
+    Attributes:
+        step (float): The duration of one simulation step, in seconds.
+        max_steps (int): The most steps run for a single frame.
+        dropped (float): Total simulation time dropped because frames were
+            too slow, in seconds.
+    """
+
+    step: float
+    max_steps: int
+    dropped: float
+    _clock: Callable[[], float]
+    _last_time: float | None
+    _accumulator: float
+
+    def __init__(
+        self,
+        step: float = 1.0 / 60.0,
+        max_steps: int = 5,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Initializes the timestep.
+
+        Args:
+            step (float): The duration of one simulation step, in seconds.
+            max_steps (int): The most steps run for a single frame.
+            clock (Callable[[], float]): Returns the current time in seconds.
+        """
+        self.step = step
+        self.max_steps = max_steps
+        self.dropped = 0.0
+        self._clock = clock
+        self._last_time = None
+        self._accumulator = 0.0
+
+    def advance(self) -> int:
+        """
+        Measures the time since the previous call.
+
+        Returns:
+            int: The number of simulation steps to run this frame.
+        """
+        now = self._clock()
+        if self._last_time is None:
+            self._last_time = now
+            return 0
+        self._accumulator += max(now - self._last_time, 0.0)
+        self._last_time = now
+
+        steps = int(self._accumulator / self.step)
+        if steps > self.max_steps:
+            self.dropped += (steps - self.max_steps) * self.step
+            steps = self.max_steps
+            self._accumulator = 0.0
+        else:
+            self._accumulator -= steps * self.step
+        return steps
@@ -0,0 +1,115 @@
+from collections import deque
+
+
+class InterpolationBuffer:
+    """
+    Timestamped positions of a remote player, rendered a little in the past.
+
+    Sampling between two received positions interpolates between them, so
+    remote players move smoothly even when updates arrive at a lower rate than
+    frames are drawn. When updates stop arriving, the last known velocity is
+    extrapolated for a short while, then the player eases back to the newest
+    position, since it most likely stopped rather than lost its updates.
+
+    Attributes:
+        update_interval (float): The expected time between received positions,
+            in seconds.
+        max_extrapolation (float): How long past the newest position to keep
+            moving, in seconds.
+    """
+
+    update_interval: float
+    max_extrapolation: float
+    _samples: deque[tuple[float, int, int]]
+
+    def __init__(
+        self,
+        update_interval: float = 0.05,
+        max_extrapolation: float = 0.1,
+        capacity: int = 32,
+    ) -> None:
+        """
+        Initializes the buffer.
+
+        Args:
+            update_interval (float): The expected time between received
+                positions, in seconds.
+            max_extrapolation (float): How long past the newest position to
+                keep moving, in seconds.
+            capacity (int): The maximum number of positions kept.
+        """
+        self.update_interval = update_interval
+        self.max_extrapolation = max_extrapolation
+        self._samples = deque(maxlen=capacity)
+
+    def push(self, timestamp: float, x: int, y: int) -> None:
+        """
+        Adds a received position. Positions older than the newest one are ignored.
+        After a pause the player is held at the previous position until one
+        update interval before the new one, instead of sliding across the pause.
+
+        Args:
+            timestamp (float): When the position was received, in seconds.
+            x (int): The x-coordinate.
+            y (int): The y-coordinate.
+        """
+        if self._samples:
+            last_time, last_x, last_y = self._samples[-1]
+            if timestamp < last_time:
+                return
+            if timestamp - last_time > 2 * self.update_interval:
+                self._samples.append((timestamp - self.update_interval, last_x, last_y))
+        self._samples.append((timestamp, x, y))
+
+    def reset(self, timestamp: float, x: int, y: int) -> None:
+        """
+        Forgets all positions and places the player at the given one, used
+        when the player is teleported or first seen.
+
+        Args:
+            timestamp (float): When the position was received, in seconds.
+            x (int): The x-coordinate.
+            y (int): The y-coordinate.
+        """
+        self._samples.clear()
+        self._samples.append((timestamp, x, y))
+
+    def sample(self, render_time: float) -> tuple[int, int] | None:
+        """
+        Returns the position at the given time.
+
+        Args:
+            render_time (float): The time to render, usually now minus the render delay.
+
+        Returns:
+            tuple[int, int] | None: The position, or None if no position was received.
+        """
+        samples = self._samples
+        if not samples:
+            return None
+        # Positions older than the pair around render_time are no longer needed
+        while len(samples) > 2 and samples[1][0] <= render_time:
+            samples.popleft()
+
+        first_time, first_x, first_y = samples[0]
+        if render_time <= first_time or len(samples) == 1:
+            return first_x, first_y
+
+        second_time, second_x, second_y = samples[1]
+        overdue = render_time - second_time
+        if overdue > 0:
+            # Past the newest position, keep going in the same direction, then
+            # ease back to it as the player most likely stopped
+            extrapolated = min(overdue, 2 * self.max_extrapolation - overdue)
+            render_time = second_time + max(extrapolated, 0.0)
+        span = second_time - first_time
+        if span <= 0:
+            return second_x, second_y
+        t = (render_time - first_time) / span
+        return (
+            round(first_x + (second_x - first_x) * t),
+            round(first_y + (second_y - first_y) * t),
+        )
+
+    def __len__(self) -> int:
+        return len(self._samples)
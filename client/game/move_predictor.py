@@ -0,0 +1,106 @@
+from collections import deque
+
+from common.model import MoveAck, MoveCommand
+
+
+class MovePredictor:
+    """
+    Numbers the current player's movement and reconciles it with the server.
+
+    The player moves locally at once, while every movement sent to the server
+    is kept until the server acknowledges it with the authoritative position.
+    When that position differs from the predicted one, the movement the server
+    has not processed yet is replayed on top of it.
+
+    Attributes:
+        corrections (int): Number of acks that disagreed with the prediction.
+    """
+
+    corrections: int
+    _sequence: int
+    _position: tuple[int, int] | None
+    _pending: deque[tuple[int, int, int]]
+
+    def __init__(self) -> None:
+        """
+        Initializes the predictor.
+        """
+        self.corrections = 0
+        self._sequence = 0
+        self._position = None
+        self._pending = deque()
+
+    def start(self, x: int, y: int) -> None:
+        """
+        Sets the position movement is measured from, unless it is already
+        known.
+
+        Args:
+            x (int): The x-coordinate the server last placed the player at.
+            y (int): The y-coordinate the server last placed the player at.
+        """
+        if self._position is None:
+            self._position = (x, y)
+
+    def reset(self) -> None:
+        """
+        Forgets the position and unacknowledged movement, used when the
+        connection or scene changes.
+        """
+        self._position = None
+        self._pending.clear()
+
+    def command(self, x: int, y: int) -> MoveCommand:
+        """
+        Creates the command moving the player from the previous commanded
+        position to the given one.
+
+        Args:
+            x (int): The predicted x-coordinate.
+            y (int): The predicted y-coordinate.
+
+        Returns:
+            MoveCommand: The command to send to the server.
+        """
+        start_x, start_y = self._position if self._position is not None else (x, y)
+        self._sequence += 1
+        self._position = (x, y)
+        self._pending.append((self._sequence, x, y))
+        return MoveCommand(self._sequence, x - start_x, y - start_y)
+
+    def acknowledge(self, ack: MoveAck) -> tuple[int, int]:
+        """
+        Drops the acknowledged movement and replays the rest on top of the
+        server's position.
+
+        Args:
+            ack (MoveAck): The server's position after the command with the
+                ack's sequence number.
+
+        Returns:
+            tuple[int, int]: How far the predicted position has to be moved,
+                (0, 0) if the prediction was right.
+        """
+        while self._pending and self._pending[0][0] < ack.sequence:
+            self._pending.popleft()
+        if not self._pending or self._pending[0][0] != ack.sequence:
+            return 0, 0
+        _, predicted_x, predicted_y = self._pending.popleft()
+        offset_x = ack.x - predicted_x
+        offset_y = ack.y - predicted_y
+        if (offset_x, offset_y) == (0, 0):
+            return 0, 0
+
+        self.corrections += 1
+        self._pending = deque(
+            (sequence, x + offset_x, y + offset_y) for sequence, x, y in self._pending
+        )
+        if self._position is not None:
+            self._position = (
+                self._position[0] + offset_x,
+                self._position[1] + offset_y,
+            )
+        return offset_x, offset_y
+
+    def __len__(self) -> int:
+        return len(self._pending)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import typing
+from collections import deque
+
+from twisted.internet.protocol import DatagramProtocol
+from twisted.internet.task import LoopingCall
+
+from common import datagram
+from common.model import MoveCommand, PlayerUpdate, WorldDelta
+
+if typing.TYPE_CHECKING:
+    from client.game.client import PudinkClient
+
+Address = tuple[str, int]
+
+
+class ClientMovementChannel(DatagramProtocol):
+    """
+    Exchanges movement with the server over UDP next to the TCP connection.
+
+    The channel pings the server until it answers; until then, or when UDP is
+    blocked, movement keeps going over TCP. Positions that arrive after newer
+    ones for the same player are dropped. Move commands are repeated in every
+    datagram until the server acknowledges them, so a lost datagram loses no
+    movement.
+
+    Attributes:
+        ready (bool): Whether the server answered and movement can be sent.
+        stale (int): Number of positions dropped because newer ones were applied.
+    """
+
+    ready: bool
+    stale: int
+    _client: PudinkClient
+    _token: bytes
+    _server: Address
+    _sequence: int
+    _latest: dict[str, int]
+    _unacked: deque[MoveCommand]
+    _ping_loop: LoopingCall
+    _pings_left: int
+
+    def __init__(
+        self,
+        client: PudinkClient,
+        token: bytes,
+        server: Address,
+        max_pings: int = 5,
+    ) -> None:
+        """
+        Initializes the channel.
+
+        Args:
+            client (PudinkClient): The TCP client the channel belongs to.
+            token (bytes): The session token the server sent after login.
+            server (Address): The server's IP address and UDP port.
+            max_pings (int): How many times to ping before staying on TCP.
+        """
+        self.ready = False
+        self.stale = 0
+        self._client = client
+        self._token = token
+        self._server = server
+        self._sequence = 0
+        self._latest = {}
+        self._unacked = deque(maxlen=datagram.MAX_COMMANDS_PER_DATAGRAM)
+        self._ping_loop = LoopingCall(self._ping)
+        self._pings_left = max_pings
+
+    def startProtocol(self) -> None:
+        self._ping_loop.start(1.0)
+
+    def stopProtocol(self) -> None:
+        if self._ping_loop.running:
+            self._ping_loop.stop()
+
+    def send_move(self, update: PlayerUpdate) -> None:
+        """
+        Sends the current player's position as a sequenced datagram.
+
+        Args:
+            update (PlayerUpdate): The current player's new position.
+        """
+        self._sequence += 1
+        move = datagram.encode_move(self._token, self._sequence, update.x, update.y)
+        self.transport.write(move, self._server)  # type: ignore
+
+    def send_command(self, command: MoveCommand) -> None:
+        """
+        Sends a move command together with the ones not yet acknowledged.
+
+        Args:
+            command (MoveCommand): The current player's movement.
+        """
+        self._unacked.append(command)
+        encoded = datagram.encode_commands(self._token, list(self._unacked))
+        self.transport.write(encoded, self._server)  # type: ignore
+
+    def acknowledge(self, sequence: int) -> None:
+        """
+        Stops repeating the commands the server has applied.
+
+        Args:
+            sequence (int): The sequence number of the newest applied command.
+        """
+        while self._unacked and self._unacked[0].sequence <= sequence:
+            self._unacked.popleft()
+
+    def forget(self, player_id: str) -> None:
+        """
+        Forgets the newest sequence of a player that left or went out of range.
+
+        Args:
+            player_id (str): The ID of the player.
+        """
+        self._latest.pop(player_id, None)
+
+    def datagramReceived(self, data: bytes, address: Address) -> None:
+        if address != self._server:
+            return
+        try:
+            if data[:1] == bytes([datagram.PONG]):
+                self._on_pong(datagram.decode_token(data))
+            elif data[:1] == bytes([datagram.DELTA]):
+                self._on_delta(*datagram.decode_delta(data))
+        except ValueError as e:
+            print(f"Dropping invalid datagram: {e}")
+
+    def _ping(self) -> None:
+        if self._pings_left == 0:
+            print("No answer over UDP, movement stays on TCP")
+            self._ping_loop.stop()
+            return
+        self._pings_left -= 1
+        self.transport.write(datagram.encode_ping(self._token), self._server)  # type: ignore
+
+    def _on_pong(self, token: bytes) -> None:
+        if token != self._token or self.ready:
+            return
+        self.ready = True
+        if self._ping_loop.running:
+            self._ping_loop.stop()
+
+    def _on_delta(self, sequence: int, updates: list[PlayerUpdate]) -> None:
+        fresh = []
+        for update in updates:
+            if self._latest.get(update.id, -1) > sequence:
+                self.stale += 1
+                continue
+            self._latest[update.id] = sequence
+            fresh.append(update)
+        if fresh:
+            self._client.receive_message(WorldDelta(fresh))
@@ -13,11 +13,30 @@ from client.controller.world_controller import WorldController
 from client.frontend.asset_manager import AssetManager
 from client.frontend.scene_manager import SceneManager
 from client.game.client_factory import PudinkClientFactory
+from client.game.fixed_timestep import FixedTimestep
 from client.game.world_state import WorldState
 from client.renderer.menu_renderer import MenuRenderer
 from client.renderer.title_renderer import TitleRenderer
 from client.renderer.world_renderer import WorldRenderer
 
+# Window events that may change what is on screen without the scene knowing
+_REDRAW_EVENTS = (
+    "on_mouse_motion",
+    "on_mouse_press",
+    "on_mouse_release",
+    "on_mouse_drag",
+    "on_mouse_scroll",
+    "on_mouse_enter",
+    "on_mouse_leave",
+    "on_text",
+    "on_text_motion",
+    "on_text_motion_select",
+    "on_key_release",
+    "on_expose",
+    "on_show",
+    "on_activate",
+)
+
 
 class PudinkGame:
     """
@@ -30,12 +49,21 @@ class PudinkGame:
         _game_loop (LoopingCall): The looping call for the game tick.
         _game_loop_job (Optional[Deferred[LoopingCall]]): The deferred job for the game loop.
         _window (Window): The Pyglet window for rendering the game.
+        _scene_manager (SceneManager): The scene manager updating and drawing
+            the current scene.
+        _timestep (FixedTimestep): Turns real elapsed time into simulation steps.
+        _frame_rate (float): The most frames drawn per second.
+        skipped_frames (int): Number of frames not drawn because the previous
+            ones took too long.
 
     Args:
         window (Window): The Pyglet window for rendering the game.
         factory (PudinkClientFactory): The client factory used for network communication.
         host (str, optional): The host address to connect to. Defaults to "localhost".
         port (int, optional): The port number to connect to. Defaults to 8000.
+        frame_rate (float, optional): The most frames drawn per second. Defaults to 60.
+        simulation_rate (float, optional): The simulation steps per second.
+            Defaults to 60.
     """
 
     _factory: PudinkClientFactory
@@ -44,6 +72,10 @@ class PudinkGame:
     _game_loop: LoopingCall
     _game_loop_job: Optional[Deferred[LoopingCall]]
     _window: Window
+    _scene_manager: SceneManager
+    _timestep: FixedTimestep
+    _frame_rate: float
+    skipped_frames: int
 
     def __init__(
         self,
@@ -51,6 +83,8 @@ class PudinkGame:
         factory: PudinkClientFactory,
         host: str = "localhost",
         port: int = 8000,
+        frame_rate: float = 60.0,
+        simulation_rate: float = 60.0,
     ):
         """
         Initializes a new instance of the PudinkGame class.
@@ -60,21 +94,31 @@ class PudinkGame:
             factory (PudinkClientFactory): The client factory used for network communication.
             host (str, optional): The host address to connect to. Defaults to "localhost".
             port (int, optional): The port number to connect to. Defaults to 8000.
+            frame_rate (float, optional): The most frames drawn per second.
+                Defaults to 60.
+            simulation_rate (float, optional): The simulation steps per
+                second. Defaults to 60.
         """
         print("Starting game")
         self._factory = factory
         self._host = host
         self._port = port
 
-        self._game_loop = LoopingCall(self._game_tick)
+        self._game_loop = LoopingCall.withCount(self._game_tick)
         self._game_loop_job = None
+        self._timestep = FixedTimestep(1.0 / simulation_rate)
+        self._frame_rate = frame_rate
+        self.skipped_frames = 0
 
         self._window = window
 
         scene_manager = SceneManager(self._window)
+        self._scene_manager = scene_manager
 
         self._window.on_draw = scene_manager.on_draw
         self._window.on_key_press = scene_manager.on_key_press
+        for event_type in _REDRAW_EVENTS:
+            setattr(self._window, event_type, scene_manager.mark_dirty)
         self._window.on_close = self.stop
 
         world_state = WorldState()
@@ -93,16 +137,28 @@ class PudinkGame:
         title_controller.switch_screen(title_controller.scene)
         print("Game started")
 
-    def _game_tick(self):
+    def _game_tick(self, frames: int):
         """
         Performs a single game tick.
 
-        This method is called by the game loop at a fixed interval.
-        It updates the game state, handles user input, and renders the game.
+        This method is called by the game loop at most frame_rate times per second.
+        It handles user input, runs as many fixed simulation steps as the real time
+        since the previous tick calls for, and renders the game once. When a tick
+        took longer than a frame, the frames it overran are skipped rather than
+        drawn late, so the reactor keeps time for network traffic. Frames in
+        which nothing changed are not drawn at all.
+
+        Args:
+            frames (int): The number of frame intervals since the previous tick.
         """
+        self.skipped_frames += frames - 1
         pyglet.clock.tick()
         self._window.switch_to()
         self._window.dispatch_events()
+        for _ in range(self._timestep.advance()):
+            self._scene_manager.update(self._timestep.step)
+        if not self._scene_manager.needs_redraw():
+            return
         self._window.dispatch_event("on_draw")
         self._window.flip()
 
@@ -112,7 +168,7 @@ class PudinkGame:
 
         This method starts the game loop and runs the Pyglet event loop.
         """
-        self._game_loop_job = self._game_loop.start(1.0 / 30.0)
+        self._game_loop_job = self._game_loop.start(1.0 / self._frame_rate)
         reactor.run()  # type: ignore
 
     def stop(self):
@@ -0,0 +1,165 @@
+from typing import Callable
+
+from twisted.internet import reactor
+from twisted.internet.interfaces import IDelayedCall, IReactorTime
+
+from common.model import PlayerUpdate
+
+
+class MoveSendScheduler:
+    """
+    Limits how often the current player's position is sent to the server.
+
+    A position is sent at most rate_hz times per second and only once the
+    player moved at least min_distance from the last sent position. When the
+    player stops, the resting position is always sent after the interval,
+    however small the last step was.
+
+    Attributes:
+        sent (int): Number of positions sent.
+        skipped (int): Number of positions not sent because a newer one replaced them.
+    """
+
+    sent: int
+    skipped: int
+    _send: Callable[[PlayerUpdate], None]
+    _interval: float
+    _min_distance_squared: float
+    _clock: IReactorTime
+    _last_sent: PlayerUpdate | None
+    _last_sent_at: float
+    _pending: PlayerUpdate | None
+    _pending_at: float
+    _trailing_call: IDelayedCall | None
+
+    def __init__(
+        self,
+        send: Callable[[PlayerUpdate], None],
+        rate_hz: float = 20.0,
+        min_distance: float = 2.0,
+        clock: IReactorTime = reactor,  # type: ignore
+    ) -> None:
+        """
+        Initializes the scheduler.
+
+        Args:
+            send (Callable[[PlayerUpdate], None]): Sends a position to the server.
+            rate_hz (float): The maximum number of positions sent per second.
+            min_distance (float): The distance to move before a new position is sent.
+            clock (IReactorTime): The clock used to measure and schedule sends.
+        """
+        self.sent = 0
+        self.skipped = 0
+        self._send = send
+        self._interval = 1.0 / rate_hz
+        self._min_distance_squared = min_distance**2
+        self._clock = clock
+        self._last_sent = None
+        self._last_sent_at = float("-inf")
+        self._pending = None
+        self._pending_at = float("-inf")
+        self._trailing_call = None
+
+    def submit(self, update: PlayerUpdate) -> None:
+        """
+        Sends the position now if allowed, otherwise keeps it as the next to send.
+
+        Args:
+            update (PlayerUpdate): The current player's new position.
+        """
+        if self._pending is not None:
+            self.skipped += 1
+        self._pending = update
+        self._pending_at = self._clock.seconds()
+
+        if self._can_send_now():
+            self._flush()
+        elif self._trailing_call is None:
+            self._schedule_trailing()
+
+    def shift(self, dx: int, dy: int) -> None:
+        """
+        Moves the pending and last sent positions after a server correction.
+        The rate limit keeps counting from the last send.
+
+        Args:
+            dx (int): The correction along the x-axis.
+            dy (int): The correction along the y-axis.
+        """
+        if self._pending is not None:
+            self._pending = self._shifted(self._pending, dx, dy)
+        if self._last_sent is not None:
+            self._last_sent = self._shifted(self._last_sent, dx, dy)
+
+    @staticmethod
+    def _shifted(update: PlayerUpdate, dx: int, dy: int) -> PlayerUpdate:
+        return PlayerUpdate(update.id, update.x + dx, update.y + dy)
+
+    def reset(self) -> None:
+        """
+        Forgets pending positions, used when the connection or scene changes.
+        """
+        if self._trailing_call is not None and self._trailing_call.active():
+            self._trailing_call.cancel()
+        self._trailing_call = None
+        self._pending = None
+        self._pending_at = float("-inf")
+        self._last_sent = None
+        self._last_sent_at = float("-inf")
+
+    def _moved_enough(self, update: PlayerUpdate) -> bool:
+        if self._last_sent is None:
+            return True
+        dx = update.x - self._last_sent.x
+        dy = update.y - self._last_sent.y
+        return dx * dx + dy * dy >= self._min_distance_squared
+
+    def _can_send_now(self) -> bool:
+        if self._pending is None:
+            return False
+        # Compared with the same sums the trailing call is scheduled at, so
+        # it is not rescheduled over and over because of rounding
+        now = self._clock.seconds()
+        if now < self._last_sent_at + self._interval:
+            return False
+        resting = now >= self._pending_at + self._interval
+        if resting:
+            return self._pending != self._last_sent
+        return self._moved_enough(self._pending)
+
+    # Wakes up when the rate limit allows the pending position to be sent,
+    # or when the player has rested long enough for it to be the final one
+    def _schedule_trailing(self) -> None:
+        if self._pending is None:
+            return
+        now = self._clock.seconds()
+        wake_at = self._pending_at + self._interval
+        if self._moved_enough(self._pending):
+            wake_at = min(wake_at, self._last_sent_at + self._interval)
+        wake_at = max(wake_at, self._last_sent_at + self._interval)
+        self._trailing_call = self._clock.callLater(
+            max(wake_at - now, 0.0), self._send_trailing
+        )
+
+    def _send_trailing(self) -> None:
+        self._trailing_call = None
+        if self._pending is None:
+            return
+        if self._can_send_now():
+            self._flush()
+        elif self._pending == self._last_sent:
+            self._pending = None
+        else:
+            self._schedule_trailing()
+
+    def _flush(self) -> None:
+        if self._pending is None:
+            return
+        update, self._pending = self._pending, None
+        self._last_sent = update
+        self._last_sent_at = self._clock.seconds()
+        self.sent += 1
+        self._send(update)
+        if self._trailing_call is not None and self._trailing_call.active():
+            self._trailing_call.cancel()
+        self._trailing_call = None
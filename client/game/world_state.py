@@ -1,15 +1,48 @@
+import time
 from dataclasses import dataclass, field
 from typing import Dict, Optional
 
-from common.model import Player, PlayerDisconnect, PlayerSnapshot, PlayerUpdate
+from client.game.interpolation_buffer import InterpolationBuffer
+from common.model import (
+    Player,
+    PlayerDisconnect,
+    PlayerSnapshot,
+    PlayerSnapshotPage,
+    PlayerUpdate,
+)
 
 
 @dataclass
 class WorldState:
-    """Represents the state of the game world."""
+    """Represents the state of the game world.
+
+    Remote players are drawn render_delay seconds in the past from their
+    interpolation buffers, players holds their newest known positions.
+    Both the delay and the update interval follow the server's tick rate.
+    """
 
     current_player_id: Optional[str] = None
     players: Dict[str, Player] = field(default_factory=dict)
+    buffers: Dict[str, InterpolationBuffer] = field(default_factory=dict)
+    render_delay: float = 0.1
+    update_interval: float = 0.05
+
+    def set_tick_rate(self, tick_rate: float) -> None:
+        """Matches interpolation to the rate the server sends updates at.
+
+        Remote players are drawn two updates in the past, so one late or
+        lost update still leaves a position to interpolate towards.
+
+        Args:
+            tick_rate (float): The number of updates the server sends per second.
+
+        Returns:
+            None
+        """
+        self.update_interval = 1.0 / tick_rate
+        self.render_delay = 2 * self.update_interval
+        for buffer in self.buffers.values():
+            buffer.update_interval = self.update_interval
 
     def add_player(self, player: Player) -> None:
         """Adds a player to the game.
@@ -21,6 +54,7 @@ class WorldState:
             None
         """
         self.players[player.id] = player
+        self._reset_buffer(player)
 
     def remove_player(self, disconnect: PlayerDisconnect) -> None:
         """Removes a player from the game.
@@ -37,12 +71,16 @@ class WorldState:
         if disconnect.id not in self.players:
             raise ValueError(f"Player ID '{disconnect.id}' does not exist.")
         self.players.pop(disconnect.id)
+        self.buffers.pop(disconnect.id, None)
 
-    def update_player(self, update: PlayerUpdate) -> None:
+    def update_player(
+        self, update: PlayerUpdate, timestamp: Optional[float] = None
+    ) -> None:
         """Updates the location of a player.
 
         Args:
             update (PlayerUpdate): The updated player information.
+            timestamp (Optional[float]): When the update was received, defaults to now.
 
         Returns:
             None
@@ -54,6 +92,28 @@ class WorldState:
             raise ValueError(f"Player ID '{update.id}' does not exist.")
         self.players[update.id].x = update.x
         self.players[update.id].y = update.y
+        if update.id in self.buffers:
+            now = time.monotonic() if timestamp is None else timestamp
+            self.buffers[update.id].push(now, update.x, update.y)
+
+    def get_render_position(
+        self, player_id: str, now: Optional[float] = None
+    ) -> Optional[tuple[int, int]]:
+        """Gets where a remote player should be drawn, render_delay seconds in the past.
+
+        Args:
+            player_id (str): The ID of the player.
+            now (Optional[float]): The current time, defaults to now.
+
+        Returns:
+            Optional[tuple[int, int]]: The position, or None for the current player
+                and unknown players.
+        """
+        buffer = self.buffers.get(player_id)
+        if buffer is None:
+            return None
+        now = time.monotonic() if now is None else now
+        return buffer.sample(now - self.render_delay)
 
     def get_player(self, player_id: str) -> Player:
         """Gets the location of a specific player.
@@ -98,6 +158,44 @@ class WorldState:
         Returns:
             None
         """
+        self.current_player_id = snapshot.current_player_id
         for player in snapshot.players:
             self.players[player.id] = player
-        self.current_player_id = snapshot.current_player_id
+            self._reset_buffer(player)
+
+    def apply_snapshot_page(self, page: PlayerSnapshotPage) -> list[Player]:
+        """Adds the players of a snapshot page received after the initial snapshot.
+
+        Pages arrive over the next few frames, farther players last, so the
+        world fills in incrementally around the current player.
+
+        Args:
+            page (PlayerSnapshotPage): The page of the game world snapshot.
+
+        Returns:
+            list[Player]: The players added or updated by the page.
+        """
+        for player in page.players:
+            self.players[player.id] = player
+            self._reset_buffer(player)
+        return page.players
+
+    def _reset_buffer(self, player: Player) -> None:
+        """Starts a new interpolation buffer at the player's position.
+
+        The current player moves locally and is not interpolated.
+
+        Args:
+            player (Player): The player that appeared.
+
+        Returns:
+            None
+        """
+        if player.id == self.current_player_id:
+            self.buffers.pop(player.id, None)
+            return
+        buffer = self.buffers.get(player.id)
+        if buffer is None:
+            buffer = InterpolationBuffer(self.update_interval)
+            self.buffers[player.id] = buffer
+        buffer.reset(time.monotonic(), player.x, player.y)
@@ -18,12 +18,16 @@ class BaseRenderer:
 
     Attributes:
         _handlers (list): A list of event handlers.
+        _dirty (bool): Whether something changed since the last frame was drawn.
 
     Args:
         window (Window): The window object for rendering.
         asset_manager (AssetManager): The asset manager for accessing game assets.
 
     Methods:
+        update(dt): Advances the scene by one simulation step.
+        mark_dirty(): Requests the scene to be drawn in the next frame.
+        needs_redraw(): Whether the scene has to be drawn in the next frame.
         on_draw(): Clears the window and draws the batch.
         on_key_press(symbol, modifiers): Handles key press events.
         before_scene_switch(): Prepares for switching scenes by disabling event handlers.
@@ -36,6 +40,7 @@ class BaseRenderer:
     """
 
     _handlers: list
+    _dirty: bool
 
     def __init__(self, window: Window, asset_manager: AssetManager) -> None:
         self.window = window
@@ -53,8 +58,23 @@ class BaseRenderer:
             group=self.background_group,
         )
         self._handlers = []
+        self._dirty = True
+
+    def update(self, dt: float) -> None:
+        pass
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    # A focused text entry keeps redrawing so its caret blinks
+    def needs_redraw(self) -> bool:
+        return self._dirty or any(
+            isinstance(handler, TextEntry) and handler.focus
+            for handler in self._handlers
+        )
 
     def on_draw(self):
+        self._dirty = False
         self.window.clear()
         self.batch.draw()
 
@@ -192,3 +192,4 @@ class MenuRenderer(BaseRenderer):
 
     def _on_fail(self, message: str) -> None:
         self._status_message.text = message
+        self.mark_dirty()
@@ -81,3 +81,4 @@ class TitleRenderer(BaseRenderer):
     def _update_status_message(self, message: str) -> None:
         print(f"Updating status message: {message}")
         self._status_message.text = message
+        self.mark_dirty()
@@ -1,3 +1,6 @@
+import time
+from collections import deque
+
 import pyglet
 from pyglet.gui import TextEntry
 from pyglet.sprite import Sprite
@@ -6,9 +9,13 @@ from pyglet.window import Window, key
 from client.controller.world_controller import WorldController
 from client.frontend.asset_manager import AssetManager
 from client.frontend.player_display import PlayerDisplay
+from client.frontend.player_display_pool import PlayerDisplayPool
 from client.renderer.base_renderer import BaseRenderer
 from common.model import ChatMessage, Player, PlayerDisconnect, PlayerUpdate
 
+# How long a chat bubble is shown, in seconds
+CHAT_BUBBLE_LIFETIME = 5.0
+
 
 class WorldRenderer(BaseRenderer):
     """
@@ -16,6 +23,10 @@ class WorldRenderer(BaseRenderer):
 
     Attributes:
         _players (dict[str, PlayerDisplay]): A dictionary mapping player IDs to their corresponding PlayerDisplay objects.
+        _display_pool (PlayerDisplayPool): Recycles the displays of players that left.
+        _bubble_expiry (deque[tuple[float, PlayerDisplay, int]]): When each
+            chat bubble expires, with its display and bubble id. Every bubble
+            lives equally long, so the queue is ordered by expiry.
         _world_controller (WorldController): The controller for the game world.
         _chat_entry (TextEntry): The text entry widget for chat messages.
         _background_sprite (Sprite): The background sprite for the game world.
@@ -28,6 +39,8 @@ class WorldRenderer(BaseRenderer):
     """
 
     _players: dict[str, PlayerDisplay]
+    _display_pool: PlayerDisplayPool
+    _bubble_expiry: deque[tuple[float, PlayerDisplay, int]]
     _world_controller: WorldController
 
     _chat_entry: TextEntry
@@ -65,14 +78,21 @@ class WorldRenderer(BaseRenderer):
         )
 
         self._players = {}
+        self._display_pool = PlayerDisplayPool(self.batch, self.foreground_group)
+        self._bubble_expiry = deque()
         self._keys = key.KeyStateHandler()
 
-    def on_draw(self) -> None:
+    def update(self, dt: float) -> None:
         """
-        Called when the game window needs to be redrawn.
+        Moves the current player by one simulation step and the remote players
+        to their interpolated positions, then removes expired chat bubbles.
+
+        Args:
+            dt (float): The duration of the step in seconds.
         """
-        super().on_draw()
-        self.move_player(1 / 60)
+        self.move_player(dt)
+        self._interpolate_players()
+        self._expire_chat_bubbles(time.monotonic())
 
     def _get_current_player(self) -> PlayerDisplay:
         """
@@ -174,24 +194,38 @@ class WorldRenderer(BaseRenderer):
 
         # Update the frontend
         self._get_current_player().move(new_x, new_y)
+        self.mark_dirty()
         # Update the backend
         self._world_controller.move_player(new_x, new_y)
 
+    def _interpolate_players(self) -> None:
+        """
+        Moves the remote players to their interpolated positions for this frame.
+        """
+        for player_id, display in self._players.items():
+            position = self._world_controller.get_render_position(player_id)
+            if position is not None and position != (display.x, display.y):
+                display.move(*position)
+                self.mark_dirty()
+
     def on_player_join(self, player: Player) -> None:
         """
-        Called when a player joins the game.
+        Called when a player joins the game or comes into range.
+        A player that is already displayed is only moved.
 
         Args:
             player (Player): The player that joined the game.
         """
+        self.mark_dirty()
+        if player.id in self._players:
+            self._players[player.id].move(player.x, player.y)
+            return
         print(f"Player {player.id} joined.")
-        self._players[player.id] = PlayerDisplay(
+        self._players[player.id] = self._display_pool.acquire(
             player.x,
             player.y,
             self.asset_manager.get_head(player.character.head_type),
             self.asset_manager.get_body(player.character.body_type),
-            self.batch,
-            self.foreground_group,
         )
 
     def on_player_leave(self, disconnect: PlayerDisconnect) -> None:
@@ -202,16 +236,20 @@ class WorldRenderer(BaseRenderer):
             disconnect (PlayerDisconnect): The player that disconnected.
         """
         print(f"Player with id {disconnect.id} disconnected.")
-        self._players.pop(disconnect.id)
+        self._display_pool.release(self._players.pop(disconnect.id))
+        self.mark_dirty()
 
     def on_player_update(self, player: PlayerUpdate) -> None:
         """
         Called when a player's position is updated.
+        Remote players are moved by the per-frame interpolation instead.
 
         Args:
             player (PlayerUpdate): The updated player information.
         """
-        self._players[player.id].move(player.x, player.y)
+        if self._world_controller.get_render_position(player.id) is None:
+            self._players[player.id].move(player.x, player.y)
+            self.mark_dirty()
 
     def on_chat_message(self, chat_message: ChatMessage) -> None:
         """
@@ -221,5 +259,22 @@ class WorldRenderer(BaseRenderer):
             chat_message (ChatMessage): The received chat message.
         """
         player = self._players[chat_message.player_id]
-        player.create_chat_bubble(chat_message.message)
-        pyglet.clock.schedule_once(player.pop_chat_bubble, 5)
+        bubble_id = player.create_chat_bubble(chat_message.message)
+        self._bubble_expiry.append(
+            (time.monotonic() + CHAT_BUBBLE_LIFETIME, player, bubble_id)
+        )
+        self.mark_dirty()
+
+    def _expire_chat_bubbles(self, now: float) -> None:
+        """
+        Removes the chat bubbles of all players that expired by now.
+        Bubbles already replaced by newer ones, or of players that left, are skipped.
+
+        Args:
+            now (float): The current time in seconds.
+        """
+        expiry = self._bubble_expiry
+        while expiry and expiry[0][0] <= now:
+            _, player, bubble_id = expiry.popleft()
+            if player.remove_chat_bubble(bubble_id):
+                self.mark_dirty()
@@ -0,0 +1,123 @@
+import struct
+
+from common.model import MoveCommand, PlayerUpdate
+from common.translator import _intern_player_id
+
+# Movement datagrams exchanged over UDP next to the TCP connection. Every
+# datagram starts with a type byte. Client datagrams carry the session token
+# handed out over TCP after login, server datagrams are only accepted from
+# the server's address. Sequence numbers let the receiver drop datagrams
+# that arrive after newer ones.
+MOVE = 0x10
+DELTA = 0x11
+PING = 0x12
+PONG = 0x13
+COMMANDS = 0x14
+
+TOKEN_SIZE = 16
+
+# Keeps delta datagrams under 1200 bytes so they are not fragmented
+MAX_UPDATES_PER_DATAGRAM = 96
+
+# Move commands are resent until acknowledged, a datagram carries the newest
+MAX_COMMANDS_PER_DATAGRAM = 32
+
+_MOVE_LAYOUT = struct.Struct(">B16sIii")
+_TOKEN_LAYOUT = struct.Struct(">B16s")
+_DELTA_LAYOUT = struct.Struct(">BIH")
+_POSITION_LAYOUT = struct.Struct(">Iii")
+_COMMANDS_LAYOUT = struct.Struct(">B16sB")
+_COMMAND_LAYOUT = struct.Struct(">Iii")
+
+
+def encode_move(token: bytes, sequence: int, x: int, y: int) -> bytes:
+    return _MOVE_LAYOUT.pack(MOVE, token, sequence, x, y)
+
+
+# Encodes the newest commands, oldest first. Every datagram repeats the
+# commands not yet acknowledged, so a lost datagram loses no movement.
+def encode_commands(token: bytes, commands: list[MoveCommand]) -> bytes:
+    commands = commands[-MAX_COMMANDS_PER_DATAGRAM:]
+    encoded = bytearray(_COMMANDS_LAYOUT.size + _COMMAND_LAYOUT.size * len(commands))
+    _COMMANDS_LAYOUT.pack_into(encoded, 0, COMMANDS, token, len(commands))
+    offset = _COMMANDS_LAYOUT.size
+    for command in commands:
+        _COMMAND_LAYOUT.pack_into(
+            encoded, offset, command.sequence, command.dx, command.dy
+        )
+        offset += _COMMAND_LAYOUT.size
+    return bytes(encoded)
+
+
+def encode_ping(token: bytes) -> bytes:
+    return _TOKEN_LAYOUT.pack(PING, token)
+
+
+def encode_pong(token: bytes) -> bytes:
+    return _TOKEN_LAYOUT.pack(PONG, token)
+
+
+# Splits the updates into as many datagrams as needed, all with the same
+# sequence number. Returns None when a player id does not fit the unsigned
+# 32-bit field, so the delta can be sent over TCP instead.
+def encode_deltas(sequence: int, updates: list[PlayerUpdate]) -> list[bytes] | None:
+    numeric_ids = [_intern_player_id(update.id) for update in updates]
+    if None in numeric_ids:
+        return None
+    datagrams = []
+    for start in range(0, len(updates), MAX_UPDATES_PER_DATAGRAM):
+        chunk = updates[start : start + MAX_UPDATES_PER_DATAGRAM]
+        encoded = bytearray(_DELTA_LAYOUT.size + _POSITION_LAYOUT.size * len(chunk))
+        _DELTA_LAYOUT.pack_into(encoded, 0, DELTA, sequence, len(chunk))
+        offset = _DELTA_LAYOUT.size
+        for update, numeric_id in zip(chunk, numeric_ids[start:]):
+            _POSITION_LAYOUT.pack_into(encoded, offset, numeric_id, update.x, update.y)
+            offset += _POSITION_LAYOUT.size
+        datagrams.append(bytes(encoded))
+    return datagrams
+
+
+def decode_move(datagram: bytes) -> tuple[bytes, int, int, int]:
+    try:
+        _, token, sequence, x, y = _MOVE_LAYOUT.unpack(datagram)
+    except struct.error as e:
+        raise ValueError(f"Invalid move datagram: {e}") from e
+    return token, sequence, x, y
+
+
+def decode_commands(datagram: bytes) -> tuple[bytes, list[MoveCommand]]:
+    try:
+        _, token, count = _COMMANDS_LAYOUT.unpack_from(datagram)
+        commands = [
+            MoveCommand(sequence, dx, dy)
+            for sequence, dx, dy in _COMMAND_LAYOUT.iter_unpack(
+                memoryview(datagram)[_COMMANDS_LAYOUT.size :]
+            )
+        ]
+    except struct.error as e:
+        raise ValueError(f"Invalid commands datagram: {e}") from e
+    if len(commands) != count:
+        raise ValueError("Invalid commands datagram: wrong number of commands")
+    return token, commands
+
+
+def decode_token(datagram: bytes) -> bytes:
+    try:
+        _, token = _TOKEN_LAYOUT.unpack(datagram)
+    except struct.error as e:
+        raise ValueError(f"Invalid datagram: {e}") from e
+    return token
+
+
+def decode_delta(datagram: bytes) -> tuple[int, list[PlayerUpdate]]:
+    try:
+        _, sequence, count = _DELTA_LAYOUT.unpack_from(datagram)
+        positions = _POSITION_LAYOUT.iter_unpack(
+            memoryview(datagram)[_DELTA_LAYOUT.size :]
+        )
+        updates = [PlayerUpdate(str(id), x, y) for id, x, y in positions]
+    except struct.error as e:
+        raise ValueError(f"Invalid delta datagram: {e}") from e
+    if len(updates) != count:
+        raise ValueError("Invalid delta datagram: wrong number of updates")
+    return sequence, updates
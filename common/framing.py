@@ -0,0 +1,222 @@
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+
+# Every message on the wire is prefixed with its payload length
+# as an unsigned 32-bit big-endian integer. The highest bit of the
+# length marks a payload compressed with raw deflate and ZDICT.
+HEADER = struct.Struct(">I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+COMPRESSED_FLAG = 0x80000000
+
+# Preset dictionary shared by both peers, built from the JSON that repeats in
+# snapshots and deltas. The most common fragments are last, as deflate finds
+# them at the shortest distance. Changing it breaks compatibility.
+ZDICT = b"".join(
+    [
+        b'{"type":"error","message":"',
+        b'{"type":"chat_message","player_id":"',
+        b'{"type":"player_snapshot","current_player_id":"',
+        b'"}],"remaining":',
+        b'{"type":"player_snapshot_page","players":[',
+        b'{"type":"player","id":"',
+        b'{"type":"world_delta","updates":[{"id":"',
+        b'","x":400,"y":400},{"id":"',
+        b'"body_type":1},"x":',
+        b'"character":{"head_type":',
+        b',"players":[{"id":"',
+        b'},{"id":"',
+    ]
+)
+
+
+def encode_frame(payload: bytes, compressed: bool = False) -> bytes:
+    """
+    Prefixes the payload with its length so it can be sent over a stream.
+
+    Args:
+        payload (bytes): The encoded message.
+        compressed (bool): Whether the payload is compressed.
+
+    Returns:
+        bytes: The framed message.
+
+    Raises:
+        ValueError: If the payload exceeds the maximum frame size.
+    """
+    if len(payload) > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame too large: {len(payload)} bytes")
+    header = len(payload) | COMPRESSED_FLAG if compressed else len(payload)
+    return HEADER.pack(header) + payload
+
+
+def decompress(payload: bytes, max_size: int = MAX_FRAME_SIZE) -> bytes:
+    """
+    Inflates a payload compressed by FrameCompressor.
+
+    Args:
+        payload (bytes): The compressed payload.
+        max_size (int): The largest decompressed size accepted.
+
+    Returns:
+        bytes: The decompressed payload.
+
+    Raises:
+        ValueError: If the payload is corrupt, truncated or too large.
+    """
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=ZDICT)
+    try:
+        decompressed = decompressor.decompress(payload, max_size)
+    except zlib.error as e:
+        raise ValueError(f"Invalid compressed frame: {e}") from e
+    if decompressor.unconsumed_tail or not decompressor.eof:
+        raise ValueError("Invalid compressed frame: too large or truncated")
+    return decompressed
+
+
+@dataclass
+class CompressionStats:
+    frames: int = 0
+    compressed: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    cpu_time: float = 0.0
+
+    @property
+    def ratio(self) -> float:
+        return self.bytes_out / self.bytes_in if self.bytes_in else 1.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.compressed}/{self.frames} frames compressed, "
+            f"{self.bytes_in} -> {self.bytes_out} bytes ({self.ratio:.2f}), "
+            f"cpu {self.cpu_time * 1000:.1f}ms"
+        )
+
+
+class FrameCompressor:
+    """
+    Compresses payloads of at least threshold bytes with the shared dictionary.
+
+    Every payload is compressed on its own, so one frame can be sent to any
+    number of connections; payloads that would not shrink are sent as they are.
+    """
+
+    threshold: int
+    level: int
+    stats: CompressionStats
+
+    def __init__(self, threshold: int = 256, level: int = 6) -> None:
+        self.threshold = threshold
+        self.level = level
+        self.stats = CompressionStats()
+
+    def encode_frame(self, payload: bytes) -> bytes:
+        """
+        Frames the payload, compressed if that makes it smaller.
+
+        Args:
+            payload (bytes): The encoded message.
+
+        Returns:
+            bytes: The framed message.
+        """
+        self.stats.frames += 1
+        if len(payload) < self.threshold:
+            return encode_frame(payload)
+
+        started = time.process_time()
+        compressor = zlib.compressobj(
+            self.level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=ZDICT
+        )
+        compressed = compressor.compress(payload) + compressor.flush()
+        self.stats.cpu_time += time.process_time() - started
+        self.stats.bytes_in += len(payload)
+        if len(compressed) >= len(payload):
+            self.stats.bytes_out += len(payload)
+            return encode_frame(payload)
+        self.stats.compressed += 1
+        self.stats.bytes_out += len(compressed)
+        return encode_frame(compressed, compressed=True)
+
+    def reset_stats(self) -> None:
+        self.stats = CompressionStats()
+
+
+class FrameDecoder:
+    """
+    Incremental decoder for length-prefixed frames.
+
+    Received chunks are appended to a single reusable buffer and every complete
+    frame is returned in one pass. Partial frames stay in the buffer until the
+    rest of the data arrives; consumed bytes are only compacted once they make
+    up at least half of the buffer, so partial frames are not re-copied per read.
+    Compressed frames are returned decompressed if accept_compressed is set.
+    """
+
+    accept_compressed: bool
+    _buffer: bytearray
+    _offset: int
+    _max_frame_size: int
+
+    def __init__(
+        self, max_frame_size: int = MAX_FRAME_SIZE, accept_compressed: bool = True
+    ) -> None:
+        self.accept_compressed = accept_compressed
+        self._buffer = bytearray()
+        self._offset = 0
+        self._max_frame_size = max_frame_size
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """
+        Appends received data and returns all frames completed by it.
+
+        Args:
+            data (bytes): The received chunk.
+
+        Returns:
+            list[bytes]: Payloads of all complete frames, in order.
+
+        Raises:
+            ValueError: If a frame is larger than allowed, corrupt, or
+                compressed when compression was not agreed to.
+        """
+        buffer = self._buffer
+        buffer += data
+
+        frames = []
+        offset = self._offset
+        end = len(buffer)
+        header_size = HEADER.size
+        while end - offset >= header_size:
+            (header,) = HEADER.unpack_from(buffer, offset)
+            size = header & ~COMPRESSED_FLAG
+            if size > self._max_frame_size:
+                raise ValueError(f"Frame too large: {size} bytes")
+            start = offset + header_size
+            if end - start < size:
+                break
+            frame = bytes(buffer[start : start + size])
+            if header & COMPRESSED_FLAG:
+                if not self.accept_compressed:
+                    raise ValueError("Compressed frame was not agreed to")
+                frame = decompress(frame, self._max_frame_size)
+            frames.append(frame)
+            offset = start + size
+
+        if offset == end:
+            buffer.clear()
+            offset = 0
+        elif offset > end // 2:
+            del buffer[:offset]
+            offset = 0
+        self._offset = offset
+        return frames
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of buffered bytes that do not form a complete frame yet.
+        """
+        return len(self._buffer) - self._offset
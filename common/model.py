@@ -69,15 +69,77 @@ class PlayerUpdate:
     y: int
 
 
-# Sent from server to client during login
+# Sent from server to client during login, holds the nearest players
 @dataclass
 class PlayerSnapshot:
     current_player_id: str
     players: list[Player]
 
 
+# Sent from server to client after the PlayerSnapshot when the nearby players
+# do not fit in one page, remaining is the number of pages still to come
+@dataclass
+class PlayerSnapshotPage:
+    players: list[Player]
+    remaining: int
+
+
 # Sent from client to server when a chat message is sent
 @dataclass
 class ChatMessage:
     player_id: str
     message: str
+
+
+# Sent from server to clients once per tick with the latest position
+# of every player that moved since the previous tick
+@dataclass
+class WorldDelta:
+    updates: list[PlayerUpdate]
+
+
+# Sent from client to server right after connecting with the protocol
+# versions, codecs and features the client supports. udp was added after
+# the first release and is off for clients that do not send it.
+@dataclass
+class Hello:
+    protocol_versions: list[int]
+    codecs: list[str]
+    compression: bool
+    udp: bool = False
+
+
+# Sent from server to client in reply to Hello with the options
+# the server picked for the connection
+@dataclass
+class Welcome:
+    protocol_version: int
+    codec: str
+    compression: bool
+    tick_rate: float
+
+
+# Sent from client to server with the current player's movement since the
+# previous command, sequence numbers increase with every command
+@dataclass
+class MoveCommand:
+    sequence: int
+    dx: int
+    dy: int
+
+
+# Sent from server to client with the authoritative position of the current
+# player after the command with the given sequence number was applied
+@dataclass
+class MoveAck:
+    sequence: int
+    x: int
+    y: int
+
+
+# Sent from server to client after login when movement can be exchanged
+# over UDP, the hex token identifies the client's datagrams
+@dataclass
+class UdpSession:
+    token: str
+    port: int
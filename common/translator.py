@@ -1,197 +1,391 @@
 import json
-from typing import Any
+import re
+import struct
+import typing
+from dataclasses import MISSING, fields, is_dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Iterable
 
+from common import model
 from common.model import (
-    Character,
     ChatMessage,
     ConnectionFailure,
-    Credentials,
-    NewAccount,
-    Player,
+    MoveAck,
+    MoveCommand,
     PlayerDisconnect,
-    PlayerInitialization,
     PlayerSnapshot,
+    PlayerSnapshotPage,
     PlayerUpdate,
+    WorldDelta,
 )
 
 
+class Codec(Enum):
+    """
+    Wire encoding used for messages sent over a connection.
+
+    JSON can encode every message. BINARY uses a fixed layout for the
+    high-frequency messages and falls back to JSON for the rest, so a peer
+    can always decode both.
+    """
+
+    JSON = "json"
+    BINARY = "binary"
+
+
+# Protocol versions this build speaks, newest first
+PROTOCOL_VERSIONS = [1]
+
+# Codecs in order of preference during the handshake, fastest first
+CODEC_PREFERENCE = [Codec.BINARY, Codec.JSON]
+
+
+# Binary messages start with a type byte below any printable character,
+# so they can never be confused with a JSON document starting with "{".
+_PLAYER_UPDATE = 0x01
+_PLAYER_DISCONNECT = 0x02
+_CHAT_MESSAGE = 0x03
+_WORLD_DELTA = 0x04
+_MOVE_COMMAND = 0x05
+_MOVE_ACK = 0x06
+
+_PLAYER_UPDATE_LAYOUT = struct.Struct(">BIii")
+_PLAYER_ID_LAYOUT = struct.Struct(">BI")
+_WORLD_DELTA_LAYOUT = struct.Struct(">BH")
+_POSITION_LAYOUT = struct.Struct(">Iii")
+_MOVE_LAYOUT = struct.Struct(">BIii")
+
+
+@lru_cache(maxsize=4096)
+def _intern_player_id(player_id: str) -> int | None:
+    if not (player_id.isascii() and player_id.isdigit()):
+        return None
+    numeric_id = int(player_id)
+    # Ids like "007" would come back as "7", they are sent as JSON instead
+    if str(numeric_id) != player_id or numeric_id > 0xFFFFFFFF:
+        return None
+    return numeric_id
+
+
+@lru_cache(maxsize=4096)
+def _player_id_from_int(numeric_id: int) -> str:
+    return str(numeric_id)
+
+
+# Message types whose JSON type tag differs from their snake_case class name.
+_TYPE_TAG_OVERRIDES: dict[type, str] = {ConnectionFailure: "error"}
+
+
+def _type_tag(cls: type) -> str:
+    if cls in _TYPE_TAG_OVERRIDES:
+        return _TYPE_TAG_OVERRIDES[cls]
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", cls.__name__).lower()
+
+
+def _message_types() -> list[type]:
+    return [
+        cls
+        for cls in vars(model).values()
+        if isinstance(cls, type)
+        and is_dataclass(cls)
+        and cls.__module__ == model.__name__
+    ]
+
+
+def _compile_json_codec(
+    cls: type, namespace: dict[str, Any]
+) -> tuple[Callable[[Any], dict], Callable[[dict], Any], Callable[[Any], dict]]:
+    """
+    Generates specialised JSON encode/decode functions for a dataclass.
+
+    Nested dataclasses and lists of dataclasses are encoded as plain objects
+    by calling the generated functions of their type, which are compiled first.
+    Fields with a default may be missing from the JSON, so fields can be added
+    to a message without breaking peers that do not send them yet.
+
+    Args:
+        cls (type): The dataclass to generate the functions for.
+        namespace (dict[str, Any]): Shared namespace of generated functions.
+
+    Returns:
+        tuple: The tagged encoder, the decoder and the untagged encoder.
+    """
+    tag = _type_tag(cls)
+    if f"encode_{tag}" in namespace:
+        return (
+            namespace[f"encode_{tag}"],
+            namespace[f"decode_{tag}"],
+            namespace[f"fields_{tag}"],
+        )
+
+    hints = typing.get_type_hints(cls)
+    encoded_fields = []
+    decoded_fields = []
+    for f in fields(cls):
+        hint = hints[f.name]
+        item = typing.get_args(hint)[0] if typing.get_origin(hint) is list else None
+        if is_dataclass(hint):
+            _compile_json_codec(hint, namespace)
+            nested = _type_tag(hint)
+            encoded = f"fields_{nested}(m.{f.name})"
+            decoded = f"decode_{nested}(d[{f.name!r}])"
+        elif item is not None and is_dataclass(item):
+            _compile_json_codec(item, namespace)
+            nested = _type_tag(item)
+            encoded = f"[fields_{nested}(i) for i in m.{f.name}]"
+            decoded = f"[decode_{nested}(i) for i in d[{f.name!r}]]"
+        elif f.default is not MISSING:
+            default = f"default_{tag}_{f.name}"
+            namespace[default] = f.default
+            encoded = f"m.{f.name}"
+            decoded = f"d.get({f.name!r}, {default})"
+        else:
+            encoded = f"m.{f.name}"
+            decoded = f"d[{f.name!r}]"
+        encoded_fields.append(f"{f.name!r}: {encoded}")
+        decoded_fields.append(decoded)
+
+    tagged_fields = [f"'type': {tag!r}"] + encoded_fields
+    namespace[cls.__name__] = cls
+    source = "\n".join(
+        [
+            f"def fields_{tag}(m):",
+            f"    return {{{', '.join(encoded_fields)}}}",
+            f"def encode_{tag}(m):",
+            f"    return {{{', '.join(tagged_fields)}}}",
+            f"def decode_{tag}(d):",
+            f"    return {cls.__name__}({', '.join(decoded_fields)})",
+        ]
+    )
+    exec(source, namespace)
+    return (
+        namespace[f"encode_{tag}"],
+        namespace[f"decode_{tag}"],
+        namespace[f"fields_{tag}"],
+    )
+
+
+def _compile_json_codecs() -> (
+    tuple[dict[type, Callable], dict[str, Callable], dict[type, Callable]]
+):
+    namespace: dict[str, Any] = {}
+    encoders = {}
+    decoders = {}
+    field_encoders = {}
+    for cls in _message_types():
+        encoder, decoder, field_encoder = _compile_json_codec(cls, namespace)
+        encoders[cls] = encoder
+        decoders[_type_tag(cls)] = decoder
+        field_encoders[cls] = field_encoder
+    return encoders, decoders, field_encoders
+
+
+_json_encoders, _json_decoders, _json_field_encoders = _compile_json_codecs()
+_json_encoder = json.JSONEncoder(separators=(",", ":"))
+
+# Surrounding JSON of snapshots and snapshot pages, written the way
+# _json_encoder writes it
+_snapshot_id_field, _snapshot_players_field = (f.name for f in fields(PlayerSnapshot))
+_SNAPSHOT_PREFIX = (
+    f'{{"type":"{_type_tag(PlayerSnapshot)}","{_snapshot_id_field}":'.encode("utf-8")
+)
+_SNAPSHOT_PLAYERS = f',"{_snapshot_players_field}":['.encode("utf-8")
+_page_players_field, _page_remaining_field = (
+    f.name for f in fields(PlayerSnapshotPage)
+)
+_PAGE_PREFIX = (
+    f'{{"type":"{_type_tag(PlayerSnapshotPage)}","{_page_players_field}":['
+).encode("utf-8")
+_PAGE_REMAINING = f'],"{_page_remaining_field}":'.encode("utf-8")
+
+
 class MessageTranslator:
     @staticmethod
     def decode(message: bytes) -> Any:
+        # An empty message falls through to json, which rejects it
+        if message:
+            binary_decoder = MessageTranslator._binary_decoders.get(message[0])
+            if binary_decoder is not None:
+                try:
+                    return binary_decoder(message)
+                except struct.error as e:
+                    raise ValueError(f"Invalid binary message: {e}") from e
         decoded = json.loads(message.decode("utf-8"))
-        decode_map = {
-            "error": MessageTranslator._decode_error,
-            "credentials": MessageTranslator._decode_credentials,
-            "new_account": MessageTranslator._decode_new_account,
-            "player_initialization": MessageTranslator._decode_player_initialization,
-            "player_disconnect": MessageTranslator._decode_player_disconnect,
-            "player": MessageTranslator._decode_player,
-            "player_update": MessageTranslator._decode_player_update,
-            "player_snapshot": MessageTranslator._decode_player_snapshot,
-            "chat_message": MessageTranslator._decode_chat_message,
-        }
-        return decode_map[decoded["type"]](decoded)
-
-    @staticmethod
-    def _decode_error(message: dict) -> ConnectionFailure:
-        return ConnectionFailure(message["message"])
-
-    @staticmethod
-    def _decode_credentials(message: dict) -> Credentials:
-        return Credentials(message["name"], message["password"])
-
-    @staticmethod
-    def _decode_new_account(message: dict) -> NewAccount:
-        character = MessageTranslator._decode_character(message["character"])
-        return NewAccount(
-            message["name"],
-            message["password"],
-            character,
-        )
+        return _json_decoders[decoded["type"]](decoded)
 
     @staticmethod
-    def _decode_player_initialization(message: dict) -> PlayerInitialization:
-        character = MessageTranslator._decode_character(message["character"])
-        return PlayerInitialization(
-            message["id"],
-            character,
+    def _encode_binary_player_update(message: PlayerUpdate) -> bytes | None:
+        numeric_id = _intern_player_id(message.id)
+        if numeric_id is None:
+            return None
+        return _PLAYER_UPDATE_LAYOUT.pack(
+            _PLAYER_UPDATE, numeric_id, message.x, message.y
         )
 
     @staticmethod
-    def _decode_player_disconnect(message: dict) -> PlayerDisconnect:
-        return PlayerDisconnect(message["id"])
+    def _encode_binary_player_disconnect(message: PlayerDisconnect) -> bytes | None:
+        numeric_id = _intern_player_id(message.id)
+        if numeric_id is None:
+            return None
+        return _PLAYER_ID_LAYOUT.pack(_PLAYER_DISCONNECT, numeric_id)
+
+    @staticmethod
+    def _encode_binary_chat_message(message: ChatMessage) -> bytes | None:
+        numeric_id = _intern_player_id(message.player_id)
+        if numeric_id is None:
+            return None
+        header = _PLAYER_ID_LAYOUT.pack(_CHAT_MESSAGE, numeric_id)
+        return header + message.message.encode("utf-8")
 
     @staticmethod
-    def _decode_player(message: dict) -> Player:
-        character = MessageTranslator._decode_character(message["character"])
-        return Player(
-            message["id"],
-            character,
-            message["x"],
-            message["y"],
+    def _encode_binary_world_delta(message: WorldDelta) -> bytes | None:
+        if len(message.updates) > 0xFFFF:
+            return None
+        encoded = bytearray(
+            _WORLD_DELTA_LAYOUT.size + _POSITION_LAYOUT.size * len(message.updates)
         )
+        _WORLD_DELTA_LAYOUT.pack_into(encoded, 0, _WORLD_DELTA, len(message.updates))
+        offset = _WORLD_DELTA_LAYOUT.size
+        for update in message.updates:
+            numeric_id = _intern_player_id(update.id)
+            if numeric_id is None:
+                return None
+            _POSITION_LAYOUT.pack_into(encoded, offset, numeric_id, update.x, update.y)
+            offset += _POSITION_LAYOUT.size
+        return bytes(encoded)
 
     @staticmethod
-    def _decode_player_update(message: dict) -> PlayerUpdate:
-        return PlayerUpdate(
-            message["id"],
-            message["x"],
-            message["y"],
+    def _encode_binary_move_command(message: MoveCommand) -> bytes | None:
+        return _MOVE_LAYOUT.pack(
+            _MOVE_COMMAND, message.sequence, message.dx, message.dy
         )
 
     @staticmethod
-    def _decode_player_snapshot(message: dict) -> PlayerSnapshot:
-        players = []
-        for player in message["players"]:
-            players.append(MessageTranslator._decode_player(player))
-        return PlayerSnapshot(message["current_player_id"], players)
+    def _encode_binary_move_ack(message: MoveAck) -> bytes | None:
+        return _MOVE_LAYOUT.pack(_MOVE_ACK, message.sequence, message.x, message.y)
 
     @staticmethod
-    def _decode_character(message: dict) -> Character:
-        return Character(
-            message["head_type"],
-            message["body_type"],
-        )
+    def _decode_binary_player_update(message: bytes) -> PlayerUpdate:
+        _, numeric_id, x, y = _PLAYER_UPDATE_LAYOUT.unpack(message)
+        return PlayerUpdate(_player_id_from_int(numeric_id), x, y)
+
+    @staticmethod
+    def _decode_binary_player_disconnect(message: bytes) -> PlayerDisconnect:
+        _, numeric_id = _PLAYER_ID_LAYOUT.unpack(message)
+        return PlayerDisconnect(_player_id_from_int(numeric_id))
+
+    @staticmethod
+    def _decode_binary_chat_message(message: bytes) -> ChatMessage:
+        _, numeric_id = _PLAYER_ID_LAYOUT.unpack_from(message)
+        text = message[_PLAYER_ID_LAYOUT.size :].decode("utf-8")
+        return ChatMessage(_player_id_from_int(numeric_id), text)
+
+    @staticmethod
+    def _decode_binary_world_delta(message: bytes) -> WorldDelta:
+        updates = [
+            PlayerUpdate(_player_id_from_int(numeric_id), x, y)
+            for numeric_id, x, y in _POSITION_LAYOUT.iter_unpack(
+                memoryview(message)[_WORLD_DELTA_LAYOUT.size :]
+            )
+        ]
+        return WorldDelta(updates)
+
+    @staticmethod
+    def _decode_binary_move_command(message: bytes) -> MoveCommand:
+        _, sequence, dx, dy = _MOVE_LAYOUT.unpack(message)
+        return MoveCommand(sequence, dx, dy)
 
     @staticmethod
-    def _decode_chat_message(message: dict) -> ChatMessage:
-        return ChatMessage(
-            message["player_id"],
-            message["message"],
+    def _decode_binary_move_ack(message: bytes) -> MoveAck:
+        _, sequence, x, y = _MOVE_LAYOUT.unpack(message)
+        return MoveAck(sequence, x, y)
+
+    _binary_encoders = {
+        PlayerUpdate: _encode_binary_player_update,
+        PlayerDisconnect: _encode_binary_player_disconnect,
+        ChatMessage: _encode_binary_chat_message,
+        WorldDelta: _encode_binary_world_delta,
+        MoveCommand: _encode_binary_move_command,
+        MoveAck: _encode_binary_move_ack,
+    }
+
+    _binary_decoders = {
+        _PLAYER_UPDATE: _decode_binary_player_update,
+        _PLAYER_DISCONNECT: _decode_binary_player_disconnect,
+        _CHAT_MESSAGE: _decode_binary_chat_message,
+        _WORLD_DELTA: _decode_binary_world_delta,
+        _MOVE_COMMAND: _decode_binary_move_command,
+        _MOVE_ACK: _decode_binary_move_ack,
+    }
+
+    @staticmethod
+    def encode(message: Any, codec: Codec = Codec.JSON) -> bytes:
+        if codec == Codec.BINARY:
+            binary_encoder = MessageTranslator._binary_encoders.get(type(message))
+            if binary_encoder is not None:
+                encoded = binary_encoder(message)
+                if encoded is not None:
+                    return encoded
+        encoded_message = _json_encoders[type(message)](message)
+        return _json_encoder.encode(encoded_message).encode("utf-8")
+
+    @staticmethod
+    def encode_fields(message: Any) -> bytes:
+        """
+        Encodes the message as JSON without its type tag, the way it is
+        nested inside other messages.
+
+        Args:
+            message (Any): The message to encode.
+
+        Returns:
+            bytes: The JSON object of the message's fields.
+        """
+        encoded_fields = _json_field_encoders[type(message)](message)
+        return _json_encoder.encode(encoded_fields).encode("utf-8")
+
+    @staticmethod
+    def encode_player_snapshot(player_id: str, players: Iterable[bytes]) -> bytes:
+        """
+        Builds a JSON PlayerSnapshot from players encoded with encode_fields,
+        so unchanged players do not have to be encoded again.
+
+        Args:
+            player_id (str): The ID of the player receiving the snapshot.
+            players (Iterable[bytes]): The encoded players.
+
+        Returns:
+            bytes: The encoded snapshot.
+        """
+        return b"".join(
+            [
+                _SNAPSHOT_PREFIX,
+                _json_encoder.encode(player_id).encode("utf-8"),
+                _SNAPSHOT_PLAYERS,
+                b",".join(players),
+                b"]}",
+            ]
         )
 
     @staticmethod
-    def _encode_character(message: Character) -> dict:
-        return {
-            "head_type": message.head_type,
-            "body_type": message.body_type,
-        }
-
-    @staticmethod
-    def _encode_error(message: ConnectionFailure) -> dict:
-        return {"type": "error", "message": message.message}
-
-    @staticmethod
-    def _encode_credentials(message: Credentials) -> dict:
-        return {
-            "type": "credentials",
-            "name": message.name,
-            "password": message.password,
-        }
-
-    @staticmethod
-    def _encode_new_account(message: NewAccount) -> dict:
-        character = MessageTranslator._encode_character(message.character)
-        return {
-            "type": "new_account",
-            "name": message.name,
-            "password": message.password,
-            "character": character,
-        }
-
-    @staticmethod
-    def _encode_player_initialization(message: PlayerInitialization) -> dict:
-        character = MessageTranslator._encode_character(message.character)
-        return {
-            "type": "player_initialization",
-            "id": message.id,
-            "character": character,
-        }
-
-    @staticmethod
-    def _encode_player_disconnect(message: PlayerDisconnect) -> dict:
-        return {"type": "player_disconnect", "id": message.id}
-
-    @staticmethod
-    def _encode_player(message: Player) -> dict:
-        character = MessageTranslator._encode_character(message.character)
-        return {
-            "type": "player",
-            "id": message.id,
-            "character": character,
-            "x": message.x,
-            "y": message.y,
-        }
-
-    @staticmethod
-    def _encode_player_update(message: PlayerUpdate) -> dict:
-        return {
-            "type": "player_update",
-            "id": message.id,
-            "x": message.x,
-            "y": message.y,
-        }
-
-    @staticmethod
-    def _encode_player_snapshot(message: PlayerSnapshot) -> dict:
-        players = []
-        for player in message.players:
-            players.append(MessageTranslator._encode_player(player))
-        return {
-            "type": "player_snapshot",
-            "current_player_id": message.current_player_id,
-            "players": players,
-        }
-
-    @staticmethod
-    def _encode_chat_message(message: ChatMessage) -> dict:
-        return {
-            "type": "chat_message",
-            "player_id": message.player_id,
-            "message": message.message,
-        }
-
-    @staticmethod
-    def encode(message: Any) -> bytes:
-        encode_map = {
-            ConnectionFailure: MessageTranslator._encode_error,
-            Credentials: MessageTranslator._encode_credentials,
-            NewAccount: MessageTranslator._encode_new_account,
-            Player: MessageTranslator._encode_player,
-            PlayerInitialization: MessageTranslator._encode_player_initialization,
-            PlayerDisconnect: MessageTranslator._encode_player_disconnect,
-            PlayerUpdate: MessageTranslator._encode_player_update,
-            PlayerSnapshot: MessageTranslator._encode_player_snapshot,
-            ChatMessage: MessageTranslator._encode_chat_message,
-        }
-        return json.dumps(encode_map[type(message)](message)).encode("utf-8")
+    def encode_player_snapshot_page(players: Iterable[bytes], remaining: int) -> bytes:
+        """
+        Builds a JSON PlayerSnapshotPage from players encoded with encode_fields.
+
+        Args:
+            players (Iterable[bytes]): The encoded players.
+            remaining (int): The number of pages still to come.
+
+        Returns:
+            bytes: The encoded page.
+        """
+        return b"".join(
+            [
+                _PAGE_PREFIX,
+                b",".join(players),
+                _PAGE_REMAINING,
+                str(remaining).encode("utf-8"),
+                b"}",
+            ]
+        )
@@ -0,0 +1,125 @@
+import hashlib
+import hmac
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from twisted.internet import reactor
+from twisted.internet.defer import Deferred
+
+_SCHEME = "scrypt"
+_SCRYPT_N = 2**14
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+_SALT_SIZE = 16
+_KEY_SIZE = 32
+
+
+# Runs in a worker process, returns the encoded hash
+# and when hashing started and finished
+def hash_password(password: str) -> tuple[str, float, float]:
+    started_at = time.time()
+    salt = os.urandom(_SALT_SIZE)
+    key = _derive_key(password, salt, _SCRYPT_N, _SCRYPT_R, _SCRYPT_P)
+    encoded = "$".join(
+        [_SCHEME, str(_SCRYPT_N), str(_SCRYPT_R), str(_SCRYPT_P), salt.hex(), key.hex()]
+    )
+    return encoded, started_at, time.time()
+
+
+# Runs in a worker process, returns whether the password matches and when
+# verification started and finished. Passwords stored before hashing was
+# introduced are compared as plain text.
+def verify_password(password: str, encoded: str) -> tuple[bool, float, float]:
+    started_at = time.time()
+    parts = encoded.split("$")
+    if len(parts) != 6 or parts[0] != _SCHEME:
+        matches = hmac.compare_digest(password.encode(), encoded.encode())
+        return matches, started_at, time.time()
+    _, n, r, p, salt, key = parts
+    derived = _derive_key(password, bytes.fromhex(salt), int(n), int(r), int(p))
+    return hmac.compare_digest(derived, bytes.fromhex(key)), started_at, time.time()
+
+
+def _derive_key(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p, maxmem=0, dklen=_KEY_SIZE
+    )
+
+
+@dataclass
+class HashingStats:
+    completed: int = 0
+    queue_wait: float = 0.0
+    hashing_time: float = 0.0
+    since: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        elapsed = time.time() - self.since
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        completed = max(self.completed, 1)
+        return (
+            f"{self.completed} hashes, {self.throughput:.1f}/s, "
+            f"avg queue wait {self.queue_wait / completed * 1000:.1f}ms, "
+            f"avg hashing {self.hashing_time / completed * 1000:.1f}ms"
+        )
+
+
+# Derives password keys in a pool of worker processes sized to the cores,
+# so slow hashing never blocks the reactor. Results are delivered as
+# Deferreds on the reactor thread.
+class PasswordHasher:
+    _executor: ProcessPoolExecutor
+    stats: HashingStats
+
+    def __init__(self, workers: int | None = None) -> None:
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self.stats = HashingStats(since=time.time())
+
+    def hash(self, password: str) -> "Deferred[str]":
+        return self._submit(hash_password, password)
+
+    def verify(self, password: str, encoded: str) -> "Deferred[bool]":
+        return self._submit(verify_password, password, encoded)
+
+    def reset_stats(self) -> None:
+        self.stats = HashingStats(since=time.time())
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(
+        self, function: Callable[..., tuple[Any, float, float]], *args
+    ) -> Deferred:
+        d: Deferred = Deferred()
+        submitted_at = time.time()
+        future = self._executor.submit(function, *args)
+        future.add_done_callback(
+            lambda f: reactor.callFromThread(  # type: ignore
+                self._on_done, f, d, submitted_at
+            )
+        )
+        return d
+
+    def _on_done(self, future: Future, d: Deferred, submitted_at: float) -> None:
+        if future.cancelled():
+            d.cancel()
+            return
+        error = future.exception()
+        if error is not None:
+            d.errback(error)
+            return
+        result, started_at, finished_at = future.result()
+        self.stats.completed += 1
+        self.stats.queue_wait += max(started_at - submitted_at, 0.0)
+        self.stats.hashing_time += finished_at - started_at
+        d.callback(result)
@@ -1,34 +1,54 @@
 import os
 import sqlite3
-from typing import Optional, Union
+from dataclasses import dataclass
+from typing import Union
 
-from common.model import (
-    Character,
-    ConnectionFailure,
-    Credentials,
-    NewAccount,
-    PlayerInitialization,
-)
+from twisted.enterprise import adbapi
+from twisted.internet.defer import Deferred, succeed
+from twisted.python.failure import Failure
 
+from common.model import Character, ConnectionFailure, NewAccount, PlayerInitialization
+from server.database.lru_cache import LRUCache
 
+
+# Stored account of a player, the password is kept as an encoded hash.
+# Position is the last saved position, None if the player never moved.
+@dataclass
+class Account:
+    player: PlayerInitialization
+    password_hash: str
+    position: tuple[int, int] | None = None
+
+
+# Queries run on a bounded pool of worker threads, each holding its own SQLite
+# connection, so the reactor thread never waits on the database. Every public
+# method returns a Deferred firing with the result on the reactor thread.
+# Accounts are served from a read-through LRU cache keyed by username.
 class GameDatabase:
     _instance = None
-    _conn: sqlite3.Connection
-    _cursor: sqlite3.Cursor
+    _pool: adbapi.ConnectionPool
+    account_cache: LRUCache[str, Account]
 
-    def __new__(cls, db_file: str):
+    def __new__(cls, db_file: str, pool_size: int = 4, cache_size: int = 4096):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            conn, cursor = cls._instance._initialize_database(db_file)
-            cls._instance._conn = conn
-            cls._instance._cursor = cursor
+            cls._instance.account_cache = LRUCache(cache_size)
+            cls._instance._initialize_database(db_file)
+            cls._instance._pool = adbapi.ConnectionPool(
+                "sqlite3",
+                db_file,
+                timeout=5.0,
+                check_same_thread=False,
+                cp_min=1,
+                cp_max=pool_size,
+                cp_openfun=GameDatabase._configure_connection,
+            )
         return cls._instance
 
     @staticmethod
-    def _initialize_database(file: str) -> tuple[sqlite3.Connection, sqlite3.Cursor]:
+    def _initialize_database(file: str) -> None:
         conn = sqlite3.connect(file)
         cursor = conn.cursor()
-        print(os.path.dirname(__file__))
         sql_file_location = os.path.join(
             os.path.dirname(__file__), "init_game_database.sql"
         )
@@ -38,76 +58,119 @@ class GameDatabase:
 
         cursor.executescript(sql_script)
         conn.commit()
+        cursor.close()
+        conn.close()
         print("Database initialized successfully")
-        return conn, cursor
+
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection) -> None:
+        # WAL lets the readers in the pool run alongside a writer
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
 
     def register_user(
-        self, account_request: NewAccount
-    ) -> Union[PlayerInitialization, ConnectionFailure]:
-        try:
-            self._conn.execute("BEGIN TRANSACTION")
-            character_query = "INSERT INTO characters (head, body) VALUES (?, ?)"
-            character_params = (
-                account_request.character.head_type,
-                account_request.character.body_type,
-            )
-            self._cursor.execute(character_query, character_params)
-            character_id = self._cursor.lastrowid
-
-            player_query = "INSERT INTO players (username, password, character_id) VALUES (?, ?, ?)"
-            player_params = (
-                account_request.name,
-                account_request.password,
-                character_id,
-            )
-            self._cursor.execute(player_query, player_params)
-            self._conn.commit()
+        self, account_request: NewAccount, password_hash: str
+    ) -> "Deferred[Union[PlayerInitialization, ConnectionFailure]]":
+        d = self._pool.runInteraction(
+            self._register_user, account_request, password_hash
+        )
+        d.addCallback(self._invalidate_account, account_request.name)
+        d.addErrback(self._on_register_failed, account_request)
+        return d
 
-            print(
-                f"User {account_request.name} registered successfully with character ID {character_id}"
-            )
+    def _invalidate_account(
+        self, account: PlayerInitialization, name: str
+    ) -> PlayerInitialization:
+        self.account_cache.invalidate(name)
+        return account
 
-            id = self._cursor.lastrowid
-            if id is None:
-                raise sqlite3.IntegrityError(
-                    "Failed to register user, could not get ID"
-                )
+    @staticmethod
+    def _register_user(
+        txn: adbapi.Transaction, account_request: NewAccount, password_hash: str
+    ) -> PlayerInitialization:
+        character_query = "INSERT INTO characters (head, body) VALUES (?, ?)"
+        character_params = (
+            account_request.character.head_type,
+            account_request.character.body_type,
+        )
+        txn.execute(character_query, character_params)
+        character_id = txn.lastrowid
 
-            return PlayerInitialization(
-                str(id),
-                account_request.character,
-            )
-        except sqlite3.IntegrityError as e:
-            self._conn.rollback()
-            error = f"Failed to register user {account_request.name}: {e}"
-            return ConnectionFailure(error)
-
-    def authenticate_user(
-        self, credentials: Credentials
-    ) -> Union[PlayerInitialization, ConnectionFailure]:
-        query = "SELECT id, character_id FROM players WHERE username=? AND password=?"
-        params = (credentials.name, credentials.password)
-        self._cursor.execute(query, params)
-
-        if row := self._cursor.fetchone():
-            character = self._get_character_by_id(row[1])
-            if character is not None:
-                return PlayerInitialization(row[0], character)
+        player_query = (
+            "INSERT INTO players (username, password, character_id) VALUES (?, ?, ?)"
+        )
+        player_params = (
+            account_request.name,
+            password_hash,
+            character_id,
+        )
+        txn.execute(player_query, player_params)
 
-        return ConnectionFailure("Failed to authenticate user")
+        id = txn.lastrowid
+        if id is None:
+            raise sqlite3.IntegrityError("Failed to register user, could not get ID")
 
-    def _get_character_by_id(self, character_id: int) -> Optional[Character]:
-        query = "SELECT head, body FROM characters WHERE id=?"
-        params = (character_id,)
-        self._cursor.execute(query, params)
+        print(
+            f"User {account_request.name} registered successfully "
+            f"with character ID {character_id}"
+        )
+        return PlayerInitialization(str(id), account_request.character)
 
-        if row := self._cursor.fetchone():
-            return Character(row[0], row[1])
+    @staticmethod
+    def _on_register_failed(
+        failure: Failure, account_request: NewAccount
+    ) -> ConnectionFailure:
+        failure.trap(sqlite3.IntegrityError)
+        error = f"Failed to register user {account_request.name}: {failure.value}"
+        return ConnectionFailure(error)
+
+    def find_account(self, name: str) -> "Deferred[Union[Account, ConnectionFailure]]":
+        cached = self.account_cache.get(name)
+        if cached is not None:
+            return succeed(cached)
+        d = self._pool.runInteraction(self._find_account, name)
+        d.addCallback(self._cache_account, name)
+        return d
+
+    def _cache_account(
+        self, account: Union[Account, ConnectionFailure], name: str
+    ) -> Union[Account, ConnectionFailure]:
+        if isinstance(account, Account):
+            self.account_cache.put(name, account)
+        return account
 
-        return None
+    @staticmethod
+    def _find_account(
+        txn: adbapi.Transaction, name: str
+    ) -> Union[Account, ConnectionFailure]:
+        query = (
+            "SELECT players.id, players.password, characters.head, characters.body, "
+            "positions.x, positions.y "
+            "FROM players JOIN characters ON characters.id = players.character_id "
+            "LEFT JOIN positions ON positions.player_id = players.id "
+            "WHERE players.username=?"
+        )
+        params = (name,)
+        txn.execute(query, params)
+
+        if row := txn.fetchone():
+            character = Character(row[2], row[3])
+            position = (row[4], row[5]) if row[4] is not None else None
+            player = PlayerInitialization(str(row[0]), character)
+            return Account(player, row[1], position)
+
+        return ConnectionFailure("Failed to authenticate user")
+
+    # Rows are (player id, x, y), all written in a single transaction
+    def save_positions(self, positions: list[tuple[str, int, int]]) -> "Deferred[None]":
+        return self._pool.runInteraction(self._save_positions, positions)
+
+    @staticmethod
+    def _save_positions(
+        txn: adbapi.Transaction, positions: list[tuple[str, int, int]]
+    ) -> None:
+        query = "INSERT OR REPLACE INTO positions (player_id, x, y) VALUES (?, ?, ?)"
+        txn.executemany(query, positions)
 
     def close_connection(self) -> None:
-        if self._cursor:
-            self._cursor.close()
-        if self._conn:
-            self._conn.close()
+        self._pool.close()
@@ -12,3 +12,10 @@ CREATE TABLE IF NOT EXISTS characters (
     body INTEGER NOT NULL,
     UNIQUE(head, body)
 );
+
+CREATE TABLE IF NOT EXISTS positions (
+    player_id INTEGER PRIMARY KEY,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    FOREIGN KEY (player_id) REFERENCES players(id)
+);
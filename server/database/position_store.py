@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import time
+import typing
+from dataclasses import dataclass
+
+from twisted.internet.defer import Deferred, succeed
+from twisted.python.failure import Failure
+
+if typing.TYPE_CHECKING:
+    from server.database.connector import GameDatabase
+
+Position = tuple[int, int]
+
+
+@dataclass
+class FlushStats:
+    flushes: int = 0
+    positions: int = 0
+    largest_batch: int = 0
+    flush_time: float = 0.0
+
+    def __str__(self) -> str:
+        flushes = max(self.flushes, 1)
+        return (
+            f"{self.flushes} flushes, {self.positions} positions, "
+            f"avg batch {self.positions / flushes:.1f}, "
+            f"largest batch {self.largest_batch}, "
+            f"avg latency {self.flush_time / flushes * 1000:.1f}ms"
+        )
+
+
+# Write-behind store for player positions. Moves only mark the player dirty,
+# the latest position of every dirty player is written in one transaction
+# when flush is called. Only one batch is written at a time so an older batch
+# can never overwrite a newer one; flushes requested meanwhile run after it.
+class PositionStore:
+    db: GameDatabase
+    stats: FlushStats
+    _dirty: dict[str, Position]
+    _in_flight: dict[str, Position]
+    _waiters: list[Deferred[None]]
+
+    def __init__(self, db: GameDatabase) -> None:
+        self.db = db
+        self.stats = FlushStats()
+        self._dirty = {}
+        self._in_flight = {}
+        self._waiters = []
+
+    def mark(self, player_id: str, x: int, y: int) -> None:
+        self._dirty[player_id] = (x, y)
+
+    # Position that is not yet in the database, if any
+    def position_of(self, player_id: str) -> Position | None:
+        return self._dirty.get(player_id) or self._in_flight.get(player_id)
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    # Fires once every position marked before the call has been written, or
+    # fails with the error of the write that did not make it. Positions of a
+    # failed write stay dirty and are retried by the next flush.
+    def flush(self) -> Deferred[None]:
+        if self._in_flight:
+            waiter: Deferred[None] = Deferred()
+            self._waiters.append(waiter)
+            return waiter
+        if not self._dirty:
+            return succeed(None)
+
+        batch, self._dirty = self._dirty, {}
+        self._in_flight = batch
+        d = self.db.save_positions(
+            [(player_id, x, y) for player_id, (x, y) in batch.items()]
+        )
+        d.addBoth(self._on_flushed, batch, time.perf_counter())
+        return d
+
+    def reset_stats(self) -> None:
+        self.stats = FlushStats()
+
+    def _on_flushed(
+        self, result: None | Failure, batch: dict[str, Position], started: float
+    ) -> None | Failure:
+        self._in_flight = {}
+        if isinstance(result, Failure):
+            print(f"Failed to save {len(batch)} positions: {result.getErrorMessage()}")
+            for player_id, position in batch.items():
+                self._dirty.setdefault(player_id, position)
+        else:
+            self.stats.flushes += 1
+            self.stats.positions += len(batch)
+            self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+            self.stats.flush_time += time.perf_counter() - started
+
+        waiters, self._waiters = self._waiters, []
+        if waiters:
+            self.flush().addBoth(self._notify, waiters)
+        return result
+
+    @staticmethod
+    def _notify(result: None | Failure, waiters: list[Deferred[None]]) -> None:
+        for waiter in waiters:
+            if isinstance(result, Failure):
+                waiter.errback(result)
+            else:
+                waiter.callback(None)
@@ -6,6 +6,7 @@ from common.translator import MessageTranslator
 from server.handler.handler import BaseHandler
 from server.handler.handlers.connected_handler import ConnectedHandler
 from server.handler.handlers.disconnected_handler import DisconnectedHandler
+from server.handler.handlers.handshake_handler import HandshakeHandler
 from server.protocol.connection_states import ConnectionState
 
 if typing.TYPE_CHECKING:
@@ -19,6 +20,7 @@ class MessageDispatcher:
     def __init__(self, connection) -> None:
         self.connection = connection
         self.handlers = {
+            ConnectionState.HANDSHAKE: HandshakeHandler(self.connection),
             ConnectionState.DISCONNECTED: DisconnectedHandler(self.connection),
             ConnectionState.CONNECTED: ConnectedHandler(self.connection),
         }
@@ -3,17 +3,22 @@ from __future__ import annotations
 import typing
 from typing import Any, Callable
 
+from twisted.internet import reactor
+
 from common.model import (
     ChatMessage,
     ConnectionFailure,
     Credentials,
+    Hello,
+    MoveCommand,
     NewAccount,
+    Player,
     PlayerDisconnect,
-    PlayerSnapshot,
     PlayerUpdate,
 )
-from common.translator import MessageTranslator
 from server.database.connector import GameDatabase
+from server.protocol.connection_states import ConnectionState
+from server.world.spatial_grid import Cell
 
 if typing.TYPE_CHECKING:
     from server.protocol.pudink_connection import PudinkConnection
@@ -31,9 +36,11 @@ class BaseHandler:
         self.db = self.connection.db
         self.factory = self.connection.factory
         self.message_handlers = {
+            Hello: self.handle_hello,
             NewAccount: self.handle_new_account,
             Credentials: self.handle_credentials,
             PlayerUpdate: self.handle_player_update,
+            MoveCommand: self.handle_move_command,
             ChatMessage: self.handle_chat_message,
             PlayerDisconnect: self.handle_player_disconnect,
         }
@@ -44,6 +51,9 @@ class BaseHandler:
         action = self.message_handlers[type(message)]
         action(message)
 
+    def handle_hello(self, message: Hello) -> None:
+        raise NotImplementedError()
+
     def handle_new_account(self, message: NewAccount) -> None:
         raise NotImplementedError()
 
@@ -53,6 +63,9 @@ class BaseHandler:
     def handle_player_update(self, message: PlayerUpdate) -> None:
         raise NotImplementedError()
 
+    def handle_move_command(self, message: MoveCommand) -> None:
+        raise NotImplementedError()
+
     def handle_chat_message(self, message: ChatMessage) -> None:
         raise NotImplementedError()
 
@@ -60,26 +73,85 @@ class BaseHandler:
         self.broadcast_message(message)
 
     def _send_error(self, error_message: ConnectionFailure) -> None:
-        error = MessageTranslator.encode(error_message)
-        self.connection.transport.write(error)
+        self.connection.send_message(error_message)
 
+    # The nearest players are sent in the PlayerSnapshot, the rest follow in
+    # PlayerSnapshotPages sent one per reactor turn, nearest first, so a large
+    # login does not hold up other connections and the client can show its
+    # surroundings before the whole snapshot arrived.
     def _send_player_snapshot(self) -> None:
-        if not self.connection.player:
+        player = self.connection.player
+        if not player:
             self._send_error(ConnectionFailure("Player not initialized"))
             return
 
-        players = list(self.factory.players.values())
-        player_snapshot = PlayerSnapshot(self.connection.player.id, players)
-        player_snapshot = MessageTranslator.encode(player_snapshot)
-
-        self.connection.transport.write(player_snapshot)
+        nearby = sorted(
+            (c for c in self._nearby_connections(include_self=True) if c.player),
+            key=lambda c: _distance_squared(player, c.player),
+        )
+        page_size = self.factory.snapshot_page_size
+        pages = [nearby[i : i + page_size] for i in range(0, len(nearby), page_size)]
+        first_page = [c.player for c in pages[0]] if pages else []
+        snapshot = self.factory.snapshots.encode(player.id, first_page)
+        self.connection.send_frame(self.connection.frame_payload(snapshot))
+        self._send_snapshot_page(pages, 1)
+
+    def _send_snapshot_page(
+        self, pages: list[list[PudinkConnection]], index: int
+    ) -> None:
+        # connectionLost clears connected, so paging stops once the client left
+        if index >= len(pages) or not self.connection.connected:
+            return
+        # Players who left or moved out of range meanwhile were already
+        # announced as gone, the ones who came into range were announced
+        nearby = self._nearby_connections(include_self=True)
+        players = [
+            c.player
+            for c in pages[index]
+            if c in nearby and c.state == ConnectionState.CONNECTED and c.player
+        ]
+        page = self.factory.snapshots.encode_page(players, len(pages) - index - 1)
+        self.connection.send_frame(self.connection.frame_payload(page))
+        reactor.callLater(0, self._send_snapshot_page, pages, index + 1)  # type: ignore
 
     def broadcast_new_player(self) -> None:
         self.broadcast_message(self.connection.player)
 
     def broadcast_message(self, message: Any) -> None:
-        if not isinstance(message, bytes):
-            message = MessageTranslator.encode(message)
-        for c in self.factory.clients:
-            if c != self.connection:
-                c.transport.write(message)
+        self.factory.send_to(self._nearby_connections(), message)
+
+    def _nearby_connections(self, include_self: bool = False) -> set[PudinkConnection]:
+        cell = self.factory.grid.get_cell(self.connection)
+        if cell is None:
+            return set()
+        nearby = self.factory.grid.items_around(cell)
+        if not include_self:
+            nearby.discard(self.connection)
+        return nearby
+
+    # Exchanges join and leave messages with the players that came into
+    # or went out of range after the player moved to another grid cell.
+    def _update_interest(self, old_cell: Cell | None, new_cell: Cell) -> None:
+        player = self.connection.player
+        if player is None or old_cell == new_cell:
+            return
+        grid = self.factory.grid
+        before = grid.items_around(old_cell) if old_cell is not None else set()
+        after = grid.items_around(new_cell)
+        entered = after - before - {self.connection}
+        left = before - after - {self.connection}
+
+        self.factory.send_to(entered, player)
+        for other in entered:
+            if other.player:
+                self.connection.send_message(other.player)
+        self.factory.send_to(left, PlayerDisconnect(player.id))
+        for other in left:
+            if other.player:
+                self.connection.send_message(PlayerDisconnect(other.player.id))
+
+
+def _distance_squared(player: Player, other: Player | None) -> int:
+    if other is None:
+        return 0
+    return (player.x - other.x) ** 2 + (player.y - other.y) ** 2
@@ -1,4 +1,6 @@
-from common.model import ChatMessage, PlayerUpdate
+from twisted.internet import reactor
+
+from common.model import ChatMessage, MoveAck, MoveCommand, PlayerUpdate
 from server.handler.handler import BaseHandler
 
 
@@ -9,10 +11,41 @@ class ConnectedHandler(BaseHandler):
     def handle_chat_message(self, message: ChatMessage) -> None:
         self.broadcast_message(message)
 
+    # Positions from clients that do not send move commands, held to the
+    # same speed limit but never corrected on the client
     def handle_player_update(self, message: PlayerUpdate) -> None:
-        if self.connection.player is None:
+        player = self.connection.player
+        if player is None:
             print("Player not initialized")
             return
-        self.connection.player.x = message.x
-        self.connection.player.y = message.y
-        self.broadcast_message(message)
+        self._move_by(message.x - player.x, message.y - player.y)
+
+    # Applies the movement within the speed limit and acks the resulting
+    # position, so the client can correct its prediction. Commands are resent
+    # over UDP until acknowledged, the ones already applied are skipped.
+    def handle_move_command(self, message: MoveCommand) -> None:
+        player = self.connection.player
+        if player is None:
+            print("Player not initialized")
+            return
+        if message.sequence <= self.connection.move_sequence:
+            return
+        self.connection.move_sequence = message.sequence
+        self._move_by(message.dx, message.dy)
+        self.connection.send_message(MoveAck(message.sequence, player.x, player.y))
+
+    def _move_by(self, dx: int, dy: int) -> None:
+        player = self.connection.player
+        speed_limit = self.connection.speed_limit
+        if player is None or speed_limit is None:
+            return
+        dx, dy = speed_limit.clamp(dx, dy, reactor.seconds())  # type: ignore
+        if (dx, dy) == (0, 0):
+            return
+        player.x += dx
+        player.y += dy
+        old_cell, new_cell = self.factory.grid.move(self.connection, player.x, player.y)
+        self._update_interest(old_cell, new_cell)
+        self.factory.snapshots.invalidate(player.id)
+        self.factory.positions.mark(player.id, player.x, player.y)
+        self.factory.movement.add(PlayerUpdate(player.id, player.x, player.y), new_cell)
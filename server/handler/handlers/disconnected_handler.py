@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import typing
+from typing import Union
+
+from twisted.internet.defer import Deferred
+from twisted.python.failure import Failure
 
 from common.model import (
     ConnectionFailure,
@@ -9,6 +13,7 @@ from common.model import (
     Player,
     PlayerInitialization,
 )
+from server.database.connector import Account
 from server.handler.handler import BaseHandler
 from server.protocol.connection_states import ConnectionState
 
@@ -28,9 +33,18 @@ class DisconnectedHandler(BaseHandler):
                 )
             )
             return
-        account = self.db.register_user(message)
+        d = self.factory.hasher.hash(message.password)
+        d.addCallback(
+            lambda password_hash: self.db.register_user(message, password_hash)
+        )
+        d.addCallback(self._on_account_registered)
+        d.addErrback(self._on_database_error)
+
+    def _on_account_registered(
+        self, account: Union[PlayerInitialization, ConnectionFailure]
+    ) -> None:
         if isinstance(account, PlayerInitialization):
-            self.handle_credentials(Credentials(message.name, message.password))
+            self._on_authenticated(account)
         elif isinstance(account, ConnectionFailure):
             self._send_error(account)
         else:
@@ -39,39 +53,71 @@ class DisconnectedHandler(BaseHandler):
             )
 
     def handle_credentials(self, message: Credentials) -> None:
-        print("Authenticating player with credentials: ", message)
+        print(f"Authenticating player {message.name}")
+
+        d = self.db.find_account(message.name)
+        d.addCallback(self._verify_password, message.password)
+        d.addCallback(self._on_account_verified)
+        d.addErrback(self._on_database_error)
+
+    def _verify_password(
+        self, account: Union[Account, ConnectionFailure], password: str
+    ) -> Union[Account, ConnectionFailure, Deferred]:
+        if isinstance(account, ConnectionFailure):
+            return account
+        d = self.factory.hasher.verify(password, account.password_hash)
+        d.addCallback(
+            lambda matches: (
+                account if matches else ConnectionFailure("Failed to authenticate user")
+            )
+        )
+        return d
 
-        player = self.db.authenticate_user(message)
+    def _on_account_verified(self, account: Union[Account, ConnectionFailure]) -> None:
+        if isinstance(account, ConnectionFailure):
+            self._on_authenticated(account)
+            return
+        # Positions not yet written to the database are newer than the account
+        position = self.factory.positions.position_of(account.player.id)
+        self._on_authenticated(account.player, position or account.position, account)
+
+    # Returns whether the player was logged in. The account is only bound to
+    # the connection when it was, so a second concurrent login on the same
+    # connection cannot attach its account to the first player.
+    def _on_authenticated(
+        self,
+        player: Union[PlayerInitialization, ConnectionFailure],
+        position: tuple[int, int] | None = None,
+        account: Account | None = None,
+    ) -> bool:
+        # The client may have left or logged in while the query was running
+        if (
+            not self.connection.connected
+            or self.connection.state != ConnectionState.DISCONNECTED
+        ):
+            return False
 
         if isinstance(player, ConnectionFailure):
             self._send_error(player)
-            return
+            return False
 
-        if self._is_player_connected(player):
+        if self.factory.connections.is_player_connected(player.id):
             self._send_error(ConnectionFailure("Player already connected!"))
-            return
-
-        if self._is_player_instance_missing(player):
-            print(f"Creating new player {player.id}")
-            self.connection.player = Player(player.id, player.character, 400, 400)
-            self.factory.players[self.connection.player.id] = self.connection.player
+            return False
 
+        x, y = position or (400, 400)
+        self.connection.player = Player(player.id, player.character, x, y)
+        if not self.factory.player_online(self.connection):
+            self.connection.player = None
+            return False
+        self.connection.account = account
         print(f"Player with id {player.id} initialized")
 
         self._send_player_snapshot()
         self.broadcast_new_player()
-        self.connection.state = ConnectionState.CONNECTED
-
-    def _is_player_connected(self, player) -> bool:
-        connected_players = [
-            client.player.id
-            for client in self.connection.factory.clients
-            if client.state == ConnectionState.CONNECTED and client.player
-        ]
-        return player.id in connected_players
-
-    def _is_player_instance_missing(self, player) -> bool:
-        return (
-            player.id not in self.connection.factory.players
-            or self.connection.player is None
-        )
+        return True
+
+    def _on_database_error(self, failure: Failure) -> None:
+        print(f"Authentication error: {failure.getErrorMessage()}")
+        if self.connection.connected:
+            self._send_error(ConnectionFailure("Internal server error"))
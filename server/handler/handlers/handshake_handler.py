@@ -0,0 +1,57 @@
+from common.model import ConnectionFailure, Credentials, Hello, NewAccount, Welcome
+from common.translator import CODEC_PREFERENCE, PROTOCOL_VERSIONS, Codec
+from server.handler.handler import BaseHandler
+from server.protocol.connection_states import ConnectionState
+
+
+class HandshakeHandler(BaseHandler):
+    def __init__(self, connection):
+        super().__init__(connection)
+
+    # Picks the newest common protocol version and the fastest options
+    # both sides support, then waits for the client to log in
+    def handle_hello(self, message: Hello) -> None:
+        versions = [v for v in PROTOCOL_VERSIONS if v in message.protocol_versions]
+        if not versions:
+            self._send_error(
+                ConnectionFailure(
+                    f"Unsupported protocol versions: {message.protocol_versions}"
+                )
+            )
+            self.connection.transport.loseConnection()
+            return
+
+        codec = next(
+            (c for c in CODEC_PREFERENCE if c.value in message.codecs), Codec.JSON
+        )
+        compression = message.compression and self.factory.compressor is not None
+        self.connection.send_message(
+            Welcome(versions[0], codec.value, compression, self.factory.tick_rate)
+        )
+
+        self.connection.codec = codec
+        self.connection.compressor = self.factory.compressor if compression else None
+        self.connection.decoder.accept_compressed = compression
+        self.connection.supports_udp = (
+            message.udp and self.factory.datagrams is not None
+        )
+        self.factory.connections.set_state(
+            self.connection, ConnectionState.DISCONNECTED
+        )
+
+    # Framed clients from before the handshake log in straight away, they
+    # keep the server's default codec and get no compression. Clients from
+    # before framing are not supported, the connection drops them.
+    def handle_new_account(self, message: NewAccount) -> None:
+        self._accept_legacy_client()
+        self.connection.message_dispatcher.dispatch_message(message)
+
+    def handle_credentials(self, message: Credentials) -> None:
+        self._accept_legacy_client()
+        self.connection.message_dispatcher.dispatch_message(message)
+
+    def _accept_legacy_client(self) -> None:
+        print("Client skipped the handshake, using default options")
+        self.factory.connections.set_state(
+            self.connection, ConnectionState.DISCONNECTED
+        )
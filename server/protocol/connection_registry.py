@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import typing
+from typing import Iterator
+
+from server.protocol.connection_states import ConnectionState
+
+if typing.TYPE_CHECKING:
+    from server.protocol.pudink_connection import PudinkConnection
+
+
+# Open connections indexed by state and by the id of the logged in player.
+# State changes must go through set_state so the indexes stay in sync,
+# every lookup and update is O(1).
+class ConnectionRegistry:
+
+    _by_state: dict[ConnectionState, dict[PudinkConnection, None]]
+    _by_player: dict[str, PudinkConnection]
+
+    def __init__(self) -> None:
+        self._by_state = {state: {} for state in ConnectionState}
+        self._by_player = {}
+
+    def add(self, connection: PudinkConnection) -> None:
+        self._by_state[connection.state][connection] = None
+
+    def remove(self, connection: PudinkConnection) -> None:
+        self._by_state[connection.state].pop(connection, None)
+        self._release_player(connection)
+
+    def set_state(self, connection: PudinkConnection, state: ConnectionState) -> None:
+        if connection not in self._by_state[connection.state]:
+            raise ValueError("Connection is not registered")
+        if state == ConnectionState.CONNECTED:
+            if connection.player is None:
+                raise ValueError("Connected state requires a player")
+            self._by_player[connection.player.id] = connection
+        else:
+            self._release_player(connection)
+        del self._by_state[connection.state][connection]
+        self._by_state[state][connection] = None
+        connection.state = state
+
+    def by_player(self, player_id: str) -> PudinkConnection | None:
+        return self._by_player.get(player_id)
+
+    def is_player_connected(self, player_id: str) -> bool:
+        return player_id in self._by_player
+
+    def __contains__(self, connection: PudinkConnection) -> bool:
+        return connection in self._by_state[connection.state]
+
+    def __iter__(self) -> Iterator[PudinkConnection]:
+        for connections in self._by_state.values():
+            yield from connections
+
+    def __len__(self) -> int:
+        return sum(len(connections) for connections in self._by_state.values())
+
+    def _release_player(self, connection: PudinkConnection) -> None:
+        if connection.player is None:
+            return
+        if self._by_player.get(connection.player.id) is connection:
+            del self._by_player[connection.player.id]
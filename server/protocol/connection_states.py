@@ -4,3 +4,4 @@ from enum import Enum
 class ConnectionState(Enum):
     DISCONNECTED = 0
     CONNECTED = 1
+    HANDSHAKE = 2
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import typing
+from dataclasses import dataclass
+
+from twisted.internet.protocol import DatagramProtocol
+
+from common import datagram
+from common.model import MoveCommand, PlayerUpdate, UdpSession, WorldDelta
+from server.protocol.connection_states import ConnectionState
+
+if typing.TYPE_CHECKING:
+    from server.protocol.pudink_connection import PudinkConnection
+
+Address = tuple[str, int]
+
+
+# UDP state of a logged in connection. The address is learned from the first
+# valid datagram and follows the client if its address changes.
+@dataclass
+class DatagramSession:
+    token: bytes
+    address: Address | None = None
+    last_sequence: int = -1
+
+
+@dataclass
+class DatagramStats:
+    received: int = 0
+    stale: int = 0
+    invalid: int = 0
+    sent: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.received} received, {self.stale} stale dropped, "
+            f"{self.invalid} invalid, {self.sent} sent"
+        )
+
+
+# Carries movement over UDP for clients that asked for it during the
+# handshake, so a lost packet does not hold up newer positions behind it as
+# it does on TCP. Everything else stays on the TCP connection, and movement
+# goes over TCP until the client's first datagram arrives.
+class MovementChannel(DatagramProtocol):
+
+    stats: DatagramStats
+    _sessions: dict[bytes, PudinkConnection]
+    _sequence: int
+
+    def __init__(self) -> None:
+        self.stats = DatagramStats()
+        self._sessions = {}
+        self._sequence = 0
+
+    @property
+    def port(self) -> int:
+        return self.transport.getHost().port  # type: ignore
+
+    def open_session(self, connection: PudinkConnection) -> None:
+        token = os.urandom(datagram.TOKEN_SIZE)
+        connection.datagram_session = DatagramSession(token)
+        self._sessions[token] = connection
+        connection.send_message(UdpSession(token.hex(), self.port))
+
+    def close_session(self, connection: PudinkConnection) -> None:
+        if connection.datagram_session is not None:
+            self._sessions.pop(connection.datagram_session.token, None)
+            connection.datagram_session = None
+
+    # Sends the same datagrams to every address, all sharing one sequence
+    # number so clients can drop positions older than ones already applied
+    def send_delta(self, addresses: list[Address], delta: WorldDelta) -> bool:
+        datagrams = datagram.encode_deltas(self._sequence, delta.updates)
+        if datagrams is None:
+            return False
+        self._sequence += 1
+        for address in addresses:
+            for encoded in datagrams:
+                self.transport.write(encoded, address)  # type: ignore
+        self.stats.sent += len(addresses) * len(datagrams)
+        return True
+
+    def datagramReceived(self, data: bytes, address: Address) -> None:
+        self.stats.received += 1
+        try:
+            if data[:1] == bytes([datagram.MOVE]):
+                self._on_move(*datagram.decode_move(data), address)
+            elif data[:1] == bytes([datagram.COMMANDS]):
+                self._on_commands(*datagram.decode_commands(data), address)
+            elif data[:1] == bytes([datagram.PING]):
+                self._on_ping(datagram.decode_token(data), address)
+            else:
+                self.stats.invalid += 1
+        except ValueError:
+            self.stats.invalid += 1
+
+    def _on_ping(self, token: bytes, address: Address) -> None:
+        connection = self._sessions.get(token)
+        if connection is None or connection.datagram_session is None:
+            self.stats.invalid += 1
+            return
+        connection.datagram_session.address = address
+        self.transport.write(datagram.encode_pong(token), address)  # type: ignore
+
+    def _on_move(
+        self, token: bytes, sequence: int, x: int, y: int, address: Address
+    ) -> None:
+        connection = self._sessions.get(token)
+        if connection is None or connection.datagram_session is None:
+            self.stats.invalid += 1
+            return
+        session = connection.datagram_session
+        if sequence <= session.last_sequence:
+            self.stats.stale += 1
+            return
+        session.last_sequence = sequence
+        session.address = address
+        if connection.state == ConnectionState.CONNECTED and connection.player:
+            update = PlayerUpdate(connection.player.id, x, y)
+            connection.message_dispatcher.dispatch_message(update)
+
+    # Commands are resent until acknowledged, the handler skips the ones it
+    # already applied, including the ones sent over TCP before the session
+    # was ready
+    def _on_commands(
+        self, token: bytes, commands: list[MoveCommand], address: Address
+    ) -> None:
+        connection = self._sessions.get(token)
+        if connection is None or connection.datagram_session is None:
+            self.stats.invalid += 1
+            return
+        connection.datagram_session.address = address
+        if connection.state == ConnectionState.CONNECTED and connection.player:
+            for command in commands:
+                connection.message_dispatcher.dispatch_message(command)
+
+    def reset_stats(self) -> None:
+        self.stats = DatagramStats()
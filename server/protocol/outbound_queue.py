@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import typing
+from collections import deque
+
+from twisted.internet.interfaces import IPushProducer
+from zope.interface import implementer
+
+from common.model import PlayerUpdate, WorldDelta
+from common.translator import MessageTranslator
+
+if typing.TYPE_CHECKING:
+    from server.protocol.pudink_connection import PudinkConnection
+
+
+# Per-connection outbound queue registered as a streaming producer on the
+# transport. Frames are written straight through until the transport reports
+# congestion, then they are held back and flushed in the order they were
+# queued once the transport drains. Movement queued between two reliable
+# frames (chat, joins, leaves, snapshots) forms one batch; a player that moves
+# again only keeps its newest position, taken out of the earlier batch, so a
+# position never reaches the client ahead of a join or leave queued before it.
+@implementer(IPushProducer)
+class OutboundQueue:
+    _connection: PudinkConnection
+    _queue: deque[bytes | dict[str, PlayerUpdate]]
+    _reliable: int
+    _movement: dict[str, dict[str, PlayerUpdate]]
+    max_reliable_frames: int
+    paused: bool
+    dropped: int
+
+    def __init__(
+        self, connection: PudinkConnection, max_reliable_frames: int = 10_000
+    ) -> None:
+        self._connection = connection
+        self._queue = deque()
+        self._reliable = 0
+        self._movement = {}
+        self.max_reliable_frames = max_reliable_frames
+        self.paused = False
+        self.dropped = 0
+
+    @property
+    def depth(self) -> int:
+        return self._reliable + len(self._movement)
+
+    def send_frame(self, frame: bytes) -> None:
+        if not self.paused:
+            self._connection.transport.write(frame)
+            return
+        if self._reliable >= self.max_reliable_frames:
+            print(f"Outbound queue full ({self._reliable}), dropping client")
+            self.stopProducing()
+            self._connection.transport.abortConnection()  # type: ignore
+            return
+        self._queue.append(frame)
+        self._reliable += 1
+
+    def send_movement(self, updates: list[PlayerUpdate], frame: bytes) -> None:
+        if not self.paused:
+            self._connection.transport.write(frame)
+            return
+        if self._queue and isinstance(self._queue[-1], dict):
+            batch = self._queue[-1]
+        else:
+            batch = {}
+            self._queue.append(batch)
+        for update in updates:
+            queued_in = self._movement.get(update.id)
+            if queued_in is not None:
+                del queued_in[update.id]
+                self.dropped += 1
+            batch[update.id] = update
+            self._movement[update.id] = batch
+
+    def pauseProducing(self) -> None:
+        self.paused = True
+
+    def resumeProducing(self) -> None:
+        self.paused = False
+        self._flush()
+
+    def stopProducing(self) -> None:
+        self._queue.clear()
+        self._reliable = 0
+        self._movement.clear()
+
+    def _flush(self) -> None:
+        transport = self._connection.transport
+        while self._queue and not self.paused:
+            item = self._queue.popleft()
+            if isinstance(item, bytes):
+                self._reliable -= 1
+                transport.write(item)
+                continue
+            for player_id in item:
+                del self._movement[player_id]
+            if item:
+                encoded = MessageTranslator.encode(
+                    WorldDelta(list(item.values())), self._connection.codec
+                )
+                transport.write(self._connection.frame_payload(encoded))
@@ -1,47 +1,111 @@
 from __future__ import annotations
 
 import typing
+from typing import Any
 
 from twisted.internet import protocol
 from twisted.internet.interfaces import ITransport
 from twisted.python.failure import Failure
 
-from common.model import Player, PlayerDisconnect
-from server.database.connector import GameDatabase
+from common.framing import FrameCompressor, FrameDecoder, encode_frame
+from common.model import Player, PlayerDisconnect, PlayerUpdate
+from common.translator import Codec, MessageTranslator
+from server.database.connector import Account, GameDatabase
 from server.handler.dispatcher import MessageDispatcher
 from server.protocol.connection_states import ConnectionState
+from server.protocol.movement_channel import DatagramSession
+from server.protocol.outbound_queue import OutboundQueue
+from server.world.speed_limit import SpeedLimit
 
 if typing.TYPE_CHECKING:
     from server.protocol.pudink_server import PudinkServer
 
+# Clients only send logins, chat and movement, so their frames are kept far
+# smaller than the snapshots the server sends
+MAX_CLIENT_FRAME_SIZE = 64 * 1024
+
 
 class PudinkConnection(protocol.Protocol):
     factory: PudinkServer
     db: GameDatabase
     player: Player | None
+    account: Account | None
     message_dispatcher: MessageDispatcher
     state: ConnectionState
     transport: ITransport
+    decoder: FrameDecoder
+    codec: Codec
+    compressor: FrameCompressor | None
+    supports_udp: bool
+    datagram_session: DatagramSession | None
+    speed_limit: SpeedLimit | None
+    move_sequence: int
+    outbound: OutboundQueue
 
     def __init__(self, db: GameDatabase, factory: PudinkServer) -> None:
         self.factory = factory
         self.db = db
         self.player = None
+        self.account = None
         self.message_dispatcher = MessageDispatcher(self)
-        self.state = ConnectionState.DISCONNECTED
+        self.state = ConnectionState.HANDSHAKE
+        self.decoder = FrameDecoder(MAX_CLIENT_FRAME_SIZE, accept_compressed=False)
+        self.codec = factory.codec
+        self.compressor = None
+        self.supports_udp = False
+        self.datagram_session = None
+        self.speed_limit = None
+        self.move_sequence = -1
+        self.outbound = OutboundQueue(self)
 
     def connectionMade(self) -> None:
         print("A client connected!")
-        self.factory.clients.append(self)
+        self.factory.connections.add(self)
+        self.transport.registerProducer(self.outbound, True)  # type: ignore
 
     def connectionLost(self, reason: Failure) -> None:
-        print("Lost a client!")
-        self.factory.clients.remove(self)
-
-        if self.state.CONNECTED and self.player:
+        # Twisted leaves connected set, callbacks still running for this
+        # connection check it to know the client is gone
+        self.connected = False
+        print(
+            f"Lost a client! Outbound depth {self.outbound.depth}, "
+            f"dropped {self.outbound.dropped} stale movement updates"
+        )
+        if self.state == ConnectionState.CONNECTED and self.player:
             self.message_dispatcher.dispatch_message(PlayerDisconnect(self.player.id))
+            self.factory.player_offline(self)
 
-        self.state = ConnectionState.DISCONNECTED
+        self.factory.connections.remove(self)
 
     def dataReceived(self, data: bytes) -> None:
-        self.message_dispatcher.dispatch_message(data)
+        # Clients from before framing send bare JSON, which would otherwise
+        # be read as a huge frame length
+        if self.decoder.pending == 0 and data[:1] == b"{":
+            print("Dropping client, unframed messages are not supported")
+            self.transport.loseConnection()
+            return
+        try:
+            frames = self.decoder.feed(data)
+        except ValueError as e:
+            print(f"Dropping client, invalid frame: {e}")
+            self.transport.loseConnection()
+            return
+        for frame in frames:
+            self.message_dispatcher.dispatch_message(frame)
+
+    def send_message(self, message: Any) -> None:
+        self.send_frame(
+            self.frame_payload(MessageTranslator.encode(message, self.codec))
+        )
+
+    # Frames an encoded message, compressed if the connection agreed to it
+    def frame_payload(self, payload: bytes) -> bytes:
+        if self.compressor is None:
+            return encode_frame(payload)
+        return self.compressor.encode_frame(payload)
+
+    def send_frame(self, frame: bytes) -> None:
+        self.outbound.send_frame(frame)
+
+    def send_movement(self, updates: list[PlayerUpdate], frame: bytes) -> None:
+        self.outbound.send_movement(updates, frame)
@@ -1,21 +1,150 @@
+from typing import Any, Iterable
+
 from twisted.internet import protocol
 from twisted.internet.interfaces import IAddress
 
-from common.model import Player
+from common.framing import FrameCompressor
+from common.model import WorldDelta
+from common.translator import Codec, MessageTranslator
+from server.auth.password_hasher import PasswordHasher
 from server.database.connector import GameDatabase
+from server.database.position_store import PositionStore
+from server.protocol.connection_registry import ConnectionRegistry
+from server.protocol.connection_states import ConnectionState
+from server.protocol.movement_channel import Address, MovementChannel
 from server.protocol.pudink_connection import PudinkConnection
+from server.world.movement_batcher import MovementBatcher
+from server.world.snapshot_cache import SnapshotCache
+from server.world.spatial_grid import SpatialGrid
+from server.world.speed_limit import SpeedLimit
 
 
 class PudinkServer(protocol.ServerFactory):
     db: GameDatabase
-    clients: list[PudinkConnection]
-    players: dict[str, Player]
+    connections: ConnectionRegistry
+    codec: Codec
+    movement: MovementBatcher
+    grid: SpatialGrid[PudinkConnection]
+    hasher: PasswordHasher
+    positions: PositionStore
+    snapshots: SnapshotCache
+    snapshot_page_size: int
+    compressor: FrameCompressor | None
+    tick_rate: float
+    datagrams: MovementChannel | None
+    max_speed: float
+    move_burst: float
 
-    def __init__(self, db: GameDatabase):
+    def __init__(
+        self,
+        db: GameDatabase,
+        hasher: PasswordHasher,
+        codec: Codec = Codec.JSON,
+        aoi_cell_size: int = 1024,
+        snapshot_page_size: int = 100,
+        compressor: FrameCompressor | None = None,
+        tick_rate: float = 20.0,
+        datagrams: MovementChannel | None = None,
+        max_speed: float = 360.0,
+        move_burst: float = 0.25,
+    ):
         self.db = db
-        self.clients = []
-        self.players = {}
+        self.hasher = hasher
+        self.codec = codec
+        self.connections = ConnectionRegistry()
+        self.movement = MovementBatcher(self)
+        self.grid = SpatialGrid(aoi_cell_size)
+        self.positions = PositionStore(db)
+        self.snapshots = SnapshotCache()
+        self.snapshot_page_size = snapshot_page_size
+        self.compressor = compressor
+        self.tick_rate = tick_rate
+        self.datagrams = datagrams
+        self.max_speed = max_speed
+        self.move_burst = move_burst
 
     def buildProtocol(self, addr: IAddress):
         server_protocol = PudinkConnection(self.db, self)
         return server_protocol
+
+    # Brings a logged in player into the world. Only online players are kept
+    # in memory, so it scales with concurrent rather than lifetime players.
+    # Returns False without changing anything if the connection was already
+    # closed, e.g. while its login was being verified.
+    def player_online(self, connection: PudinkConnection) -> bool:
+        player = connection.player
+        if player is None:
+            raise ValueError("Connection has no player")
+        if connection not in self.connections:
+            return False
+        self.grid.insert(connection, player.x, player.y)
+        connection.speed_limit = SpeedLimit(
+            self.max_speed, self.max_speed * self.move_burst
+        )
+        connection.move_sequence = -1
+        self.connections.set_state(connection, ConnectionState.CONNECTED)
+        if connection.supports_udp and self.datagrams is not None:
+            self.datagrams.open_session(connection)
+        return True
+
+    # Evicts the player from the world and persists their last position.
+    # The cached account is updated as well so a quick reconnect does not
+    # restore the position loaded at login.
+    def player_offline(self, connection: PudinkConnection) -> None:
+        player = connection.player
+        if player is None:
+            raise ValueError("Connection has no player")
+        self.movement.discard(player.id)
+        self.snapshots.invalidate(player.id)
+        if self.datagrams is not None:
+            self.datagrams.close_session(connection)
+        self.grid.remove(connection)
+        self.connections.set_state(connection, ConnectionState.DISCONNECTED)
+
+        if connection.account is not None:
+            connection.account.position = (player.x, player.y)
+        self.positions.mark(player.id, player.x, player.y)
+        # A failed write was already reported and is retried by the next flush
+        self.positions.flush().addErrback(lambda _: None)
+
+    def send_to(self, connections: Iterable[PudinkConnection], message: Any) -> None:
+        frames: dict[tuple[Codec, bool], bytes] = {}
+        for connection in connections:
+            connection.send_frame(_frame_for(frames, message, connection))
+
+    # Movement may be dropped in favour of newer positions on congested clients.
+    # Clients with a working UDP session get it as datagrams, the rest on TCP.
+    def send_movement_to(
+        self, connections: Iterable[PudinkConnection], delta: WorldDelta
+    ) -> None:
+        tcp_connections = []
+        udp_connections = []
+        addresses: list[Address] = []
+        for connection in connections:
+            session = connection.datagram_session
+            if session is not None and session.address is not None:
+                udp_connections.append(connection)
+                addresses.append(session.address)
+            else:
+                tcp_connections.append(connection)
+        if addresses and self.datagrams is not None:
+            if not self.datagrams.send_delta(addresses, delta):
+                tcp_connections.extend(udp_connections)
+
+        frames: dict[tuple[Codec, bool], bytes] = {}
+        for connection in tcp_connections:
+            frame = _frame_for(frames, delta, connection)
+            connection.send_movement(delta.updates, frame)
+
+
+# Encodes the message once per codec and compression setting in use
+def _frame_for(
+    frames: dict[tuple[Codec, bool], bytes],
+    message: Any,
+    connection: PudinkConnection,
+) -> bytes:
+    key = (connection.codec, connection.compressor is not None)
+    if key not in frames:
+        payload = MessageTranslator.encode(message, connection.codec)
+        frames[key] = connection.frame_payload(payload)
+    return frames[key]
@@ -1,10 +1,14 @@
 import signal
-from sqlite3 import ProgrammingError
 
 from twisted.internet import reactor
 from twisted.internet.error import ReactorNotRunning
+from twisted.internet.task import LoopingCall
 
+from common.framing import FrameCompressor
+from common.translator import Codec
+from server.auth.password_hasher import PasswordHasher
 from server.database.connector import GameDatabase
+from server.protocol.movement_channel import MovementChannel
 from server.protocol.pudink_server import PudinkServer
 
 
@@ -12,24 +16,115 @@ class PudinkServerRunner:
     _db: GameDatabase
     _factory: PudinkServer
     _port: int
+    _tick_rate: float
+    _tick_loop: LoopingCall
+    _hasher: PasswordHasher
+    _stats_loop: LoopingCall
+    _flush_interval: float
+    _flush_loop: LoopingCall
+    _compressor: FrameCompressor | None
+    _udp_port: int | None
+    _datagrams: MovementChannel | None
 
-    def __init__(self, db_location: str, port: int = 8000) -> None:
-        self._db = GameDatabase(db_location)
-        self._factory = PudinkServer(self._db)
+    def __init__(
+        self,
+        db_location: str,
+        port: int = 8000,
+        codec: Codec = Codec.JSON,
+        tick_rate: float = 20.0,
+        aoi_cell_size: int = 1024,
+        db_pool_size: int = 4,
+        position_flush_interval: float = 5.0,
+        snapshot_page_size: int = 100,
+        compression_threshold: int | None = None,
+        udp_port: int | None = None,
+        max_speed: float = 360.0,
+    ) -> None:
+        # codec is used for clients that log in without a handshake, the
+        # others get the fastest codec they support.
+        # tick_rate is the number of batched world updates sent per second,
+        # lower values trade movement latency for throughput.
+        # aoi_cell_size is the side of a spatial grid cell, players only hear
+        # about players in neighbouring cells, so it must cover the view area.
+        # db_pool_size is the number of database worker threads.
+        # position_flush_interval is how often, in seconds, moved players'
+        # positions are written to the database.
+        # snapshot_page_size is the number of players per login snapshot page.
+        # compression_threshold offers compression of messages of at least
+        # that many bytes during the handshake, it is off when None.
+        # udp_port is where movement datagrams are exchanged with clients
+        # that support it, movement stays on TCP when it is None.
+        # max_speed is the fastest a player may move in pixels per second,
+        # faster movement is cut short and corrected on the client.
+        self._db = GameDatabase(db_location, db_pool_size)
+        self._hasher = PasswordHasher()
+        self._compressor = (
+            FrameCompressor(compression_threshold)
+            if compression_threshold is not None
+            else None
+        )
+        self._udp_port = udp_port
+        self._datagrams = MovementChannel() if udp_port is not None else None
+        self._factory = PudinkServer(
+            self._db,
+            self._hasher,
+            codec,
+            aoi_cell_size,
+            snapshot_page_size,
+            self._compressor,
+            tick_rate,
+            self._datagrams,
+            max_speed,
+        )
         self._port = port
+        self._tick_rate = tick_rate
+        self._tick_loop = LoopingCall(self._factory.movement.tick)
+        self._stats_loop = LoopingCall(self._report_stats)
+        self._flush_interval = position_flush_interval
+        self._flush_loop = LoopingCall(self._flush_positions)
 
     def run(self) -> None:
         reactor.listenTCP(self._port, self._factory)  # type: ignore
+        if self._datagrams is not None:
+            reactor.listenUDP(self._udp_port, self._datagrams)  # type: ignore
         signal.signal(signal.SIGINT, self._sigint_handler)
+        self._tick_loop.start(1.0 / self._tick_rate, now=False)
+        self._stats_loop.start(60.0, now=False)
+        self._flush_loop.start(self._flush_interval, now=False)
         print(f"Server started, listening on port {self._port}")
         reactor.run()  # type: ignore
 
+    # A failed write must not stop the loop, its positions are retried on the
+    # next run and the error was already reported
+    def _flush_positions(self) -> None:
+        self._factory.positions.flush().addErrback(lambda _: None)
+
     def _sigint_handler(self, *args, **kwargs) -> None:
         print("SIGINT detected, shutting down.")
+        for loop in (self._tick_loop, self._stats_loop, self._flush_loop):
+            if loop.running:
+                loop.stop()
+        self._factory.positions.flush().addBoth(self._shutdown)
+
+    def _shutdown(self, _: object) -> None:
+        self._hasher.close()
+        self._db.close_connection()
         try:
             reactor.stop()  # type: ignore
-            self._db.close_connection()
         except ReactorNotRunning:
             print("Reactor already closed.")
-        except ProgrammingError:
-            print("Database already closed.")
+
+    def _report_stats(self) -> None:
+        if self._hasher.stats.completed:
+            print(f"Password hashing: {self._hasher.stats}")
+            self._hasher.reset_stats()
+        print(f"Account cache: {self._db.account_cache}")
+        if self._compressor is not None and self._compressor.stats.frames:
+            print(f"Compression: {self._compressor.stats}")
+            self._compressor.reset_stats()
+        if self._datagrams is not None and self._datagrams.stats.received:
+            print(f"Movement datagrams: {self._datagrams.stats}")
+            self._datagrams.reset_stats()
+        if self._factory.positions.stats.flushes:
+            print(f"Position saves: {self._factory.positions.stats}")
+            self._factory.positions.reset_stats()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import typing
+from collections import defaultdict
+
+from common.model import PlayerUpdate, WorldDelta
+from server.world.spatial_grid import Cell
+
+if typing.TYPE_CHECKING:
+    from server.protocol.pudink_server import PudinkServer
+
+
+# Coalesces player movement into one WorldDelta per server tick. Only the latest
+# position of each player is kept between ticks, so clients receive a single
+# message per tick holding just the players that moved.
+# Every connection in a cell gets the same delta, so it is encoded once per
+# cell. That delta includes the receiver's own update if it moved; clients
+# skip their own id, which costs a few bytes instead of one encoding per mover.
+class MovementBatcher:
+
+    _factory: PudinkServer
+    _pending: dict[str, tuple[Cell, PlayerUpdate]]
+
+    def __init__(self, factory: PudinkServer) -> None:
+        self._factory = factory
+        self._pending = {}
+
+    def add(self, update: PlayerUpdate, cell: Cell) -> None:
+        self._pending[update.id] = (cell, update)
+
+    def discard(self, player_id: str) -> None:
+        self._pending.pop(player_id, None)
+
+    def tick(self) -> None:
+        if not self._pending:
+            return
+        updates_by_cell: defaultdict[Cell, list[PlayerUpdate]] = defaultdict(list)
+        for cell, update in self._pending.values():
+            updates_by_cell[cell].append(update)
+        self._pending = {}
+
+        grid = self._factory.grid
+        for cell, receivers in grid.occupied_cells():
+            updates = [
+                update
+                for around in grid.cells_around(cell)
+                if around in updates_by_cell
+                for update in updates_by_cell[around]
+            ]
+            if updates:
+                self._factory.send_movement_to(receivers, WorldDelta(updates))
@@ -0,0 +1,39 @@
+from typing import Iterable
+
+from common.model import Player
+from common.translator import MessageTranslator
+
+
+# Keeps every online player encoded as the JSON fragment used inside a
+# PlayerSnapshot. A player's fragment is dropped when they move and encoded
+# again on the next snapshot that includes them, so a snapshot only encodes
+# players that changed since the previous one and joins the rest as bytes.
+class SnapshotCache:
+
+    _fragments: dict[str, bytes]
+
+    def __init__(self) -> None:
+        self._fragments = {}
+
+    def invalidate(self, player_id: str) -> None:
+        self._fragments.pop(player_id, None)
+
+    def fragment(self, player: Player) -> bytes:
+        fragment = self._fragments.get(player.id)
+        if fragment is None:
+            fragment = MessageTranslator.encode_fields(player)
+            self._fragments[player.id] = fragment
+        return fragment
+
+    def encode(self, player_id: str, players: Iterable[Player]) -> bytes:
+        return MessageTranslator.encode_player_snapshot(
+            player_id, [self.fragment(player) for player in players]
+        )
+
+    def encode_page(self, players: Iterable[Player], remaining: int) -> bytes:
+        return MessageTranslator.encode_player_snapshot_page(
+            [self.fragment(player) for player in players], remaining
+        )
+
+    def __len__(self) -> int:
+        return len(self._fragments)
@@ -0,0 +1,72 @@
+from collections import defaultdict
+from typing import Generic, Hashable, Iterator, TypeVar
+
+Item = TypeVar("Item", bound=Hashable)
+Cell = tuple[int, int]
+
+
+# Uniform grid over world coordinates. Every item lives in exactly one cell and
+# is interested in the items of the cells at most `radius` cells away from it,
+# which makes interest symmetric. With radius 1 the cell size has to be at least
+# the size of the area a client can see.
+class SpatialGrid(Generic[Item]):
+    cell_size: int
+    radius: int
+    _cells: defaultdict[Cell, set[Item]]
+    _item_cells: dict[Item, Cell]
+
+    def __init__(self, cell_size: int, radius: int = 1) -> None:
+        self.cell_size = cell_size
+        self.radius = radius
+        self._cells = defaultdict(set)
+        self._item_cells = {}
+
+    def cell_of(self, x: int, y: int) -> Cell:
+        return (x // self.cell_size, y // self.cell_size)
+
+    def get_cell(self, item: Item) -> Cell | None:
+        return self._item_cells.get(item)
+
+    def insert(self, item: Item, x: int, y: int) -> Cell:
+        self.remove(item)
+        cell = self.cell_of(x, y)
+        self._cells[cell].add(item)
+        self._item_cells[item] = cell
+        return cell
+
+    def remove(self, item: Item) -> Cell | None:
+        cell = self._item_cells.pop(item, None)
+        if cell is not None:
+            items = self._cells[cell]
+            items.discard(item)
+            if not items:
+                del self._cells[cell]
+        return cell
+
+    # Returns the old and the new cell of the item, which are equal
+    # when the item stayed in its cell.
+    def move(self, item: Item, x: int, y: int) -> tuple[Cell | None, Cell]:
+        old_cell = self._item_cells.get(item)
+        new_cell = self.cell_of(x, y)
+        if old_cell != new_cell:
+            self.insert(item, x, y)
+        return old_cell, new_cell
+
+    def cells_around(self, cell: Cell) -> Iterator[Cell]:
+        cx, cy = cell
+        for x in range(cx - self.radius, cx + self.radius + 1):
+            for y in range(cy - self.radius, cy + self.radius + 1):
+                yield (x, y)
+
+    def items_around(self, cell: Cell) -> set[Item]:
+        nearby: set[Item] = set()
+        for around in self.cells_around(cell):
+            if around in self._cells:
+                nearby.update(self._cells[around])
+        return nearby
+
+    def occupied_cells(self) -> Iterator[tuple[Cell, set[Item]]]:
+        return iter(self._cells.items())
+
+    def __len__(self) -> int:
+        return len(self._item_cells)
@@ -0,0 +1,39 @@
+import math
+
+
+# Bounds how far a player can move in a given time. Allowance builds up at
+# max_speed pixels per second up to burst pixels, so a client may send its
+# movement late or in uneven steps, but never cover more distance than the
+# speed allows over time.
+class SpeedLimit:
+    max_speed: float
+    burst: float
+    _allowance: float
+    _updated_at: float | None
+
+    def __init__(self, max_speed: float, burst: float) -> None:
+        self.max_speed = max_speed
+        self.burst = burst
+        self._allowance = burst
+        self._updated_at = None
+
+    def reset(self) -> None:
+        self._allowance = self.burst
+        self._updated_at = None
+
+    # Returns the step shortened to the distance allowed at time now
+    def clamp(self, dx: int, dy: int, now: float) -> tuple[int, int]:
+        if self._updated_at is not None:
+            elapsed = max(now - self._updated_at, 0.0)
+            self._allowance = min(
+                self._allowance + elapsed * self.max_speed, self.burst
+            )
+        self._updated_at = now
+
+        distance = math.hypot(dx, dy)
+        if distance <= self._allowance:
+            self._allowance -= distance
+            return dx, dy
+        scale = self._allowance / distance
+        self._allowance = 0.0
+        return int(dx * scale), int(dy * scale)
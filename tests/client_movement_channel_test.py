@@ -0,0 +1,49 @@
+from common import datagram
+from common.model import PlayerUpdate, WorldDelta
+from tests.conftest import load_client_module
+
+ClientMovementChannel = load_client_module(
+    "client.game.movement_channel"
+).ClientMovementChannel
+
+SERVER = ("1.2.3.4", 5)
+
+
+class FakeClient:
+    def __init__(self):
+        self.received = []
+
+    def receive_message(self, message):
+        self.received.append(message)
+
+
+def receive_delta(channel, sequence, update):
+    (encoded,) = datagram.encode_deltas(sequence, [update])
+    channel.datagramReceived(encoded, SERVER)
+
+
+def test_when_position_is_older_than_applied_one_then_it_is_dropped():
+    # given
+    client = FakeClient()
+    channel = ClientMovementChannel(client, bytes(16), SERVER)
+    receive_delta(channel, 5, PlayerUpdate("2", 10, 10))
+
+    # when
+    receive_delta(channel, 4, PlayerUpdate("2", 1, 1))
+
+    # then
+    assert client.received == [WorldDelta([PlayerUpdate("2", 10, 10)])]
+    assert channel.stale == 1
+
+
+def test_when_player_is_forgotten_then_its_sequence_is_no_longer_kept():
+    # given
+    client = FakeClient()
+    channel = ClientMovementChannel(client, bytes(16), SERVER)
+    receive_delta(channel, 5, PlayerUpdate("2", 10, 10))
+
+    # when
+    channel.forget("2")
+
+    # then
+    assert channel._latest == {}
@@ -0,0 +1,17 @@
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+
+# Loads a client module by path. Importing it through the client package
+# would run client/__init__, which creates the pyglet window and needs a
+# display, so only modules without client imports can be loaded this way.
+def load_client_module(name: str) -> ModuleType:
+    path = _ROOT.joinpath(*name.split(".")).with_suffix(".py")
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
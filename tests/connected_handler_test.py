@@ -0,0 +1,113 @@
+from twisted.internet.defer import succeed
+from twisted.internet.error import ConnectionDone
+from twisted.internet.testing import StringTransport
+from twisted.python.failure import Failure
+
+from common.model import Character, MoveAck, MoveCommand, Player, PlayerUpdate
+from common.translator import MessageTranslator
+from server.handler.dispatcher import MessageDispatcher
+from server.handler.handlers.connected_handler import ConnectedHandler
+from server.protocol.connection_states import ConnectionState
+from server.protocol.pudink_server import PudinkServer
+
+
+class FakeDatabase:
+    def save_positions(self, positions):
+        return succeed(None)
+
+
+class FakeConnection:
+    def __init__(self, factory, player_id="1", x=100, y=100):
+        self.factory = factory
+        self.db = factory.db
+        self.connected = True
+        self.state = ConnectionState.DISCONNECTED
+        self.player = Player(player_id, Character(1, 1), x, y)
+        self.account = None
+        self.supports_udp = False
+        self.datagram_session = None
+        self.sent = []
+        self.message_dispatcher = MessageDispatcher(self)
+        factory.connections.add(self)
+        factory.player_online(self)
+
+    def send_message(self, message):
+        self.sent.append(message)
+
+    def send_frame(self, frame):
+        self.sent.append(MessageTranslator.decode(frame))
+
+    def frame_payload(self, payload):
+        return payload
+
+
+def test_when_move_command_arrives_then_position_is_acked():
+    # given
+    factory = PudinkServer(FakeDatabase(), None)
+    connection = FakeConnection(factory)
+
+    # when
+    connection.message_dispatcher.dispatch_message(MoveCommand(1, 5, -5))
+
+    # then
+    assert connection.sent == [MoveAck(1, 105, 95)]
+    assert (connection.player.x, connection.player.y) == (105, 95)
+
+
+def test_when_move_is_faster_than_allowed_then_it_is_cut_short():
+    # given
+    factory = PudinkServer(FakeDatabase(), None, max_speed=100, move_burst=0.5)
+    connection = FakeConnection(factory)
+
+    # when
+    connection.message_dispatcher.dispatch_message(MoveCommand(1, 500, 0))
+    connection.message_dispatcher.dispatch_message(PlayerUpdate("1", 1000, 100))
+
+    # then
+    assert connection.sent == [MoveAck(1, 150, 100)]
+    assert connection.player.x < 160
+
+
+def test_when_command_arrives_after_newer_one_then_it_is_dropped():
+    # given
+    factory = PudinkServer(FakeDatabase(), None)
+    connection = FakeConnection(factory)
+    connection.message_dispatcher.dispatch_message(MoveCommand(2, 1, 0))
+
+    # when
+    connection.message_dispatcher.dispatch_message(MoveCommand(1, 1, 0))
+
+    # then
+    assert connection.sent == [MoveAck(2, 101, 100)]
+
+
+def test_when_player_moves_away_during_snapshot_then_later_page_skips_them():
+    # given
+    factory = PudinkServer(FakeDatabase(), None, aoi_cell_size=100)
+    connection = FakeConnection(factory)
+    near = FakeConnection(factory, "2", 150, 100)
+    leaving = FakeConnection(factory, "3", 120, 100)
+    pages = [[connection], [near, leaving]]
+    factory.grid.move(leaving, 5000, 100)
+
+    # when
+    ConnectedHandler(connection)._send_snapshot_page(pages, 1)
+
+    # then
+    assert [p.id for p in connection.sent[0].players] == ["2"]
+
+
+def test_when_client_left_then_remaining_snapshot_pages_are_not_sent():
+    # given
+    factory = PudinkServer(FakeDatabase(), None)
+    connection = factory.buildProtocol(None)
+    transport = StringTransport()
+    connection.makeConnection(transport)
+    other = FakeConnection(factory)
+    connection.connectionLost(Failure(ConnectionDone()))
+
+    # when
+    ConnectedHandler(connection)._send_snapshot_page([[], [other]], 1)
+
+    # then
+    assert transport.value() == b""
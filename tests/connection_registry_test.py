@@ -0,0 +1,56 @@
+import pytest
+
+from common.model import Character, Player
+from server.protocol.connection_registry import ConnectionRegistry
+from server.protocol.connection_states import ConnectionState
+
+
+class FakeConnection:
+    def __init__(self, player_id=None):
+        self.state = ConnectionState.DISCONNECTED
+        self.player = (
+            Player(player_id, Character(1, 1), 0, 0) if player_id is not None else None
+        )
+
+
+def test_when_connection_logs_in_then_it_is_indexed_by_player():
+    # given
+    registry = ConnectionRegistry()
+    connection = FakeConnection("1")
+    registry.add(connection)
+
+    # when
+    registry.set_state(connection, ConnectionState.CONNECTED)
+
+    # then
+    assert connection.state == ConnectionState.CONNECTED
+    assert registry.is_player_connected("1")
+    assert registry.by_player("1") is connection
+    assert list(registry) == [connection]
+
+
+def test_when_connection_is_removed_then_player_is_no_longer_connected():
+    # given
+    registry = ConnectionRegistry()
+    connection = FakeConnection("1")
+    registry.add(connection)
+    registry.set_state(connection, ConnectionState.CONNECTED)
+
+    # when
+    registry.remove(connection)
+
+    # then
+    assert not registry.is_player_connected("1")
+    assert connection not in registry
+    assert len(registry) == 0
+
+
+def test_when_connection_without_player_logs_in_then_error_is_raised():
+    # given
+    registry = ConnectionRegistry()
+    connection = FakeConnection()
+    registry.add(connection)
+
+    # when / then
+    with pytest.raises(ValueError):
+        registry.set_state(connection, ConnectionState.CONNECTED)
@@ -0,0 +1,67 @@
+import pytest
+
+from common import datagram
+from common.model import MoveCommand, PlayerUpdate
+
+
+def test_when_move_is_encoded_then_it_decodes_to_same_values():
+    # given
+    token = bytes(range(16))
+
+    # when
+    encoded = datagram.encode_move(token, 7, -5, 400)
+
+    # then
+    assert datagram.decode_move(encoded) == (token, 7, -5, 400)
+
+
+def test_when_commands_pile_up_then_only_the_newest_are_encoded():
+    # given
+    token = bytes(range(16))
+    commands = [MoveCommand(i, i, -i) for i in range(1, 41)]
+
+    # when
+    encoded = datagram.encode_commands(token, commands)
+
+    # then
+    limit = datagram.MAX_COMMANDS_PER_DATAGRAM
+    assert datagram.decode_commands(encoded) == (token, commands[-limit:])
+
+
+def test_when_delta_is_large_then_it_is_split_into_datagrams_with_same_sequence():
+    # given
+    updates = [PlayerUpdate(str(i), i, -i) for i in range(200)]
+
+    # when
+    datagrams = datagram.encode_deltas(3, updates)
+
+    # then
+    assert len(datagrams) == 3
+    assert all(len(d) < 1200 for d in datagrams)
+    decoded = [datagram.decode_delta(d) for d in datagrams]
+    assert {sequence for sequence, _ in decoded} == {3}
+    assert [u for _, chunk in decoded for u in chunk] == updates
+
+
+def test_when_player_id_is_not_numeric_then_delta_is_not_encoded():
+    # when / then
+    assert datagram.encode_deltas(1, [PlayerUpdate("abc", 1, 1)]) is None
+
+
+def test_when_player_id_is_out_of_range_then_delta_is_not_encoded():
+    # when / then
+    assert datagram.encode_deltas(1, [PlayerUpdate("4294967296", 1, 1)]) is None
+
+
+def test_when_player_id_has_non_ascii_digits_then_delta_is_not_encoded():
+    # when / then
+    assert datagram.encode_deltas(1, [PlayerUpdate("²", 1, 1)]) is None
+
+
+def test_when_datagram_is_truncated_then_error_is_raised():
+    # given
+    encoded = datagram.encode_move(bytes(16), 1, 2, 3)
+
+    # when / then
+    with pytest.raises(ValueError):
+        datagram.decode_move(encoded[:-1])
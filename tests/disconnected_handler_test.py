@@ -0,0 +1,87 @@
+from twisted.internet.defer import Deferred, succeed
+from twisted.internet.error import ConnectionDone
+from twisted.internet.testing import StringTransport
+from twisted.python.failure import Failure
+
+from common.model import Character, Credentials, PlayerInitialization
+from server.database.connector import Account
+from server.handler.handlers.disconnected_handler import DisconnectedHandler
+from server.protocol.connection_states import ConnectionState
+from server.protocol.pudink_server import PudinkServer
+
+
+class FakeConnection:
+    def __init__(self, factory):
+        self.factory = factory
+        self.db = factory.db
+        self.state = ConnectionState.DISCONNECTED
+        self.connected = True
+        self.player = None
+        self.account = None
+        self.supports_udp = False
+        self.datagram_session = None
+        self.sent = []
+        factory.connections.add(self)
+
+    def send_message(self, message):
+        self.sent.append(message)
+
+    def send_frame(self, frame):
+        self.sent.append(frame)
+
+    def frame_payload(self, payload):
+        return payload
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.lookup = Deferred()
+
+    def find_account(self, name):
+        return self.lookup
+
+
+class FakeHasher:
+    def verify(self, password, password_hash):
+        return succeed(True)
+
+
+def account(player_id):
+    return Account(PlayerInitialization(player_id, Character(1, 1)), "hash")
+
+
+def test_when_second_login_arrives_on_logged_in_connection_then_account_is_kept():
+    # given
+    factory = PudinkServer(None, None)
+    connection = FakeConnection(factory)
+    handler = DisconnectedHandler(connection)
+    first, second = account("1"), account("2")
+
+    # when
+    logged_in = handler._on_authenticated(first.player, None, first)
+    logged_in_again = handler._on_authenticated(second.player, None, second)
+
+    # then
+    assert logged_in
+    assert not logged_in_again
+    assert connection.player.id == "1"
+    assert connection.account is first
+    assert factory.connections.by_player("2") is None
+
+
+def test_when_client_leaves_during_login_then_player_is_not_brought_online():
+    # given
+    db = FakeDatabase()
+    factory = PudinkServer(db, FakeHasher())
+    connection = factory.buildProtocol(None)
+    connection.makeConnection(StringTransport())
+    connection.message_dispatcher.dispatch_message(Credentials("name", "pass"))
+    connection.connectionLost(Failure(ConnectionDone()))
+
+    # when
+    db.lookup.callback(account("1"))
+
+    # then
+    assert connection.player is None
+    assert len(factory.grid) == 0
+    assert factory.connections.by_player("1") is None
@@ -0,0 +1,54 @@
+from tests.conftest import load_client_module
+
+FixedTimestep = load_client_module("client.game.fixed_timestep").FixedTimestep
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_when_first_frame_is_drawn_then_no_step_is_run():
+    # given
+    clock = FakeClock()
+    timestep = FixedTimestep(step=0.1, clock=clock)
+
+    # when
+    steps = timestep.advance()
+
+    # then
+    assert steps == 0
+
+
+def test_when_frames_are_shorter_than_step_then_time_carries_over():
+    # given
+    clock = FakeClock()
+    timestep = FixedTimestep(step=0.1, clock=clock)
+    timestep.advance()
+
+    # when
+    steps = []
+    for _ in range(5):
+        clock.now += 0.04
+        steps.append(timestep.advance())
+
+    # then
+    assert steps == [0, 0, 1, 0, 1]
+
+
+def test_when_frame_is_too_long_then_steps_are_capped_and_time_dropped():
+    # given
+    clock = FakeClock()
+    timestep = FixedTimestep(step=0.1, max_steps=3, clock=clock)
+    timestep.advance()
+
+    # when
+    clock.now += 1.05
+    steps = timestep.advance()
+
+    # then
+    assert steps == 3
+    assert abs(timestep.dropped - 0.7) < 1e-9
@@ -0,0 +1,105 @@
+import pytest
+
+from common.framing import (
+    COMPRESSED_FLAG,
+    HEADER,
+    FrameCompressor,
+    FrameDecoder,
+    encode_frame,
+)
+
+
+def test_when_chunk_contains_multiple_frames_then_all_are_decoded():
+    # given
+    decoder = FrameDecoder()
+    chunk = b"".join(encode_frame(f"message {i}".encode()) for i in range(100))
+
+    # when
+    frames = decoder.feed(chunk)
+
+    # then
+    assert frames == [f"message {i}".encode() for i in range(100)]
+    assert decoder.pending == 0
+
+
+def test_when_frame_is_split_across_chunks_then_it_is_decoded_once_complete():
+    # given
+    decoder = FrameDecoder()
+    data = encode_frame(b"first") + encode_frame(b"x" * 1000)
+
+    # when
+    frames = []
+    for i in range(0, len(data), 7):
+        frames.extend(decoder.feed(data[i : i + 7]))
+
+    # then
+    assert frames == [b"first", b"x" * 1000]
+    assert decoder.pending == 0
+
+
+def test_when_partial_frame_remains_then_it_is_kept_pending():
+    # given
+    decoder = FrameDecoder()
+    data = encode_frame(b"complete") + encode_frame(b"partial")
+
+    # when
+    frames = decoder.feed(data[:-3])
+
+    # then
+    assert frames == [b"complete"]
+    assert decoder.feed(data[-3:]) == [b"partial"]
+
+
+def test_when_frame_exceeds_limit_then_error_is_raised():
+    # given
+    decoder = FrameDecoder(max_frame_size=10)
+
+    # when / then
+    with pytest.raises(ValueError):
+        decoder.feed(encode_frame(b"x" * 11))
+
+
+def test_when_payload_is_above_threshold_then_it_is_compressed_and_decoded():
+    # given
+    compressor = FrameCompressor(threshold=64)
+    payload = b'{"id":"1","character":{"head_type":1,"body_type":1}}' * 20
+
+    # when
+    frame = compressor.encode_frame(payload)
+
+    # then
+    assert HEADER.unpack_from(frame)[0] & COMPRESSED_FLAG
+    assert len(frame) < len(payload)
+    assert FrameDecoder().feed(frame) == [payload]
+    assert compressor.stats.compressed == 1
+
+
+def test_when_payload_is_below_threshold_then_it_is_sent_uncompressed():
+    # given
+    compressor = FrameCompressor(threshold=64)
+
+    # when
+    frame = compressor.encode_frame(b"small")
+
+    # then
+    assert frame == encode_frame(b"small")
+    assert compressor.stats.compressed == 0
+
+
+def test_when_compressed_frame_is_corrupt_then_error_is_raised():
+    # given
+    decoder = FrameDecoder()
+
+    # when / then
+    with pytest.raises(ValueError):
+        decoder.feed(encode_frame(b"not deflate data", compressed=True))
+
+
+def test_when_compression_was_not_agreed_then_compressed_frame_is_rejected():
+    # given
+    decoder = FrameDecoder(accept_compressed=False)
+    frame = FrameCompressor(threshold=0).encode_frame(b"a" * 100)
+
+    # when / then
+    with pytest.raises(ValueError):
+        decoder.feed(frame)
@@ -0,0 +1,104 @@
+from twisted.internet.defer import succeed
+
+from common.framing import FrameCompressor, FrameDecoder
+from common.model import ConnectionFailure, Credentials, Hello, Welcome
+from common.translator import Codec
+from server.handler.dispatcher import MessageDispatcher
+from server.protocol.connection_states import ConnectionState
+from server.protocol.pudink_server import PudinkServer
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.lookups = []
+
+    def find_account(self, name):
+        self.lookups.append(name)
+        return succeed(ConnectionFailure("Failed to authenticate user"))
+
+
+class FakeTransport:
+    def loseConnection(self):
+        self.lost = True
+
+
+class FakeConnection:
+    def __init__(self, factory):
+        self.factory = factory
+        self.db = factory.db
+        self.state = ConnectionState.HANDSHAKE
+        self.codec = factory.codec
+        self.compressor = None
+        self.decoder = FrameDecoder(accept_compressed=False)
+        self.supports_udp = False
+        self.datagram_session = None
+        self.player = None
+        self.connected = True
+        self.transport = FakeTransport()
+        self.sent = []
+        self.message_dispatcher = MessageDispatcher(self)
+        factory.connections.add(self)
+
+    def send_message(self, message):
+        self.sent.append(message)
+
+
+def test_when_client_says_hello_then_fastest_common_options_are_picked():
+    # given
+    factory = PudinkServer(FakeDatabase(), None, compressor=FrameCompressor())
+    connection = FakeConnection(factory)
+
+    # when
+    connection.message_dispatcher.dispatch_message(
+        Hello([1], ["json", "binary"], True, False)
+    )
+
+    # then
+    assert connection.sent == [Welcome(1, "binary", True, factory.tick_rate)]
+    assert connection.codec == Codec.BINARY
+    assert connection.compressor is factory.compressor
+    assert connection.decoder.accept_compressed
+    assert connection.state == ConnectionState.DISCONNECTED
+
+
+def test_when_server_has_no_compression_then_it_is_not_agreed():
+    # given
+    factory = PudinkServer(FakeDatabase(), None)
+    connection = FakeConnection(factory)
+
+    # when
+    connection.message_dispatcher.dispatch_message(Hello([1], ["json"], True, False))
+
+    # then
+    assert connection.sent == [Welcome(1, "json", False, factory.tick_rate)]
+    assert connection.compressor is None
+    assert not connection.decoder.accept_compressed
+
+
+def test_when_no_protocol_version_matches_then_connection_is_closed():
+    # given
+    factory = PudinkServer(FakeDatabase(), None)
+    connection = FakeConnection(factory)
+
+    # when
+    connection.message_dispatcher.dispatch_message(Hello([999], ["json"], False, False))
+
+    # then
+    assert isinstance(connection.sent[0], ConnectionFailure)
+    assert connection.transport.lost
+    assert connection.state == ConnectionState.HANDSHAKE
+
+
+def test_when_legacy_client_logs_in_without_hello_then_login_is_handled():
+    # given
+    db = FakeDatabase()
+    factory = PudinkServer(db, None)
+    connection = FakeConnection(factory)
+
+    # when
+    connection.message_dispatcher.dispatch_message(Credentials("name", "password"))
+
+    # then
+    assert db.lookups == ["name"]
+    assert connection.state == ConnectionState.DISCONNECTED
+    assert connection.codec == factory.codec
@@ -0,0 +1,88 @@
+import random
+
+from tests.conftest import load_client_module
+
+InterpolationBuffer = load_client_module(
+    "client.game.interpolation_buffer"
+).InterpolationBuffer
+
+SPEED = 100
+FRAME = 1 / 60
+
+
+# Receives a player moving right at SPEED, sent at tick_rate and arriving
+# up to half a tick late, and returns the positions drawn every frame
+def render_with_jitter(tick_rate):
+    interval = 1 / tick_rate
+    buffer = InterpolationBuffer(update_interval=interval)
+    render_delay = 2 * interval
+    jitter = random.Random(tick_rate)
+    arrivals = [
+        (
+            tick * interval + jitter.uniform(0, interval / 2),
+            round(SPEED * tick * interval),
+        )
+        for tick in range(int(tick_rate * 3))
+    ]
+    buffer.reset(arrivals[0][0], arrivals[0][1], 0)
+    drawn = []
+    newest = []
+    received = 1
+    now = arrivals[0][0]
+    while received < len(arrivals):
+        now += FRAME
+        while received < len(arrivals) and arrivals[received][0] <= now:
+            buffer.push(arrivals[received][0], arrivals[received][1], 0)
+            received += 1
+        x, _ = buffer.sample(now - render_delay)
+        drawn.append(x)
+        newest.append(arrivals[received - 1][1])
+    return drawn, newest
+
+
+def test_when_position_is_between_samples_then_it_is_interpolated():
+    # given
+    buffer = InterpolationBuffer(update_interval=0.1)
+    buffer.reset(0.0, 0, 0)
+    buffer.push(0.1, 10, 20)
+
+    # when
+    position = buffer.sample(0.05)
+
+    # then
+    assert position == (5, 10)
+
+
+def test_when_updates_stop_then_player_eases_back_to_newest_position():
+    # given
+    buffer = InterpolationBuffer(update_interval=0.1, max_extrapolation=0.1)
+    buffer.reset(0.0, 0, 0)
+    buffer.push(0.1, 10, 0)
+
+    # when
+    overshoot = buffer.sample(0.2)
+    rest = buffer.sample(0.5)
+
+    # then
+    assert overshoot == (20, 0)
+    assert rest == (10, 0)
+
+
+def test_when_updates_jitter_at_10_hz_then_player_moves_smoothly_forward():
+    # when
+    drawn, newest = render_with_jitter(10)
+
+    # then
+    assert all(a <= b for a, b in zip(drawn, drawn[1:]))
+    assert all(x <= limit for x, limit in zip(drawn, newest))
+    assert max(b - a for a, b in zip(drawn, drawn[1:])) <= 2 * SPEED * FRAME + 1
+
+
+def test_when_updates_jitter_at_20_hz_then_player_moves_smoothly_forward():
+    # when
+    drawn, newest = render_with_jitter(20)
+
+    # then
+    assert all(a <= b for a, b in zip(drawn, drawn[1:]))
+    assert all(x <= limit for x, limit in zip(drawn, newest))
+    assert max(b - a for a, b in zip(drawn, drawn[1:])) <= 2 * SPEED * FRAME + 1
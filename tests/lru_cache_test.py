@@ -0,0 +1,45 @@
+from server.database.lru_cache import LRUCache
+
+
+def test_when_cache_is_full_then_least_recently_used_entry_is_evicted():
+    # given
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+
+    # when
+    cache.put("c", 3)
+
+    # then
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_when_entries_are_looked_up_then_hits_and_misses_are_counted():
+    # given
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.put("a", 1)
+
+    # when
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+
+    # then
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+
+def test_when_entry_is_invalidated_then_it_is_no_longer_cached():
+    # given
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.put("a", 1)
+
+    # when
+    cache.invalidate("a")
+
+    # then
+    assert cache.get("a") is None
+    assert len(cache) == 0
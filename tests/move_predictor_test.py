@@ -0,0 +1,67 @@
+from common.model import MoveAck, MoveCommand
+from tests.conftest import load_client_module
+
+MovePredictor = load_client_module("client.game.move_predictor").MovePredictor
+
+
+def test_when_player_moves_then_commands_carry_displacements():
+    # given
+    predictor = MovePredictor()
+    predictor.start(100, 100)
+
+    # when
+    first = predictor.command(110, 100)
+    second = predictor.command(110, 95)
+
+    # then
+    assert first == MoveCommand(1, 10, 0)
+    assert second == MoveCommand(2, 0, -5)
+    assert len(predictor) == 2
+
+
+def test_when_ack_matches_prediction_then_nothing_is_corrected():
+    # given
+    predictor = MovePredictor()
+    predictor.start(100, 100)
+    predictor.command(110, 100)
+
+    # when
+    offset = predictor.acknowledge(MoveAck(1, 110, 100))
+
+    # then
+    assert offset == (0, 0)
+    assert predictor.corrections == 0
+    assert len(predictor) == 0
+
+
+def test_when_server_cuts_move_short_then_pending_movement_is_replayed():
+    # given
+    predictor = MovePredictor()
+    predictor.start(100, 100)
+    predictor.command(150, 100)
+    predictor.command(160, 100)
+
+    # when
+    offset = predictor.acknowledge(MoveAck(1, 130, 100))
+
+    # then
+    assert offset == (-20, 0)
+    assert predictor.corrections == 1
+    assert predictor.acknowledge(MoveAck(2, 140, 100)) == (0, 0)
+    assert predictor.command(145, 100) == MoveCommand(3, 5, 0)
+
+
+def test_when_ack_for_older_command_arrives_late_then_it_is_ignored():
+    # given
+    predictor = MovePredictor()
+    predictor.start(100, 100)
+    predictor.command(110, 100)
+    predictor.command(120, 100)
+    predictor.acknowledge(MoveAck(2, 120, 100))
+
+    # when
+    offset = predictor.acknowledge(MoveAck(1, 0, 0))
+
+    # then
+    assert offset == (0, 0)
+    assert len(predictor) == 0
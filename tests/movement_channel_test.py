@@ -0,0 +1,98 @@
+from common import datagram
+from common.model import Character, MoveCommand, Player, PlayerUpdate
+from server.protocol.connection_states import ConnectionState
+from server.protocol.movement_channel import MovementChannel
+
+
+class FakeHost:
+    port = 9000
+
+
+class FakeTransport:
+    def __init__(self):
+        self.written = []
+
+    def write(self, data, address):
+        self.written.append((data, address))
+
+    def getHost(self):
+        return FakeHost()
+
+
+class FakeDispatcher:
+    def __init__(self):
+        self.dispatched = []
+
+    def dispatch_message(self, message):
+        self.dispatched.append(message)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.state = ConnectionState.CONNECTED
+        self.player = Player("1", Character(1, 1), 0, 0)
+        self.datagram_session = None
+        self.message_dispatcher = FakeDispatcher()
+        self.sent = []
+
+    def send_message(self, message):
+        self.sent.append(message)
+
+
+def open_channel():
+    channel = MovementChannel()
+    channel.transport = FakeTransport()
+    connection = FakeConnection()
+    channel.open_session(connection)
+    return channel, connection, connection.datagram_session.token
+
+
+def test_when_move_arrives_then_it_is_dispatched_as_player_update():
+    # given
+    channel, connection, token = open_channel()
+
+    # when
+    channel.datagramReceived(datagram.encode_move(token, 1, 5, 6), ("1.2.3.4", 5))
+
+    # then
+    assert connection.message_dispatcher.dispatched == [PlayerUpdate("1", 5, 6)]
+    assert connection.datagram_session.address == ("1.2.3.4", 5)
+
+
+def test_when_move_arrives_after_newer_one_then_it_is_dropped():
+    # given
+    channel, connection, token = open_channel()
+    address = ("1.2.3.4", 5)
+    channel.datagramReceived(datagram.encode_move(token, 2, 5, 6), address)
+
+    # when
+    channel.datagramReceived(datagram.encode_move(token, 1, 1, 1), address)
+
+    # then
+    assert connection.message_dispatcher.dispatched == [PlayerUpdate("1", 5, 6)]
+    assert channel.stats.stale == 1
+
+
+def test_when_commands_arrive_then_they_are_dispatched_in_order():
+    # given
+    channel, connection, token = open_channel()
+    commands = [MoveCommand(3, -2, 1), MoveCommand(4, 1, 0)]
+
+    # when
+    channel.datagramReceived(datagram.encode_commands(token, commands), ("1.2.3.4", 5))
+
+    # then
+    assert connection.message_dispatcher.dispatched == commands
+
+
+def test_when_token_is_unknown_then_datagram_is_ignored():
+    # given
+    channel, connection, _ = open_channel()
+
+    # when
+    channel.datagramReceived(datagram.encode_ping(bytes(16)), ("1.2.3.4", 5))
+
+    # then
+    assert channel.transport.written == []
+    assert connection.datagram_session.address is None
+    assert channel.stats.invalid == 1
@@ -0,0 +1,104 @@
+from common.framing import FrameDecoder, encode_frame
+from common.model import PlayerUpdate, WorldDelta
+from common.translator import Codec, MessageTranslator
+from server.protocol.outbound_queue import OutboundQueue
+
+
+class FakeTransport:
+    def __init__(self):
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+    def abortConnection(self):
+        self.aborted = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.codec = Codec.JSON
+
+    def frame_payload(self, payload):
+        return encode_frame(payload)
+
+
+def decode_written(written):
+    decoder = FrameDecoder()
+    frames = decoder.feed(b"".join(written))
+    return [MessageTranslator.decode(frame) for frame in frames]
+
+
+def test_when_transport_is_not_congested_then_frames_are_written_immediately():
+    # given
+    connection = FakeConnection()
+    queue = OutboundQueue(connection)
+
+    # when
+    queue.send_frame(b"reliable")
+    queue.send_movement([PlayerUpdate("1", 1, 1)], b"movement")
+
+    # then
+    assert connection.transport.written == [b"reliable", b"movement"]
+    assert queue.depth == 0
+
+
+def test_when_congested_then_only_newest_movement_is_kept_and_order_is_kept():
+    # given
+    connection = FakeConnection()
+    queue = OutboundQueue(connection)
+    queue.pauseProducing()
+
+    # when
+    queue.send_movement([PlayerUpdate("1", 1, 1), PlayerUpdate("2", 5, 5)], b"")
+    queue.send_frame(b"reliable")
+    queue.send_movement([PlayerUpdate("1", 2, 2)], b"")
+
+    # then
+    assert connection.transport.written == []
+    assert queue.depth == 3
+    assert queue.dropped == 1
+
+    # when
+    queue.resumeProducing()
+
+    # then
+    written = connection.transport.written
+    assert decode_written(written[:1]) == [WorldDelta([PlayerUpdate("2", 5, 5)])]
+    assert written[1] == b"reliable"
+    assert decode_written(written[2:]) == [WorldDelta([PlayerUpdate("1", 2, 2)])]
+    assert queue.depth == 0
+
+
+def test_when_player_leaves_behind_queued_movement_then_movement_goes_first():
+    # given
+    connection = FakeConnection()
+    queue = OutboundQueue(connection)
+    queue.pauseProducing()
+    queue.send_movement([PlayerUpdate("1", 1, 1)], b"")
+    queue.send_frame(b"leave")
+    queue.send_frame(b"join")
+
+    # when
+    queue.resumeProducing()
+
+    # then
+    written = connection.transport.written
+    assert decode_written(written[:1]) == [WorldDelta([PlayerUpdate("1", 1, 1)])]
+    assert written[1:] == [b"leave", b"join"]
+
+
+def test_when_reliable_queue_overflows_then_connection_is_aborted():
+    # given
+    connection = FakeConnection()
+    queue = OutboundQueue(connection, max_reliable_frames=2)
+    queue.pauseProducing()
+
+    # when
+    for _ in range(3):
+        queue.send_frame(b"frame")
+
+    # then
+    assert connection.transport.aborted
+    assert queue.depth == 0
@@ -0,0 +1,108 @@
+from twisted.internet.defer import Deferred, fail
+
+from server.database.position_store import PositionStore
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.batches = []
+        self.pending = []
+
+    def save_positions(self, positions):
+        self.batches.append(positions)
+        d = Deferred()
+        self.pending.append(d)
+        return d
+
+    def complete(self):
+        self.pending.pop(0).callback(None)
+
+
+def test_when_player_moves_repeatedly_then_only_latest_position_is_written():
+    # given
+    db = FakeDatabase()
+    store = PositionStore(db)
+    store.mark("1", 1, 1)
+    store.mark("1", 2, 2)
+    store.mark("2", 3, 3)
+
+    # when
+    store.flush()
+    db.complete()
+
+    # then
+    assert db.batches == [[("1", 2, 2), ("2", 3, 3)]]
+    assert store.stats.flushes == 1
+    assert store.stats.positions == 2
+
+
+def test_when_batch_is_being_written_then_its_positions_are_still_visible():
+    # given
+    db = FakeDatabase()
+    store = PositionStore(db)
+    store.mark("1", 5, 6)
+
+    # when
+    store.flush()
+
+    # then
+    assert store.position_of("1") == (5, 6)
+    db.complete()
+    assert store.position_of("1") is None
+
+
+def test_when_flush_is_requested_during_write_then_it_runs_after_it():
+    # given
+    db = FakeDatabase()
+    store = PositionStore(db)
+    store.mark("1", 1, 1)
+    store.flush()
+    store.mark("1", 2, 2)
+
+    # when
+    done = store.flush()
+
+    # then
+    assert db.batches == [[("1", 1, 1)]]
+    db.complete()
+    assert db.batches == [[("1", 1, 1)], [("1", 2, 2)]]
+    assert not done.called
+    db.complete()
+    assert done.called
+
+
+def test_when_write_fails_then_positions_stay_dirty():
+    # given
+    db = FakeDatabase()
+    db.save_positions = lambda positions: fail(RuntimeError("disk full"))
+    store = PositionStore(db)
+    store.mark("1", 1, 1)
+    errors = []
+
+    # when
+    store.flush().addErrback(errors.append)
+
+    # then
+    assert len(errors) == 1
+    assert store.pending == 1
+    assert store.position_of("1") == (1, 1)
+
+
+def test_when_follow_up_write_fails_then_waiters_get_the_failure():
+    # given
+    db = FakeDatabase()
+    store = PositionStore(db)
+    store.mark("1", 1, 1)
+    store.flush()
+    store.mark("1", 2, 2)
+    errors = []
+    store.flush().addErrback(errors.append)
+    db.save_positions = lambda positions: fail(RuntimeError("disk full"))
+
+    # when
+    db.complete()
+
+    # then
+    assert len(errors) == 1
+    assert errors[0].check(RuntimeError)
+    assert store.position_of("1") == (2, 2)
@@ -0,0 +1,61 @@
+from twisted.internet.defer import succeed
+
+from common.model import Character, Player
+from server.protocol.connection_states import ConnectionState
+from server.protocol.pudink_server import PudinkServer
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.saved = []
+
+    def save_positions(self, positions):
+        self.saved.extend(positions)
+        return succeed(None)
+
+
+class FakeConnection:
+    def __init__(self, player_id):
+        self.state = ConnectionState.DISCONNECTED
+        self.player = Player(player_id, Character(1, 1), 10, 20)
+        self.account = None
+        self.supports_udp = False
+        self.datagram_session = None
+
+
+def test_when_player_goes_offline_then_it_is_evicted_and_position_is_saved():
+    # given
+    db = FakeDatabase()
+    factory = PudinkServer(db, hasher=None)
+    connection = FakeConnection("1")
+    factory.connections.add(connection)
+    factory.player_online(connection)
+    connection.player.x = 50
+
+    # when
+    factory.player_offline(connection)
+
+    # then
+    assert len(factory.grid) == 0
+    assert not factory.connections.is_player_connected("1")
+    assert db.saved == [("1", 50, 20)]
+
+
+def test_when_players_come_and_go_then_only_online_players_are_kept():
+    # given
+    factory = PudinkServer(FakeDatabase(), hasher=None)
+    connections = [FakeConnection(str(i)) for i in range(10)]
+    for connection in connections:
+        factory.connections.add(connection)
+        factory.player_online(connection)
+
+    # when
+    for connection in connections[:7]:
+        factory.player_offline(connection)
+
+    # then
+    online = {
+        str(i) for i in range(10) if factory.connections.is_player_connected(str(i))
+    }
+    assert online == {"7", "8", "9"}
+    assert len(factory.grid) == 3
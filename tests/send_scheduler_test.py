@@ -0,0 +1,74 @@
+from twisted.internet.task import Clock
+
+from common.model import PlayerUpdate
+from tests.conftest import load_client_module
+
+MoveSendScheduler = load_client_module("client.game.send_scheduler").MoveSendScheduler
+
+
+def scheduler(clock, sent):
+    return MoveSendScheduler(sent.append, rate_hz=10, min_distance=2, clock=clock)
+
+
+def test_when_first_position_is_submitted_then_it_is_sent_at_once():
+    # given
+    clock, sent = Clock(), []
+    moves = scheduler(clock, sent)
+
+    # when
+    moves.submit(PlayerUpdate("1", 10, 0))
+
+    # then
+    assert sent == [PlayerUpdate("1", 10, 0)]
+
+
+def test_when_positions_arrive_faster_than_rate_then_only_latest_is_sent():
+    # given
+    clock, sent = Clock(), []
+    moves = scheduler(clock, sent)
+    moves.submit(PlayerUpdate("1", 10, 0))
+
+    # when
+    for x in (20, 30, 40):
+        clock.advance(0.02)
+        moves.submit(PlayerUpdate("1", x, 0))
+    clock.advance(0.1)
+
+    # then
+    assert sent == [PlayerUpdate("1", 10, 0), PlayerUpdate("1", 40, 0)]
+    assert moves.skipped == 2
+
+
+def test_when_player_rests_after_small_step_then_resting_position_is_sent():
+    # given
+    clock, sent = Clock(), []
+    moves = scheduler(clock, sent)
+    moves.submit(PlayerUpdate("1", 10, 0))
+    clock.advance(0.5)
+
+    # when
+    moves.submit(PlayerUpdate("1", 11, 0))
+    sent_before_rest = list(sent)
+    clock.advance(0.1)
+
+    # then
+    assert sent_before_rest == [PlayerUpdate("1", 10, 0)]
+    assert sent == [PlayerUpdate("1", 10, 0), PlayerUpdate("1", 11, 0)]
+
+
+def test_when_pending_position_is_shifted_then_rate_limit_still_applies():
+    # given
+    clock, sent = Clock(), []
+    moves = scheduler(clock, sent)
+    moves.submit(PlayerUpdate("1", 10, 0))
+    clock.advance(0.02)
+    moves.submit(PlayerUpdate("1", 20, 0))
+
+    # when
+    moves.shift(-5, 0)
+    sent_after_shift = list(sent)
+    clock.advance(0.1)
+
+    # then
+    assert sent_after_shift == [PlayerUpdate("1", 10, 0)]
+    assert sent == [PlayerUpdate("1", 10, 0), PlayerUpdate("1", 15, 0)]
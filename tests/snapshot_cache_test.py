@@ -0,0 +1,31 @@
+from common.model import Character, Player, PlayerSnapshot
+from common.translator import MessageTranslator
+from server.world.snapshot_cache import SnapshotCache
+
+
+def test_when_player_moves_then_snapshot_contains_new_position():
+    # given
+    cache = SnapshotCache()
+    players = [Player("1", Character(1, 1), 0, 0), Player("2", Character(2, 2), 5, 5)]
+    cache.encode("1", players)
+
+    # when
+    players[0].x = 100
+    cache.invalidate("1")
+    encoded = cache.encode("1", players)
+
+    # then
+    assert MessageTranslator.decode(encoded) == PlayerSnapshot("1", players)
+
+
+def test_when_player_is_not_invalidated_then_cached_fragment_is_reused():
+    # given
+    cache = SnapshotCache()
+    player = Player("1", Character(1, 1), 0, 0)
+    fragment = cache.fragment(player)
+
+    # when
+    player.x = 100
+
+    # then
+    assert cache.fragment(player) is fragment
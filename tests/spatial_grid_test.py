@@ -0,0 +1,44 @@
+from server.world.spatial_grid import SpatialGrid
+
+
+def test_when_items_are_in_neighbouring_cells_then_they_are_nearby():
+    # given
+    grid: SpatialGrid[str] = SpatialGrid(cell_size=100)
+    grid.insert("a", 50, 50)
+    grid.insert("b", 150, 150)
+    grid.insert("c", 250, 50)
+
+    # when
+    nearby = grid.items_around(grid.cell_of(50, 50))
+
+    # then
+    assert nearby == {"a", "b"}
+
+
+def test_when_item_moves_to_another_cell_then_old_and_new_cell_are_returned():
+    # given
+    grid: SpatialGrid[str] = SpatialGrid(cell_size=100)
+    grid.insert("a", 50, 50)
+
+    # when
+    old_cell, new_cell = grid.move("a", 150, -50)
+
+    # then
+    assert old_cell == (0, 0)
+    assert new_cell == (1, -1)
+    assert grid.get_cell("a") == (1, -1)
+    assert grid.items_around((0, 0)) == {"a"}
+    assert grid.items_around((3, 3)) == set()
+
+
+def test_when_last_item_is_removed_then_cell_is_no_longer_occupied():
+    # given
+    grid: SpatialGrid[str] = SpatialGrid(cell_size=100)
+    grid.insert("a", 50, 50)
+
+    # when
+    grid.remove("a")
+
+    # then
+    assert list(grid.occupied_cells()) == []
+    assert len(grid) == 0
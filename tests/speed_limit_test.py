@@ -0,0 +1,37 @@
+from server.world.speed_limit import SpeedLimit
+
+
+def test_when_step_is_within_allowance_then_it_is_unchanged():
+    # given
+    limit = SpeedLimit(max_speed=100, burst=50)
+
+    # when
+    step = limit.clamp(30, 40, now=0.0)
+
+    # then
+    assert step == (30, 40)
+
+
+def test_when_step_is_too_long_then_it_is_shortened_in_same_direction():
+    # given
+    limit = SpeedLimit(max_speed=100, burst=50)
+
+    # when
+    step = limit.clamp(60, 80, now=0.0)
+
+    # then
+    assert step == (30, 40)
+
+
+def test_when_time_passes_then_allowance_builds_up_to_burst():
+    # given
+    limit = SpeedLimit(max_speed=100, burst=50)
+    limit.clamp(50, 0, now=0.0)
+
+    # when
+    short = limit.clamp(100, 0, now=0.2)
+    full = limit.clamp(100, 0, now=10.0)
+
+    # then
+    assert short == (20, 0)
+    assert full == (50, 0)
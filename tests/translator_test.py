@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+from common.model import (
+    Character,
+    ChatMessage,
+    ConnectionFailure,
+    Credentials,
+    Hello,
+    MoveAck,
+    MoveCommand,
+    NewAccount,
+    Player,
+    PlayerDisconnect,
+    PlayerInitialization,
+    PlayerSnapshot,
+    PlayerSnapshotPage,
+    PlayerUpdate,
+    WorldDelta,
+)
+from common.translator import Codec, MessageTranslator
+
+MESSAGES = [
+    ConnectionFailure("error"),
+    Credentials("name", "password"),
+    NewAccount("name", "password", Character(1, 2)),
+    PlayerInitialization("1", Character(3, 4)),
+    PlayerDisconnect("1"),
+    Player("1", Character(5, 5), 10, -20),
+    PlayerUpdate("1", 400, 400),
+    PlayerSnapshot("1", [Player("1", Character(1, 1), 1, 2)]),
+    PlayerSnapshotPage([Player("2", Character(1, 1), 3, 4)], 2),
+    ChatMessage("1", "hello 🌍"),
+    WorldDelta([PlayerUpdate("1", 1, 2), PlayerUpdate("2", -3, 4)]),
+    WorldDelta([]),
+    MoveCommand(1, -3, 4),
+    MoveAck(2**32 - 1, 10, -20),
+]
+
+
+@pytest.mark.parametrize("codec", list(Codec))
+@pytest.mark.parametrize("message", MESSAGES)
+def test_when_message_is_encoded_then_it_decodes_to_equal_message(message, codec):
+    # when
+    encoded = MessageTranslator.encode(message, codec)
+
+    # then
+    assert MessageTranslator.decode(encoded) == message
+
+
+def test_when_player_update_is_binary_encoded_then_it_is_smaller_than_json():
+    # given
+    update = PlayerUpdate("1234", 400, 400)
+
+    # when
+    binary = MessageTranslator.encode(update, Codec.BINARY)
+    json = MessageTranslator.encode(update, Codec.JSON)
+
+    # then
+    assert len(binary) == 13
+    assert len(binary) < len(json)
+
+
+def test_when_player_id_is_not_numeric_then_binary_codec_falls_back_to_json():
+    # given
+    update = PlayerUpdate("not-a-number", 1, 2)
+
+    # when
+    encoded = MessageTranslator.encode(update, Codec.BINARY)
+
+    # then
+    assert encoded == MessageTranslator.encode(update, Codec.JSON)
+    assert MessageTranslator.decode(encoded) == update
+
+
+def test_when_snapshot_is_built_from_fragments_then_it_equals_encoded_snapshot():
+    # given
+    players = [Player(str(i), Character(i, i), i, -i) for i in range(1, 4)]
+    fragments = [MessageTranslator.encode_fields(player) for player in players]
+
+    # when
+    encoded = MessageTranslator.encode_player_snapshot("1", fragments)
+
+    # then
+    assert encoded == MessageTranslator.encode(PlayerSnapshot("1", players))
+
+
+def test_when_snapshot_page_is_built_from_fragments_then_it_equals_encoded_page():
+    # given
+    players = [Player(str(i), Character(i, i), i, -i) for i in range(1, 4)]
+    fragments = [MessageTranslator.encode_fields(player) for player in players]
+
+    # when
+    encoded = MessageTranslator.encode_player_snapshot_page(fragments, 3)
+
+    # then
+    assert encoded == MessageTranslator.encode(PlayerSnapshotPage(players, 3))
+
+
+def test_when_hello_has_no_udp_field_then_udp_is_off():
+    # given
+    encoded = (
+        b'{"type":"hello","protocol_versions":[1],'
+        b'"codecs":["json"],"compression":false}'
+    )
+
+    # when
+    hello = MessageTranslator.decode(encoded)
+
+    # then
+    assert hello == Hello([1], ["json"], False, False)
+
+
+def test_when_message_is_empty_then_json_decode_error_is_raised():
+    # when / then
+    with pytest.raises(json.JSONDecodeError):
+        MessageTranslator.decode(b"")
+
+
+def test_when_player_id_has_leading_zeros_then_it_survives_binary_codec():
+    # given
+    update = PlayerUpdate("007", 1, 2)
+
+    # when
+    encoded = MessageTranslator.encode(update, Codec.BINARY)
+
+    # then
+    assert MessageTranslator.decode(encoded) == update
+
+
+def test_when_binary_message_is_truncated_then_value_error_is_raised():
+    # given
+    encoded = MessageTranslator.encode(PlayerUpdate("7", 1, 2), Codec.BINARY)
+
+    # when / then
+    with pytest.raises(ValueError):
+        MessageTranslator.decode(encoded[:-1])